@@ -91,3 +91,24 @@ def simulate_flight(payload, distance_desired, battery_capacity, payload_battery
             break
 
     return final_time_flown, final_time_remaining, final_energy_remaining
+
+
+def flight_range(battery_capacity, payload_battery_attenuation, tem_battery_degradation):
+    """
+    Maximum distance of a single leg with battery degradation factors applied
+
+    Parameters:
+    battery_capacity (float): Battery capacity (Ah)
+    payload_battery_attenuation (float): Payload-induced battery attenuation
+    tem_battery_degradation (float): Temperature-induced battery degradation
+
+    Returns:
+    float: Range (km), never more than the 3.6 km leg limit of simulate_flight
+    """
+    MAX_DISTANCE = 3.6  # km
+    DISCHARGE_CURRENT = 5.68  # A
+    SPEED_KM_PER_MIN = 10.8 / 60  # km/min
+
+    degradation_factor = 1 + tem_battery_degradation + payload_battery_attenuation
+    endurance_minutes = battery_capacity * 60 / (DISCHARGE_CURRENT * degradation_factor)
+    return min(MAX_DISTANCE, endurance_minutes * SPEED_KM_PER_MIN)
@@ -1,5 +1,23 @@
-from AltaX import simulate_flight
+import numpy as np
+
+from AltaX import simulate_flight, flight_range
 from battery import calculate_battery_attenuation
+from charging_model import ChargeTimeModel
+from energy_model import EnergyParams
+from gross_weight import GrossWeightSurface, DEFAULT_ALTITUDE_FT
+from Distance_calculate import create_location_database, haversine_distance_batch
+from missions import (SEGMENT_DTYPE, MISSION_DTYPE, MISSION_FLIGHT, MISSION_RETURN, MISSION_DEPART,
+                      CHARGE_STATION_ID, charge_spot_id, location_name, parse_mission_strings, format_missions)
+
+# 最大起飞重量曲面 (温度 x 高度)
+GROSS_WEIGHT = GrossWeightSurface()
+# 默认电池容量 (Ah)，也是 AltaX.simulate_flight 允许的最大容量
+BATTERY_CAPACITY = 18.0
+# 默认充电模型的电池电压 (V，Ah 换算为 Wh) 和充电功率 (W)
+BATTERY_VOLTAGE = EnergyParams().battery_voltage
+CHARGER_POWER = 500
+# 换电时间 (分钟): 取下旧电池、装上站内已充满的电池，与事件驱动配送模拟相同
+SWAP_TIME = 2.0
 
 
 def calculate_average_payload(target):
@@ -19,189 +37,642 @@ def calculate_average_payload(target):
     average = sum(payloads) / len(payloads)
 
     return average
-def charge_simulation(flight_missions, charge_strategy,temperature_D, targets, tasks):
+def check_payload_feasibility(targets, tasks, temperature, altitude_ft=DEFAULT_ALTITUDE_FT):
+    """
+    批量检查所有载荷在给定温度和高度下是否可行
+
+    参数:
+        targets, tasks: 包含 (id, payload) 元组的列表
+        temperature: 环境温度 (°C)
+        altitude_ft: 压力高度 (ft)
+
+    返回:
+        list: 不可行的 (id, payload) 列表
+    """
+    points = list(targets) + list(tasks)
+    if not points:
+        return []
+    feasible = GROSS_WEIGHT.is_feasible([item[1] for item in points], temperature, altitude_ft)
+    return [point for point, ok in zip(points, feasible) if not ok]
+
+
+def _location_coordinates(location_ids, location_names, locations):
+    """按 id 查询坐标，未知地点为 NaN"""
+    coords = np.full((len(location_ids), 2), np.nan)
+    if location_names is None:
+        return coords
+    for i, location_id in enumerate(location_ids):
+        if location_id >= 0:
+            position = locations.get(location_names[location_id])
+            if position:
+                coords[i] = (position['lat'], position['lon'])
+    return coords
+
+
+def split_long_legs(segments, max_range, location_names=None, charging_stations=None, first_spot=1):
+    """
+    将超出航程的航段拆分为最少数量的子航段 (对所有航段向量化计算)
+
+    每个航段拆成 ceil(距离 / 航程) 段，拆分点均匀分布；若附近有真实充电站，
+    且移动后相邻子航段仍不超过航程，则把拆分点吸附到最近的充电站。
+
+    参数:
+        segments: 航段数组 (SEGMENT_DTYPE)
+        max_range: 单段最大航程 (km)
+        location_names: 地点名称列表 (按 id 索引)，用于查询坐标
+        charging_stations: 可用充电站的地点 id 列表
+        first_spot: 第一个临时充电点的编号
+
+    返回:
+        processed: 拆分后的航段数组 (SEGMENT_DTYPE)
+        split_count: 拆分次数
+    """
+    distances = segments['distance']
+    pieces = np.maximum(np.ceil(distances / max_range - 1e-9), 1).astype(np.int64)
+    splits = pieces - 1
+    split_count = int(splits.sum())
+    if split_count == 0:
+        return segments.astype(SEGMENT_DTYPE), 0
+
+    # 每个子航段所属的原航段及其序号
+    seg_idx = np.repeat(np.arange(len(segments)), pieces)
+    piece_no = np.arange(len(seg_idx)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    n_pieces = pieces[seg_idx]
+    is_first = piece_no == 0
+    is_last = piece_no == n_pieces - 1
+
+    # 拆分点: 第 s 个航段的第 k 个拆分点编号为 first_spot + (之前航段拆分数) + k
+    split_offset = np.cumsum(splits) - splits
+    split_seg = np.repeat(np.arange(len(segments)), splits)
+    split_no = np.arange(split_count) - np.repeat(split_offset, splits) + 1  # 1..splits
+    split_ids = np.array([charge_spot_id(first_spot + k) for k in range(split_count)], dtype=np.int64)
+    piece_distance = distances[seg_idx] / n_pieces
+
+    # 吸附到最近的真实充电站
+    if charging_stations is not None and len(charging_stations) > 0 and location_names is not None:
+        locations = create_location_database()
+        station_ids = np.asarray(charging_stations, dtype=np.int64)
+        station_coords = _location_coordinates(station_ids, location_names, locations)
+        known = ~np.isnan(station_coords[:, 0])
+        station_ids, station_coords = station_ids[known], station_coords[known]
+
+        start_coords = _location_coordinates(segments['from_id'].tolist(), location_names, locations)
+        end_coords = _location_coordinates(segments['to_id'].tolist(), location_names, locations)
+
+        if len(station_ids) > 0:
+            frac = (split_no / pieces[split_seg])[:, None]
+            points = start_coords[split_seg] * (1 - frac) + end_coords[split_seg] * frac
+            gaps = haversine_distance_batch(points[:, :1], points[:, 1:],
+                                            station_coords[None, :, 0], station_coords[None, :, 1])
+            gaps = np.where(np.isnan(gaps), np.inf, gaps)
+            nearest = gaps.argmin(axis=1)
+            gap = gaps[np.arange(split_count), nearest]
+
+            # 航段距离与直线距离之比: 直线上的移动量按它换算为航段距离
+            straight = haversine_distance_batch(start_coords[:, 0], start_coords[:, 1],
+                                                end_coords[:, 0], end_coords[:, 1])
+            scale = np.where(straight > 0, distances / np.where(straight > 0, straight, 1), 1.0)
+
+            # 每个拆分点最多移动剩余航程的一半，保证相邻子航段都不超过航程
+            slack = max_range - distances[split_seg] / pieces[split_seg]
+            snapped = gap * scale[split_seg] <= slack / 2
+            if snapped.any():
+                split_ids[snapped] = station_ids[nearest[snapped]]
+                points[snapped] = station_coords[nearest[snapped]]
+
+                # 按实际拆分点重新计算子航段长度 (按原航段距离与直线距离之比缩放)
+                boundary = np.empty((len(seg_idx) + len(segments), 2))
+                order = np.arange(len(seg_idx)) + seg_idx  # 每个子航段起点在 boundary 中的位置
+                starts = np.cumsum(pieces + 1) - (pieces + 1)
+                boundary[starts] = start_coords
+                boundary[starts + pieces] = end_coords
+                boundary[starts[split_seg] + split_no] = points
+                lengths = haversine_distance_batch(boundary[order, 0], boundary[order, 1],
+                                                   boundary[order + 1, 0], boundary[order + 1, 1])
+                has_snap = np.zeros(len(segments), dtype=bool)
+                has_snap[split_seg[snapped]] = True
+                use = has_snap[seg_idx] & ~np.isnan(lengths)
+                piece_distance = np.where(use, lengths * scale[seg_idx], piece_distance)
+
+    # 容差和舍入误差不能让子航段超过航程 (否则 simulate_flight 会拒绝该航段)
+    piece_distance = np.minimum(piece_distance, max_range)
+
+    # 组装拆分后的航段
+    processed = np.empty(len(seg_idx), dtype=SEGMENT_DTYPE)
+    piece_split = np.repeat(split_offset, pieces) + piece_no  # 本子航段终点拆分点的全局序号
+    processed['from_id'] = np.where(is_first, segments['from_id'][seg_idx],
+                                    split_ids[np.clip(piece_split - 1, 0, split_count - 1)])
+    processed['to_id'] = np.where(is_last, segments['to_id'][seg_idx],
+                                  split_ids[np.clip(piece_split, 0, split_count - 1)])
+    processed['distance'] = piece_distance
+    return processed, split_count
+
+
+# 动态策略的安全余量 (与 MedicalDroneDelivery 的策略C相同)
+CHARGE_MARGIN = 0.2
+
+# 最优策略的电量离散等级数和最低保留电量 (占容量比例)
+DP_SOC_LEVELS = 1000
+CHARGE_RESERVE = 0.2
+
+
+class ChargeRun:
+    """
+    一次充电模拟的运行状态
+
+    充电策略函数通过它飞行、充电或换电，并记录新的任务表；
+    总时间 (分钟) 和总能量消耗 (Ah) 在这里累加。
+    """
+
+    def __init__(self, missions, battery_capacity, payload_D, temperature_D, payload=1.0, truncate_count=0,
+                 soc_trace=None, drone_id=0, battery_aging=None, battery_index=0, aging_temperature=25,
+                 location_names=None, station_queue=None, charge_time=0.0, swap_time=SWAP_TIME, start_time=0.0,
+                 queue_priority=1, min_reserve=CHARGE_RESERVE, charge_model=None, partial_charge=False):
+        self.missions = missions  # [(起点 id, 终点 id, 距离 km), ...]
+        self.truncate_count = truncate_count
+        self.battery_capacity = battery_capacity  # Ah
+        self.payload = payload  # 有效载荷重量
+        self.payload_D = payload_D
+        self.temperature_D = temperature_D
+
+        self.soc_trace = soc_trace
+        self.drone_id = drone_id
+        self.battery_aging = battery_aging
+        self.battery_index = battery_index
+        self.aging_temperature = aging_temperature
+        self.location_names = location_names
+        self.station_queue = station_queue
+        self.charge_time = charge_time
+        self.swap_time = swap_time
+        self.start_time = start_time
+        self.queue_priority = queue_priority
+        self.min_reserve = min_reserve  # 最优策略的最低保留电量 (占容量比例)
+        self.charge_model = charge_model  # 可选的 ChargeTimeModel (CC-CV 充电时间)
+        self.partial_charge = partial_charge  # 只充到下一段所需的电量
+
+        self.new_missions = []
+        self.total_time = 0.0
+        self.total_energy = 0.0
+        self.stops = 0  # 充电/换电次数
+        self._locations = create_location_database() if soc_trace is not None else {}
+
+    def simulate(self, distance, energy=None):
+        """模拟一段飞行 (默认满电)，返回 (飞行时间, 剩余续航时间, 剩余能量)"""
+        if energy is None:
+            energy = self.battery_capacity
+        return simulate_flight(self.payload, distance, energy, self.payload_D, self.temperature_D)
+
+    def leg_energy(self, distance):
+        """满电飞完一段航程消耗的能量 (Ah)"""
+        return self.battery_capacity - self.simulate(distance)[2]
+
+    def fly(self, start, end, distance, kind, energy=None):
+        """
+        飞行一段航程并加入任务表
+
+        参数:
+            start, end: 起点和终点 id
+            distance: 距离 (km)
+            kind: 航段类型 (MISSION_FLIGHT / MISSION_RETURN / MISSION_DEPART)
+            energy: 起飞时的电量 (Ah)，默认满电
+
+        返回:
+            float: 剩余电量 (Ah)
+        """
+        if energy is None:
+            energy = self.battery_capacity
+        time_flown, _, energy_remaining = self.simulate(distance, energy)
+        self.new_missions.append((start, end, distance, kind))
+        self.total_time += time_flown
+        self.total_energy += (energy - energy_remaining)
+        self.record_soc(end, energy_remaining)
+        return energy_remaining
+
+    def _stop(self, energy_used, duration):
+        # 充电站排队: 等待空闲充电位/换电位
+        arrival = self.start_time + self.total_time
+        if self.station_queue is not None:
+            _, stop_end, _ = self.station_queue.request(arrival, duration, self.drone_id, self.queue_priority)
+        else:
+            stop_end = arrival + duration
+        self.total_time += stop_end - arrival
+        self.stops += 1
+
+        # 电池老化: 每次充电按放电深度记录一次循环，并更新容量
+        if self.battery_aging is not None:
+            self.battery_aging.record_cycles(self.battery_index, energy_used / self.battery_capacity,
+                                             self.aging_temperature)
+            self.battery_capacity = float(self.battery_aging.capacity[self.battery_index])
+
+    def charge_duration(self, soc_from, soc_to=1.0):
+        """充电时间 (分钟): 有充电模型时按 CC-CV 计算，否则为固定的 charge_time"""
+        if self.charge_model is None:
+            return np.broadcast_to(float(self.charge_time), np.shape(soc_from)) * 1.0
+        return self.charge_model.time_to_soc(soc_from, soc_to, self.aging_temperature)
+
+    def charge(self, energy_used, target_energy=None):
+        """
+        在充电站充电
+
+        参数:
+            energy_used: 充电前已用电量 (Ah)
+            target_energy: 充到的电量 (Ah)，默认充满
+
+        返回:
+            float: 充电后的电量 (Ah)
+        """
+        capacity = self.battery_capacity
+        current_energy = max(capacity - energy_used, 0.0)
+        if target_energy is None:
+            target_energy = capacity
+        target_energy = min(max(target_energy, current_energy), capacity)
+        duration = float(self.charge_duration(current_energy / capacity, target_energy / capacity))
+        self._stop(target_energy - current_energy, duration)
+        # 电池老化后容量可能变小
+        return min(target_energy, self.battery_capacity)
+
+    def swap(self, energy_used, target_energy=None):
+        """在充电站更换满电电池 (换下的电池在站内充电)，返回换电后的电量 (Ah)"""
+        self._stop(energy_used, self.swap_time)
+        return self.battery_capacity
+
+    def record_soc(self, location_id, energy):
+        """记录电量轨迹 (未启用时不做任何事)"""
+        if self.soc_trace is None:
+            return
+        position = None
+        if self.location_names is not None or location_id < 0:
+            position = self._locations.get(location_name(location_id, self.location_names))
+        lat, lon = (position['lat'], position['lon']) if position else (float('nan'), float('nan'))
+        self.soc_trace.record(self.total_time, self.drone_id, energy / self.battery_capacity * 100, lat, lon)
+
+
+# 充电策略注册表: 字母 -> (说明, 策略函数)
+# 策略函数接收 ChargeRun，模拟全部航段并返回总航段数
+CHARGE_STRATEGIES = {}
+
+
+def register_charge_strategy(key, description):
+    """注册充电策略 (装饰器)"""
+    def decorator(func):
+        CHARGE_STRATEGIES[key] = (description, func)
+        return func
+    return decorator
+
+
+def find_charge_strategy(charge_strategy):
+    """按字母 ("C") 或完整名称 ("Strategy C: ...") 查找策略函数"""
+    for key, (_, func) in CHARGE_STRATEGIES.items():
+        if charge_strategy == key or f"Strategy {key}" in charge_strategy:
+            return func
+    raise ValueError(f"Unknown charge strategy: {charge_strategy}")
+
+
+def charge_strategy_names():
+    """供界面使用的策略名称 {编号: "Strategy X: 说明"}，编号从 1 开始"""
+    return {i + 1: f"Strategy {key}: {description}"
+            for i, (key, (description, _)) in enumerate(CHARGE_STRATEGIES.items())}
+
+
+@register_charge_strategy('A', "Return to charge after each mission, then depart with a full battery.")
+def _strategy_a(run):
+    # 策略A: 每次任务后返回充电
+    missions = run.missions
+    for i, (start, end, distance) in enumerate(missions):
+        energy_remaining = run.fly(start, end, distance, MISSION_FLIGHT)
+
+        # 如果不是最后一个任务，添加返回充电和重新出发的任务
+        if i < len(missions) - 1:
+            return_distance = distance / 2  # 简化：假设返回距离为当前距离的一半
+            return_energy_remaining = run.fly(end, CHARGE_STATION_ID, return_distance, MISSION_RETURN)
+            run.charge((run.battery_capacity - energy_remaining) + (run.battery_capacity - return_energy_remaining))
+            run.record_soc(CHARGE_STATION_ID, run.battery_capacity)
+
+            # 重新出发
+            next_start = missions[i + 1][0]
+            depart_distance = return_distance  # 简化：假设出发距离与返回距离相同
+            run.fly(CHARGE_STATION_ID, next_start, depart_distance, MISSION_DEPART)
+
+    # 计算总航段数
+    return len(missions) + run.truncate_count + 2 * (len(missions) - 1)
+
+
+@register_charge_strategy('B', "Return to charge after completing two missions, then depart with a full battery.")
+def _strategy_b(run):
+    # 策略B: 每完成两个任务后返回充电
+    missions = run.missions
+    mission_count = 0
+    current_energy = run.battery_capacity
+
+    for i, (start, end, distance) in enumerate(missions):
+        # 模拟飞行以获取实际所需时间，估算所需能量
+        time_flown = run.simulate(distance, current_energy)[0]
+        required_energy = distance * (5.68 / 60) * time_flown
+
+        # 检查当前能量是否足够
+        if current_energy < required_energy:
+            # 能量不足，需要提前充电
+            return_distance = distance / 2
+            run.fly(end, CHARGE_STATION_ID, return_distance, MISSION_RETURN)
+            run.charge(run.battery_capacity - current_energy)
+            current_energy = run.battery_capacity
+            mission_count = 0  # 重置任务计数
+            run.record_soc(CHARGE_STATION_ID, current_energy)
+            run.fly(CHARGE_STATION_ID, end, return_distance, MISSION_DEPART)
+
+        current_energy = run.fly(start, end, distance, MISSION_FLIGHT, current_energy)
+        mission_count += 1
+
+        # 每完成两个任务后返回充电
+        if mission_count >= 2 and i < len(missions) - 1:
+            return_distance = distance / 2  # 简化：假设返回距离为当前距离的一半
+            return_energy_remaining = run.fly(end, CHARGE_STATION_ID, return_distance, MISSION_RETURN)
+            run.charge((run.battery_capacity - current_energy) + (run.battery_capacity - return_energy_remaining))
+            run.record_soc(CHARGE_STATION_ID, run.battery_capacity)
+
+            # 重新出发
+            next_start = missions[i + 1][0]
+            depart_distance = return_distance  # 简化：假设出发距离与返回距离相同
+            run.fly(CHARGE_STATION_ID, next_start, depart_distance, MISSION_DEPART)
+
+            # 重置任务计数和能量
+            mission_count = 0
+            current_energy = run.battery_capacity
+
+    return len(run.new_missions)
+
+
+def _replenish_when_needed(run, replenish, margin=CHARGE_MARGIN):
+    """
+    仅在电量不足时补能: 下一航段所需能量加安全余量超过剩余电量时返回充电站
+
+    航段不相连 (换起点) 时经充电站转场，此时仅在电量不足时补能。
+    replenish 为 run.charge 或 run.swap，返回补能后的电量。
+    """
+    current_energy = run.battery_capacity
+    prev_end = prev_distance = None
+
+    for start, end, distance in run.missions:
+        required = run.leg_energy(distance) * (1 + margin)
+        if prev_end is not None and (start != prev_end or current_energy < required):
+            station_distance = prev_distance / 2  # 简化：与策略A/B相同，取上一航段距离的一半
+            current_energy = run.fly(prev_end, CHARGE_STATION_ID, station_distance, MISSION_RETURN, current_energy)
+            depart_required = required + run.leg_energy(station_distance) * (1 + margin)
+            if current_energy < depart_required:
+                # 部分充电时只充到出发和下一航段所需的电量
+                target_energy = depart_required if run.partial_charge else None
+                current_energy = replenish(run.battery_capacity - current_energy, target_energy)
+                run.record_soc(CHARGE_STATION_ID, current_energy)
+            current_energy = run.fly(CHARGE_STATION_ID, start, station_distance, MISSION_DEPART, current_energy)
+
+        current_energy = run.fly(start, end, distance, MISSION_FLIGHT, current_energy)
+        prev_end, prev_distance = end, distance
+
+    return len(run.new_missions)
+
+
+@register_charge_strategy('C', "Return to charge only when the battery cannot cover the next mission plus a "
+                               "20% margin.")
+def _strategy_c(run):
+    # 策略C: 动态判断，电量不足时才充电
+    return _replenish_when_needed(run, run.charge)
+
+
+@register_charge_strategy('D', "Return to swap in a full battery only when the next mission needs it "
+                               "(swap time instead of charge time).")
+def _strategy_d(run):
+    # 策略D: 热插拔换电，电量不足时返回换电
+    return _replenish_when_needed(run, run.swap)
+
+
+# 每个航段之前的动作
+PLAN_DIRECT = 0  # 直接飞往下一航段起点
+PLAN_VIA_STATION = 1  # 经充电站转场，不充电
+PLAN_CHARGE = 2  # 返回充电站充电后出发
+
+
+def optimal_charge_plan(run, min_reserve=CHARGE_RESERVE, levels=DP_SOC_LEVELS):
+    """
+    在离散电量上做动态规划，选择在哪些航段之前返回充电
+
+    状态为完成某航段后的剩余电量等级；能量消耗向上取整到等级，保证计划可行。
+    目标是总时间 (飞行 + 充电) 最小，且每次落地后剩余电量不低于 min_reserve；每次都充满。
+    动作空间包含策略A/B/C的全部选择，所以在同样保留 min_reserve 的计划中时间最短；
+    策略C只给航段能耗加余量、不保留电量，落地电量可低于 min_reserve，因此可能比它更快。
+
+    参数:
+        run: ChargeRun
+        min_reserve: 最低保留电量 (占容量比例)
+        levels: 电量离散等级数
+
+    返回:
+        np.ndarray: 每个航段之前的动作 (PLAN_DIRECT / PLAN_VIA_STATION / PLAN_CHARGE)
+    """
+    missions = run.missions
+    n = len(missions)
+    if n == 0:
+        return np.zeros(0, dtype=np.int8)
+
+    step = run.battery_capacity / levels
+    reserve = int(np.ceil(min_reserve * levels - 1e-9))
+
+    def leg_cost(distance):
+        time_flown, _, energy_remaining = run.simulate(distance)
+        used = run.battery_capacity - energy_remaining
+        return time_flown, int(np.ceil(used / step - 1e-9))
+
+    states = np.arange(levels + 1)
+    value = np.full(levels + 1, np.inf)
+    value[levels] = 0.0  # 满电出发
+    choices, parents = [], []
+
+    for i, (start, end, distance) in enumerate(missions):
+        # 航段之前的动作: 到达航段起点时的电量 arrive[k] 及其来源
+        arrive = np.full(levels + 1, np.inf)
+        action = np.zeros(levels + 1, dtype=np.int8)
+        parent = states.copy()
+
+        if i == 0:
+            arrive[:] = value
+        else:
+            prev_end, prev_distance = missions[i - 1][1], missions[i - 1][2]
+            if start == prev_end:
+                arrive[:] = value
+
+            station_time, station_used = leg_cost(prev_distance / 2)
+
+            # 经充电站转场 (不充电): 往返共消耗 2 * station_used
+            shift = 2 * station_used
+            if shift <= levels:
+                via = np.full(levels + 1, np.inf)
+                via[:levels + 1 - shift] = value[shift:] + 2 * station_time
+                via[:reserve] = np.inf
+                better = via < arrive
+                arrive[better] = via[better]
+                action[better] = PLAN_VIA_STATION
+                parent[better] = (states + shift)[better]
+
+            # 返回充电: 能返回充电站的任意状态均可，充满后出发 (充电时间取决于返回时的电量)
+            can_return = states - station_used >= reserve
+            if can_return.any():
+                charge_cost = np.where(can_return, value + 2 * station_time +
+                                       run.charge_duration(np.maximum(states - station_used, 0) / levels),
+                                       np.inf)
+                best_parent = int(np.argmin(charge_cost))
+                charged = charge_cost[best_parent]
+                k = levels - station_used
+                if k >= reserve and charged < arrive[k]:
+                    arrive[k] = charged
+                    action[k] = PLAN_CHARGE
+                    parent[k] = best_parent
+
+        # 飞行本航段
+        time_flown, used = leg_cost(distance)
+        value = np.full(levels + 1, np.inf)
+        if used <= levels:
+            value[:levels + 1 - used] = arrive[used:] + time_flown
+            value[:reserve] = np.inf
+        choices.append(action[used:] if used <= levels else action[:0])
+        parents.append(parent[used:] if used <= levels else parent[:0])
+
+        if not np.isfinite(value).any():
+            raise ValueError(f"No charging plan keeps a {min_reserve:.0%} reserve on mission {i + 1} "
+                             f"({distance:.2f} km)")
+
+    # 回溯
+    plan = np.zeros(n, dtype=np.int8)
+    k = int(np.argmin(value))
+    for i in range(n - 1, -1, -1):
+        plan[i] = choices[i][k]
+        k = int(parents[i][k])
+    return plan
+
+
+@register_charge_strategy('E', "Optimal: dynamic programming over state of charge picks where to recharge "
+                               "(minimum total time, 20% reserve).")
+def _strategy_optimal(run):
+    # 策略E: 按动态规划的结果执行
+    plan = optimal_charge_plan(run, run.min_reserve)
+    current_energy = run.battery_capacity
+    prev_end = prev_distance = None
+
+    for (start, end, distance), action in zip(run.missions, plan.tolist()):
+        if action != PLAN_DIRECT:
+            station_distance = prev_distance / 2  # 简化：与策略A/B相同，取上一航段距离的一半
+            current_energy = run.fly(prev_end, CHARGE_STATION_ID, station_distance, MISSION_RETURN, current_energy)
+            if action == PLAN_CHARGE:
+                current_energy = run.charge(run.battery_capacity - current_energy)
+                run.record_soc(CHARGE_STATION_ID, current_energy)
+            current_energy = run.fly(CHARGE_STATION_ID, start, station_distance, MISSION_DEPART, current_energy)
+
+        current_energy = run.fly(start, end, distance, MISSION_FLIGHT, current_energy)
+        prev_end, prev_distance = end, distance
+
+    return len(run.new_missions)
+
+
+def charge_simulation(flight_missions, charge_strategy,temperature_D, targets, tasks,
+                      temperature=None, altitude_ft=DEFAULT_ALTITUDE_FT, soc_trace=None, drone_id=0,
+                      battery_aging=None, battery_index=0, location_names=None, charging_stations=None,
+                      station_queue=None, charge_time=None, swap_time=SWAP_TIME, start_time=0.0, queue_priority=1,
+                      min_reserve=CHARGE_RESERVE, charge_model=None, partial_charge=False, battery_capacity=None):
 
     """
     充电模拟函数
 
     参数:
-    flight_missions: 飞行任务列表，格式为 ["起点 -> 终点: 距离 km", ...]
-    charge_strategy: 充电策略字符串
+    flight_missions: 航段数组 (SEGMENT_DTYPE: from_id, to_id, distance)，
+                     或旧格式字符串列表 ["起点 -> 终点: 距离 km", ...]
+    charge_strategy: 充电策略字符串 ("Strategy A: ..." 或策略字母，见 CHARGE_STRATEGIES)
+    temperature: 环境温度 (°C)，提供时先批量检查载荷可行性
+    altitude_ft: 压力高度 (ft)
+    soc_trace: 可选的 SocTraceRecorder，记录每个航段后的电量 (SOC)
+    drone_id: 记录轨迹时使用的无人机编号
+    battery_aging: 可选的 BatteryAging，按循环次数、放电深度和温度更新电池容量 (Ah)
+    battery_index: 使用的电池编号
+    location_names: 地点名称列表 (按 id 索引)，用于电量轨迹定位和充电站吸附
+    charging_stations: 可用充电站的地点 id 列表，长航段的拆分点会吸附到附近的充电站
+    station_queue: 可选的 ChargingStation，充电时排队等待空闲充电位 (默认充电站无限容量)
+    charge_time: 固定的每次充电时间 (分钟)，给出时代替充电模型
+    charge_model: ChargeTimeModel，按 CC-CV 模型由充电前后电量计算充电时间；
+                  默认按 BATTERY_VOLTAGE 和 CHARGER_POWER 为本电池建立
+    partial_charge: 策略C只充到下一段所需的电量 (加安全余量)，而不是充满
+    swap_time: 策略D每次换电的时间 (分钟)，默认 SWAP_TIME；充电和换电都按实际占用充电站的时间计
+    start_time: 本无人机在充电站时钟上的起飞时间 (分钟)，多架无人机共用充电站时使用
+    queue_priority: 排队优先级 (数值越小越优先)
+    min_reserve: 策略E (最优) 每次落地后的最低保留电量 (占容量比例)
+    battery_capacity: 电池容量 (Ah)，默认 BATTERY_CAPACITY，不能超过它
 
     返回:
-    new_missions: 添加充电点后的飞行任务列表
-    total_time_flown: 总飞行时间 (分钟)
+    new_missions: 添加充电点后的任务表 (MISSION_DTYPE)；输入为字符串列表时返回字符串列表
+    total_time_flown: 总飞行时间 (分钟)，包含充电/换电及排队时间
     total_energy_consumed: 总能量消耗 (Ah)
     total_segments: 总航段数 (原始任务数 + 截断次数)
+    charge_stops: 实际充电/换电次数 (经过充电站而不补电的返航段不计)
     """
+    # 规划前拒绝超出最大起飞重量的载荷
+    if temperature is not None:
+        infeasible = check_payload_feasibility(targets, tasks, temperature, altitude_ft)
+        if infeasible:
+            limit = GROSS_WEIGHT.max_payload(temperature, altitude_ft)
+            raise ValueError(f"Payloads {infeasible} exceed maximum {limit:.2f} kg "
+                             f"at {temperature}°C and {altitude_ft} ft")
+
     # 解析飞行任务
     average_payload = calculate_average_payload(targets)
     payload_D = calculate_battery_attenuation(average_payload)
-    parsed_missions = []
-    for mission in flight_missions:
-        # 分割起点和终点
-        parts = mission.split(" -> ")
-        start = parts[0].strip()
-        end_part = parts[1].split(":")
-        end = end_part[0].strip()
-        distance = float(end_part[1].split("km")[0].strip())
-        parsed_missions.append((start, end, distance))
-
-    # 处理长距离航段 (大于3.6km)
-    processed_missions = []
-    truncate_count = 0
-    charge_spot_counter = 1
-
-    for start, end, distance in parsed_missions:
-        if distance > 3.6:
-            # 需要截断
-            truncate_count += 1
-            # 第一段
-            processed_missions.append((start, f"Charge spot {charge_spot_counter}", 3.6))
-            # 第二段
-            processed_missions.append((f"Charge spot {charge_spot_counter}", end, distance - 3.6))
-            charge_spot_counter += 1
-        else:
-            processed_missions.append((start, end, distance))
-
-    # 初始化结果
-    new_missions = []
-    total_time_flown = 0.0
-    total_energy_consumed = 0.0
-    battery_capacity = 18.0  # 电池容量
-    payload = 1.0  # 有效载荷重量
+    legacy_input = not isinstance(flight_missions, np.ndarray)
+    if legacy_input:
+        flight_missions, location_names = parse_mission_strings(flight_missions)
+
+    # 电池容量
+    if battery_capacity is None:
+        battery_capacity = BATTERY_CAPACITY
+    if not 0 < battery_capacity <= BATTERY_CAPACITY:
+        raise ValueError(f"Battery capacity {battery_capacity} Ah must be in (0, {BATTERY_CAPACITY}] Ah")
+    if battery_aging is not None:
+        battery_capacity = float(battery_aging.capacity[battery_index])  # 老化后的电池容量
+
+    # 充电时间: 默认按 CC-CV 模型计算，给出固定 charge_time 时使用固定时间
+    if charge_time is not None:
+        charge_model = None
+    elif charge_model is None:
+        charge_model = ChargeTimeModel(battery_capacity * BATTERY_VOLTAGE, CHARGER_POWER)
+
+    # 处理长距离航段: 按满电航程拆分为最少的子航段
+    max_range = flight_range(battery_capacity, payload_D, temperature_D)
+    split_missions, truncate_count = split_long_legs(flight_missions, max_range, location_names,
+                                                     charging_stations)
+    processed_missions = list(zip(split_missions['from_id'].tolist(), split_missions['to_id'].tolist(),
+                                  split_missions['distance'].tolist()))
+
+    run = ChargeRun(processed_missions, battery_capacity, payload_D, temperature_D,
+                    truncate_count=truncate_count, soc_trace=soc_trace, drone_id=drone_id,
+                    battery_aging=battery_aging, battery_index=battery_index,
+                    aging_temperature=temperature if temperature is not None else 25,
+                    location_names=location_names, station_queue=station_queue,
+                    charge_time=0.0 if charge_time is None else charge_time, swap_time=swap_time, start_time=start_time, queue_priority=queue_priority,
+                    min_reserve=min_reserve, charge_model=charge_model, partial_charge=partial_charge)
+
+    if processed_missions:
+        run.record_soc(processed_missions[0][0], battery_capacity)
 
     # 根据充电策略进行模拟
-    if "Strategy A" in charge_strategy:
-        # 策略A: 每次任务后返回充电
-        for i, (start, end, distance) in enumerate(processed_missions):
-            # 模拟飞行
-            time_flown, time_remaining, energy_remaining = simulate_flight(
-                payload, distance, battery_capacity, payload_D,temperature_D
-            )
-
-            # 添加任务
-            new_missions.append(f"{start} -> {end}: {distance:.2f} km")
-
-            # 累加时间和能量消耗
-            total_time_flown += time_flown
-            total_energy_consumed += (battery_capacity - energy_remaining)
-
-            # 如果不是最后一个任务，添加返回充电和重新出发的任务
-            if i < len(processed_missions) - 1:
-                # 返回充电站
-                return_distance = distance / 2  # 简化：假设返回距离为当前距离的一半
-                new_missions.append(f"{end} -> Charge station: {return_distance:.2f} km")
-
-                # 重新出发
-                next_start = processed_missions[i + 1][0]
-                depart_distance = return_distance  # 简化：假设出发距离与返回距离相同
-                new_missions.append(f"Charge station -> {next_start}: {depart_distance:.2f} km")
-
-                # 累加返回和出发的时间和能量消耗
-                return_time, _, return_energy_remaining = simulate_flight(
-                    payload, return_distance, battery_capacity, payload_D,temperature_D
-                )
-                total_time_flown += return_time
-                total_energy_consumed += (battery_capacity - return_energy_remaining)
-
-                depart_time, _, depart_energy_remaining = simulate_flight(
-                    payload, depart_distance, battery_capacity, payload_D,temperature_D
-                )
-                total_time_flown += depart_time
-                total_energy_consumed += (battery_capacity - depart_energy_remaining)
-
-        # 计算总航段数
-        total_segments = len(processed_missions) + truncate_count + 2 * (len(processed_missions) - 1)
-
-    elif "Strategy B" in charge_strategy:
-        # 策略B: 每完成两个任务后返回充电
-        mission_count = 0
-        current_energy = battery_capacity
-
-        for i, (start, end, distance) in enumerate(processed_missions):
-            # 模拟飞行以获取实际所需时间
-            time_flown, time_remaining, energy_remaining = simulate_flight(
-                payload, distance, current_energy, payload_D,temperature_D
-            )
-
-            # 估算所需能量（使用模拟飞行结果）
-            required_energy = distance * (5.68 / 60) * time_flown
-
-            # 检查当前能量是否足够
-            if current_energy < required_energy:
-                # 能量不足，需要提前充电
-                return_distance = distance / 2
-                new_missions.append(f"{end} -> Charge station: {return_distance:.2f} km")
-                new_missions.append(f"Charge station -> {end}: {return_distance:.2f} km")
-
-                # 充电后重置能量
-                current_energy = battery_capacity
-                mission_count = 0  # 重置任务计数
-
-                # 累加返回和出发的时间和能量消耗
-                return_time, _, return_energy_remaining = simulate_flight(
-                    payload, return_distance, battery_capacity, payload_D,temperature_D
-                )
-                total_time_flown += return_time
-                total_energy_consumed += (battery_capacity - return_energy_remaining)
-
-                depart_time, _, depart_energy_remaining = simulate_flight(
-                    payload, return_distance, battery_capacity, payload_D,temperature_D
-                )
-                total_time_flown += depart_time
-                total_energy_consumed += (battery_capacity - depart_energy_remaining)
-
-                # 重新模拟飞行（充电后）
-                time_flown, time_remaining, energy_remaining = simulate_flight(
-                    payload, distance, current_energy, payload_D,temperature_D
-                )
-
-            # 添加任务
-            new_missions.append(f"{start} -> {end}: {distance:.2f} km")
-
-            # 累加时间和能量消耗
-            total_time_flown += time_flown
-            energy_used = current_energy - energy_remaining
-            total_energy_consumed += energy_used
-            current_energy = energy_remaining
-
-            # 更新任务计数
-            mission_count += 1
-
-            # 每完成两个任务后返回充电
-            if mission_count >= 2 and i < len(processed_missions) - 1:
-                # 返回充电站
-                return_distance = distance / 2  # 简化：假设返回距离为当前距离的一半
-                new_missions.append(f"{end} -> Charge station: {return_distance:.2f} km")
-
-                # 重新出发
-                next_start = processed_missions[i + 1][0]
-                depart_distance = return_distance  # 简化：假设出发距离与返回距离相同
-                new_missions.append(f"Charge station -> {next_start}: {depart_distance:.2f} km")
-
-                # 累加返回和出发的时间和能量消耗
-                return_time, _, return_energy_remaining = simulate_flight(
-                    payload, return_distance, battery_capacity, payload_D,temperature_D
-                )
-                total_time_flown += return_time
-                total_energy_consumed += (battery_capacity - return_energy_remaining)
-
-                depart_time, _, depart_energy_remaining = simulate_flight(
-                    payload, depart_distance, battery_capacity, payload_D,temperature_D
-                )
-                total_time_flown += depart_time
-                total_energy_consumed += (battery_capacity - depart_energy_remaining)
-
-                # 重置任务计数和能量
-                mission_count = 0
-                current_energy = battery_capacity
-
-        # 计算总航段数
-        total_segments = len(new_missions)
-
-    else:
-        # 未知策略
-        raise ValueError(f"Unknown charge strategy: {charge_strategy}")
-
-    return new_missions, total_time_flown, total_energy_consumed, total_segments
\ No newline at end of file
+    strategy = find_charge_strategy(charge_strategy)
+    total_segments = strategy(run)
+
+    new_missions = np.array(run.new_missions, dtype=MISSION_DTYPE)
+    if legacy_input:
+        new_missions = format_missions(new_missions, location_names)
+
+    return new_missions, run.total_time, run.total_energy, total_segments, run.stops
+
+
+def optimal_charge_simulation(flight_missions, temperature_D, targets, tasks, min_reserve=CHARGE_RESERVE, **kwargs):
+    """
+    最优充电模拟: 以策略E (动态规划) 调用 charge_simulation
+
+    返回值与 charge_simulation 相同:
+    (new_missions, total_time_flown, total_energy_consumed, total_segments, charge_stops)
+    """
+    return charge_simulation(flight_missions, 'E', temperature_D, targets, tasks, min_reserve=min_reserve, **kwargs)
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 
 # DMS to decimal degrees converter
@@ -55,6 +56,41 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     return distance
 
 
+# Vectorized Haversine distance calculator
+def haversine_distance_batch(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distances between arrays of points (in kilometers)
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 6371.0 * 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# Location name mapping
+LOCATION_NAMES = {
+    # Target points
+    'target': {
+        1: "NHS Blood Centre (Filton)",
+        2: "South Bristol NHS Community Hospital",
+        3: "UWE Health Tech Hub"
+    },
+    # Task points
+    'task': {
+        1: "Southmead Hospital",
+        2: "Bristol Royal Infirmary (BRI)",
+        3: "St Michael's Hospital",
+        4: "Eastville Medical Centre",
+        5: "Fishponds Primary Care Centre",
+        6: "Bristol Haematology and Oncology Centre (BHOC)",
+        7: "Emersons Green NHS Treatment Centre",
+        8: "Lawrence Hill Health Centre",
+        9: "Montpelier Health Centre"
+    }
+}
+
+
 # Location database creator
 def create_location_database():
     """
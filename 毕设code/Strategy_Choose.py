@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from Charge import charge_strategy_names
+
 
 class PathPlannerApp:
     def __init__(self):
@@ -277,10 +279,8 @@ class PathPlannerApp:
 
         self.charge_strategy_var = tk.IntVar(value=1)
 
-        charge_strategies = {
-            1: "Strategy A: Return to charge after each mission, then depart with a full battery.",
-            2: "Strategy B: Return to charge after completing two missions, then depart with a full battery."
-        }
+        # 来自 Charge 的策略注册表 (新增策略会自动出现)
+        charge_strategies = charge_strategy_names()
 
         # 充电策略选项
         charge_cols = ttk.Frame(charge_frame)
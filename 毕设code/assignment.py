@@ -0,0 +1,100 @@
+import numpy as np
+
+# scipy.optimize.linear_sum_assignment, looked up on first use (False when SciPy is missing)
+_scipy_solver = None
+
+# Cost bonus per task priority (min): higher priorities win when drones are scarce
+PRIORITY_BONUS = {'high': 1000.0, 'normal': 500.0, 'low': 0.0}
+
+
+def hungarian(cost):
+    """
+    Minimum-cost assignment (Hungarian algorithm, shortest augmenting paths, O(n^2 m))
+    :param cost: (n, m) finite cost matrix
+    :return: (rows, cols) index arrays of the min(n, m) assigned pairs, sorted by row
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+
+    # Potentials and matching use 1-based indices with column 0 as the virtual root
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)  # column -> row (0 = free)
+    for row in range(1, n + 1):
+        match[0] = row
+        column = 0
+        min_slack = np.full(m + 1, np.inf)
+        previous = np.zeros(m + 1, dtype=np.int64)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current = match[column]
+            free = ~used[1:]
+            slack = cost[current - 1] - u[current] - v[1:]
+            better = free & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            previous[1:][better] = column
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+
+            u[match[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+            column = next_column
+            if match[column] == 0:
+                break
+        # Augment along the alternating path
+        while column:
+            prior = previous[column]
+            match[column] = match[prior]
+            column = prior
+
+    cols = np.flatnonzero(match[1:])
+    rows = match[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def _linear_sum_assignment():
+    # SciPy is optional and slow to import: fall back to the pure NumPy solver above
+    global _scipy_solver
+    if _scipy_solver is None:
+        try:
+            from scipy.optimize import linear_sum_assignment
+            _scipy_solver = linear_sum_assignment
+        except ImportError:
+            _scipy_solver = False
+    return _scipy_solver
+
+
+def linear_assignment(cost):
+    """
+    Minimum-cost assignment that leaves infeasible (inf) pairs unassigned
+    :param cost: (n, m) cost matrix, np.inf where a pair is not allowed
+    :return: (rows, cols) index arrays of the feasible assigned pairs
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Replace inf by a cost larger than any feasible assignment, then drop those pairs
+    feasible = np.isfinite(cost)
+    if not feasible.any():
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    finite = cost[feasible]
+    big = (np.abs(finite).max() + 1) * (min(cost.shape) + 1)
+    filled = np.where(feasible, cost, big)
+
+    solver = _linear_sum_assignment()
+    if solver:
+        rows, cols = solver(filled)
+    else:
+        rows, cols = hungarian(filled)
+    keep = feasible[rows, cols]
+    return rows[keep], cols[keep]
@@ -0,0 +1,107 @@
+import numpy as np
+
+
+class BatteryAging:
+    """
+    Cycle-based capacity fade for a fleet of battery packs.
+
+    State is kept in NumPy arrays indexed by battery id. Each charge adds
+    ``DoD`` equivalent full cycles; the fade per equivalent cycle grows with
+    depth of discharge (cycle life ~ DoD ** -dod_exponent) and doubles every
+    ``temperature_doubling`` °C above the reference temperature. A pack reaches
+    end of life at ``end_of_life`` of its nominal capacity.
+    """
+
+    def __init__(self, n_batteries, nominal_capacity, cycle_life=800, end_of_life=0.8,
+                 dod_exponent=1.5, reference_temperature=25, temperature_doubling=10):
+        self.nominal_capacity = np.full(n_batteries, nominal_capacity, dtype=np.float64)
+        self.cycle_life = cycle_life  # full cycles to end of life at 100% DoD, reference temperature
+        self.end_of_life = end_of_life  # state of health at replacement
+        self.dod_exponent = dod_exponent
+        self.reference_temperature = reference_temperature  # °C
+        self.temperature_doubling = temperature_doubling  # °C
+
+        self.fade = np.zeros(n_batteries)  # fraction of nominal capacity lost
+        self.cycles = np.zeros(n_batteries, dtype=np.int64)  # charge count
+        self.equivalent_cycles = np.zeros(n_batteries)  # sum of DoD
+        self.replacements = np.zeros(n_batteries, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.fade)
+
+    @property
+    def capacity(self):
+        """Current capacity per battery (same unit as nominal_capacity)"""
+        return self.nominal_capacity * (1 - self.fade)
+
+    @property
+    def state_of_health(self):
+        """Capacity as a fraction of nominal"""
+        return 1 - self.fade
+
+    def fade_per_cycle(self, dod, temperature):
+        """
+        Capacity fade for one charge cycle (vectorized)
+        :param dod: Depth of discharge (0-1)
+        :param temperature: Temperature (°C)
+        :return: Fraction of nominal capacity lost
+        """
+        dod = np.clip(np.asarray(dod, dtype=np.float64), 0.0, 1.0)
+        temperature = np.asarray(temperature, dtype=np.float64)
+        stress = dod ** self.dod_exponent
+        thermal = 2.0 ** (np.maximum(temperature - self.reference_temperature, 0) / self.temperature_doubling)
+        return (1 - self.end_of_life) / self.cycle_life * stress * thermal
+
+    def record_cycles(self, indices, dod, temperature=25):
+        """
+        Apply charge cycles to batteries (repeated indices are accumulated)
+        :param indices: Battery id(s)
+        :param dod: Depth of discharge per cycle (0-1)
+        :param temperature: Temperature per cycle (°C)
+        """
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        dod = np.broadcast_to(np.clip(np.asarray(dod, dtype=np.float64), 0.0, 1.0), indices.shape)
+        np.add.at(self.fade, indices, self.fade_per_cycle(dod, temperature))
+        np.add.at(self.cycles, indices, 1)
+        np.add.at(self.equivalent_cycles, indices, dod)
+        np.minimum(self.fade, 1.0, out=self.fade)
+
+    def needs_replacement(self):
+        """Boolean mask of batteries at or below end of life"""
+        return self.state_of_health <= self.end_of_life
+
+    def replace(self, indices):
+        """Install new packs for the given battery ids"""
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        self.fade[indices] = 0.0
+        self.cycles[indices] = 0
+        self.equivalent_cycles[indices] = 0.0
+        self.replacements[indices] += 1
+
+    def cycles_to_replacement(self, dod, temperature=25):
+        """
+        Charge cycles left before each battery reaches end of life
+        :param dod: Typical depth of discharge (scalar or per battery)
+        :param temperature: Typical temperature (°C)
+        :return: Array of remaining cycles (inf if no fade)
+        """
+        per_cycle = np.broadcast_to(self.fade_per_cycle(dod, temperature), self.fade.shape)
+        remaining = np.maximum(1 - self.end_of_life - self.fade, 0)
+        with np.errstate(divide='ignore'):
+            return np.where(per_cycle > 0, np.ceil(remaining / per_cycle), np.inf)
+
+    def forecast(self, days, cycles_per_day, dod, temperature=25):
+        """
+        Project state of health over multiple days without changing the fleet
+        :param days: Number of days
+        :param cycles_per_day: Charges per day (scalar or per battery)
+        :param dod: Depth of discharge (scalar or per battery)
+        :param temperature: Temperature (°C), scalar, per battery or per day (shape (days, 1))
+        :return: (state_of_health with shape (days, n), replacement day per battery or -1)
+        """
+        daily = np.broadcast_to(self.fade_per_cycle(dod, temperature) * np.asarray(cycles_per_day),
+                                (days, len(self)))
+        soh = 1 - np.minimum(self.fade + np.cumsum(daily, axis=0), 1.0)
+        worn = soh <= self.end_of_life
+        replacement_day = np.where(worn.any(axis=0), worn.argmax(axis=0), -1)
+        return soh, replacement_day
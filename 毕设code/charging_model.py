@@ -0,0 +1,94 @@
+import numpy as np
+
+
+class ChargeTimeModel:
+    """
+    CC-CV charge time model.
+
+    Constant current at ``charger_power_w`` up to ``cv_threshold`` SOC, then a
+    constant-voltage taper in which the current decays exponentially with the
+    remaining capacity. The taper ends when the current drops to ``cutoff`` of
+    the CC current, which is what "full" (SOC 1.0) means here. Cold or hot
+    batteries charge at a reduced current (see ``temperature_factor``).
+
+    All methods accept NumPy arrays; SOC values are fractions (0-1).
+    """
+
+    def __init__(self, capacity_wh, charger_power_w=500, cv_threshold=0.8, cutoff=0.05,
+                 optimal_temperature=(15, 35), derate_temperature=(0, 45), min_factor=0.2):
+        self.capacity_wh = capacity_wh
+        self.charger_power_w = charger_power_w
+        self.cv_threshold = cv_threshold  # SOC where CV taper starts
+        self.cutoff = cutoff  # taper ends at this fraction of the CC current
+        self.optimal_temperature = optimal_temperature  # °C, full current inside this range
+        self.derate_temperature = derate_temperature  # °C, current halved at these temperatures
+        self.min_factor = min_factor
+
+    @property
+    def full_soc(self):
+        """Highest reachable SOC before the taper cutoff"""
+        return 1 - (1 - self.cv_threshold) * self.cutoff
+
+    def temperature_factor(self, temperature):
+        """
+        Charge current multiplier for the battery temperature
+        :param temperature: Temperature (°C)
+        :return: 1.0 in the optimal range, 0.5 at the derate temperatures, never below min_factor
+        """
+        temperature = np.asarray(temperature, dtype=np.float64)
+        (low, high), (cold, hot) = self.optimal_temperature, self.derate_temperature
+        below = np.maximum(low - temperature, 0) / (low - cold)
+        above = np.maximum(temperature - high, 0) / (hot - high)
+        return np.maximum(1 - 0.5 * (below + above), self.min_factor)
+
+    def _rate(self, capacity_wh, temperature):
+        # CC charge rate in SOC per minute
+        capacity_wh = self.capacity_wh if capacity_wh is None else capacity_wh
+        return self.charger_power_w * self.temperature_factor(temperature) / (np.asarray(capacity_wh) * 60)
+
+    def time_to_soc(self, soc_from, soc_to=1.0, temperature=25, capacity_wh=None):
+        """
+        Charging time between two SOC levels (closed form)
+        :param soc_from: Starting SOC (0-1)
+        :param soc_to: Target SOC (0-1, 1.0 = full)
+        :param temperature: Battery temperature (°C)
+        :param capacity_wh: Battery capacity (Wh), defaults to the model capacity
+        :return: Time in minutes (0 if already at or above the target)
+        """
+        rate = self._rate(capacity_wh, temperature)
+        threshold = self.cv_threshold
+        soc_from = np.clip(np.asarray(soc_from, dtype=np.float64), 0.0, self.full_soc)
+        soc_to = np.clip(np.asarray(soc_to, dtype=np.float64), 0.0, self.full_soc)
+        soc_to = np.maximum(soc_to, soc_from)
+
+        # Constant-current phase
+        cc = (np.minimum(soc_to, threshold) - np.minimum(soc_from, threshold)) / rate
+
+        # Constant-voltage phase: 1 - soc decays with time constant (1 - threshold) / rate
+        tau = (1 - threshold) / rate
+        cv_from = np.maximum(soc_from, threshold)
+        cv_to = np.maximum(soc_to, threshold)
+        cv = tau * np.log((1 - cv_from) / (1 - cv_to))
+        return cc + cv
+
+    def soc_after(self, soc_from, minutes, temperature=25, capacity_wh=None):
+        """
+        SOC reached after charging for a given time (inverse of time_to_soc)
+        :param soc_from: Starting SOC (0-1)
+        :param minutes: Charging time (min)
+        :param temperature: Battery temperature (°C)
+        :param capacity_wh: Battery capacity (Wh), defaults to the model capacity
+        :return: SOC (0-1)
+        """
+        rate = self._rate(capacity_wh, temperature)
+        threshold = self.cv_threshold
+        soc_from = np.clip(np.asarray(soc_from, dtype=np.float64), 0.0, self.full_soc)
+        minutes = np.maximum(np.asarray(minutes, dtype=np.float64), 0.0)
+
+        cc_time = np.maximum(threshold - soc_from, 0) / rate
+        cc_soc = np.minimum(soc_from + rate * minutes, np.maximum(soc_from, threshold))
+
+        tau = (1 - threshold) / rate
+        cv_start = np.maximum(soc_from, threshold)
+        cv_soc = 1 - (1 - cv_start) * np.exp(-np.maximum(minutes - cc_time, 0) / tau)
+        return np.minimum(np.where(minutes <= cc_time, cc_soc, cv_soc), self.full_soc)
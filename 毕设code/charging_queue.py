@@ -0,0 +1,156 @@
+import heapq
+import numpy as np
+
+# Queue disciplines
+QUEUE_FIFO = 'fifo'
+QUEUE_PRIORITY = 'priority'
+
+# Task priority -> queue priority (lower charges first)
+TASK_PRIORITY = {'high': 0, 'normal': 1, 'low': 2}
+
+
+class ChargingStation:
+    """
+    Charging station with a limited number of bays.
+
+    Times are minutes on the caller's clock. ``request`` books one session
+    ahead: the drone takes the bay that frees up first and waits if all bays
+    are busy (first come, first served in call order, whatever the
+    discipline). Event-driven callers use ``arrive`` and ``release`` instead:
+    drones that find every bay busy are held in a queue, and each freed bay
+    goes to the next one in discipline order, so under ``'priority'`` a
+    waiting high-priority drone charges ahead of earlier, lower-priority
+    arrivals.
+    """
+
+    def __init__(self, name, capacity=4, discipline=QUEUE_FIFO):
+        if capacity < 1:
+            raise ValueError("Charging station needs at least one bay")
+        if discipline not in (QUEUE_FIFO, QUEUE_PRIORITY):
+            raise ValueError(f"Unknown queue discipline: {discipline}")
+        self.name = name
+        self.capacity = int(capacity)
+        self.discipline = discipline
+        self.reset()
+
+    def reset(self):
+        """Clear all bookings and statistics"""
+        self.bay_free_at = np.zeros(self.capacity)  # time each bay becomes free
+        # Drones waiting for a bay (arrive/release): (key, arrival, seq, duration, drone_id, priority, ticket)
+        self.waiting = []
+        self._queued = 0
+        # Session log: (drone_id, bay, arrival, start, end, priority)
+        self.sessions = []
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def available(self, time):
+        """Number of bays free at the given time"""
+        return int(np.count_nonzero(self.bay_free_at <= time))
+
+    def request(self, arrival, duration, drone_id=None, priority=1):
+        """
+        Book a charge session
+        :param arrival: Arrival time (min)
+        :param duration: Charge time (min)
+        :param drone_id: Drone identifier (for statistics)
+        :param priority: Queue priority (recorded only: bookings are served in call order)
+        :return: (start, end, bay)
+        """
+        bay = int(np.argmin(self.bay_free_at))
+        start = max(float(arrival), float(self.bay_free_at[bay]))
+        return self._start(bay, arrival, start, duration, drone_id, priority)
+
+    def _start(self, bay, arrival, start, duration, drone_id, priority):
+        # Occupy a bay and log the session
+        end = float(start) + float(duration)
+        self.bay_free_at[bay] = end
+        self.sessions.append((drone_id, bay, float(arrival), float(start), end, priority))
+        return float(start), end, bay
+
+    def arrive(self, arrival, duration, drone_id=None, priority=1, ticket=None):
+        """
+        A drone arrives to charge (event-driven use): it starts at once if a bay is
+        free, otherwise it waits until ``release`` hands it a bay
+        :param arrival: Arrival time (min), the caller's current time
+        :param duration: Charge time (min)
+        :param drone_id: Drone identifier (for statistics)
+        :param priority: Queue priority (lower is served first under 'priority')
+        :param ticket: Caller data handed back by ``release`` when the drone is served
+        :return: (start, end, bay), or None if the drone has to wait
+        """
+        bay = int(np.argmin(self.bay_free_at))
+        if self.bay_free_at[bay] <= arrival and not self.waiting:
+            return self._start(bay, arrival, arrival, duration, drone_id, priority)
+        key = priority if self.discipline == QUEUE_PRIORITY else 0
+        heapq.heappush(self.waiting, (key, float(arrival), self._queued, float(duration), drone_id, priority, ticket))
+        self._queued += 1
+        return None
+
+    def release(self, time, bay):
+        """
+        A session ended: the bay goes to the next waiting drone in discipline order
+        :param time: Current time (min)
+        :param bay: Bay that became free
+        :return: (start, end, bay, arrival, ticket) of the drone now charging, or None if none waits
+        """
+        if self.bay_free_at[bay] > time:
+            # A drone arriving at the same instant already took the bay (its session ends later)
+            return None
+        self.bay_free_at[bay] = float(time)
+        if not self.waiting:
+            return None
+        _, arrival, _, duration, drone_id, priority, ticket = heapq.heappop(self.waiting)
+        start, end, bay = self._start(bay, arrival, time, duration, drone_id, priority)
+        return start, end, bay, arrival, ticket
+
+    def wait_times(self):
+        """Queueing delay of every session (min)"""
+        if not self.sessions:
+            return np.zeros(0)
+        times = np.array([s[2:5] for s in self.sessions])
+        return times[:, 1] - times[:, 0]
+
+    def utilisation(self, horizon=None):
+        """
+        Fraction of bay time spent charging
+        :param horizon: (start, end) window in minutes; defaults to first arrival to last departure
+        :return: Utilisation (0-1)
+        """
+        if not self.sessions:
+            return 0.0
+        times = np.array([s[2:5] for s in self.sessions])
+        if horizon is None:
+            horizon = (times[:, 0].min(), times[:, 2].max())
+        begin, end = horizon
+        if end <= begin:
+            return 0.0
+        busy = np.clip(np.minimum(times[:, 2], end) - np.maximum(times[:, 1], begin), 0, None).sum()
+        return float(busy / (self.capacity * (end - begin)))
+
+    def max_queue_length(self):
+        """Largest number of drones waiting at the same time"""
+        waits = self.wait_times()
+        if not np.any(waits > 0):
+            return 0
+        times = np.array([s[2:4] for s in self.sessions])[waits > 0]
+        # +1 at arrival, -1 at start; starts sort before arrivals at the same time
+        events = np.concatenate([times[:, 0], times[:, 1]])
+        steps = np.concatenate([np.ones(len(times)), -np.ones(len(times))])
+        order = np.lexsort((steps, events))
+        return int(np.cumsum(steps[order]).max())
+
+    def summary(self, horizon=None):
+        """Queue statistics as a dict"""
+        waits = self.wait_times()
+        return {
+            'station': self.name,
+            'bays': self.capacity,
+            'sessions': len(self.sessions),
+            'queued': int(np.count_nonzero(waits > 0)),
+            'mean_wait': float(waits.mean()) if len(waits) else 0.0,
+            'max_wait': float(waits.max()) if len(waits) else 0.0,
+            'max_queue': self.max_queue_length(),
+            'utilisation': self.utilisation(horizon)
+        }
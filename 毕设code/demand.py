@@ -0,0 +1,106 @@
+import numpy as np
+
+# Relative demand per hour of day (mean 1): quiet night, morning and afternoon peaks
+DEFAULT_DAILY_PROFILE = np.array([0.3, 0.2, 0.2, 0.2, 0.3, 0.5, 0.8, 1.2, 1.6, 1.7, 1.6, 1.4,
+                                  1.3, 1.4, 1.5, 1.5, 1.4, 1.2, 1.0, 0.9, 0.8, 0.6, 0.5, 0.4])
+
+
+class DemandStream:
+    """
+    Non-homogeneous Poisson demand, generated lazily.
+
+    Each source is one (center, hospital, material type, priority) flow with a
+    base rate in tasks per hour, scaled by a 24-hour profile (its own
+    ``'profile'`` or the stream default). Arrivals are drawn by thinning the
+    superposed process, so iterating yields (minute, request) pairs in time
+    order and never holds more than one pending arrival. The iterator keeps
+    its state (clock and RNG) in plain attributes, so a half-consumed stream
+    can be pickled with a simulation checkpoint.
+    """
+
+    def __init__(self, sources, horizon_min=24 * 60, profile=DEFAULT_DAILY_PROFILE, seed=None, payload_sigma=0.25):
+        """
+        :param sources: List of dicts with 'from', 'to' (names), 'material_type', 'priority',
+                        'payload_kg' (mean) and 'rate_per_hour'; optional 'profile' (24 values)
+        :param horizon_min: Stop generating after this many minutes (None = endless)
+        :param profile: Default hourly rate multipliers (24 values)
+        :param seed: Seed of the arrival stream
+        :param payload_sigma: Log-normal spread of payloads around the source mean
+        """
+        if not sources:
+            raise ValueError("Demand stream needs at least one source")
+        self.sources = list(sources)
+        self.horizon_min = horizon_min
+        self.seed = seed
+        self.payload_sigma = payload_sigma
+        self.rates = np.array([s['rate_per_hour'] for s in self.sources], dtype=np.float64)
+        self.profiles = np.array([s.get('profile', profile) for s in self.sources], dtype=np.float64)
+        if self.profiles.shape[1] != 24:
+            raise ValueError("Rate profiles need 24 hourly values")
+
+    @classmethod
+    def from_tasks(cls, tasks, tasks_per_day, **kwargs):
+        """
+        Build sources from a task list (e.g. the default tasks)
+        :param tasks: Task dicts; each distinct flow becomes a source weighted by its frequency
+        :param tasks_per_day: Mean number of tasks per day over all sources
+        :param kwargs: Options for DemandStream
+        """
+        flows = {}
+        for task in tasks:
+            key = (task['from']['name'], task['to']['name'], task['material_type'], task['priority'])
+            flows.setdefault(key, []).append(task['payload_kg'])
+        sources = [{'from': origin, 'to': destination, 'material_type': material, 'priority': priority,
+                    'payload_kg': float(np.mean(payloads)),
+                    'rate_per_hour': tasks_per_day * len(payloads) / len(tasks) / 24}
+                   for (origin, destination, material, priority), payloads in flows.items()]
+        return cls(sources, **kwargs)
+
+    def rate(self, minute):
+        """Arrival rate of every source at a time (tasks per hour)"""
+        return self.rates * self.profiles[:, int(minute // 60) % 24]
+
+    def expected_count(self, horizon_min=None):
+        """Expected number of arrivals up to the horizon"""
+        horizon_min = self.horizon_min if horizon_min is None else horizon_min
+        hours = np.arange(int(np.ceil(horizon_min / 60)))
+        weights = np.minimum(horizon_min - hours * 60, 60) / 60
+        return float((self.rates @ self.profiles[:, hours % 24]) @ weights)
+
+    def __iter__(self):
+        return DemandIterator(self)
+
+
+class DemandIterator:
+    """Arrival iterator of a DemandStream (thinning, state in attributes)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.rng = np.random.default_rng(stream.seed)
+        self.peak = stream.rates * stream.profiles.max(axis=1)  # per-source bound for thinning
+        self.total = self.peak.sum()
+        self.minute = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        stream, rng = self.stream, self.rng
+        if self.total <= 0:
+            raise StopIteration
+        while True:
+            self.minute += rng.exponential(60 / self.total)
+            if stream.horizon_min is not None and self.minute >= stream.horizon_min:
+                self.total = 0.0
+                raise StopIteration
+            k = rng.choice(len(stream.sources), p=self.peak / self.total)
+            if rng.random() * self.peak[k] < stream.rates[k] * stream.profiles[k, int(self.minute // 60) % 24]:
+                break
+        source = stream.sources[k]
+        return self.minute, {
+            'from': source['from'],
+            'to': source['to'],
+            'payload_kg': float(source['payload_kg'] * rng.lognormal(0.0, stream.payload_sigma)),
+            'material_type': source['material_type'],
+            'priority': source['priority']
+        }
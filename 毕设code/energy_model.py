@@ -0,0 +1,122 @@
+import numpy as np
+
+
+class EnergyParams:
+    """Flight and battery parameters shared by every energy calculation"""
+
+    def __init__(self, cruise_speed=40, power_consumption=150, takeoff_power=250, landing_power=100,
+                 takeoff_time=1, landing_time=1, battery_capacity=10000, battery_voltage=14.8,
+                 max_payload_kg=15.9, payload_energy_factor=0.05, payload_time_factor=0.3):
+        self.cruise_speed = cruise_speed  # km/h
+        self.power_consumption = power_consumption  # W (cruising)
+        self.takeoff_power = takeoff_power  # W (takeoff)
+        self.landing_power = landing_power  # W (landing)
+        self.takeoff_time = takeoff_time  # min
+        self.landing_time = landing_time  # min
+        self.battery_capacity = battery_capacity  # mAh
+        self.battery_voltage = battery_voltage  # V
+        self.max_payload_kg = max_payload_kg  # kg
+        self.payload_energy_factor = payload_energy_factor  # energy increase per 10 kg
+        self.payload_time_factor = payload_time_factor  # time increase at max payload
+
+    @property
+    def battery_wh(self):
+        """Battery capacity in Wh"""
+        return self.battery_capacity / 1000 * self.battery_voltage
+
+
+class EnergyModel:
+    """
+    Single source of truth for flight time and energy.
+
+    Every method accepts Python scalars or NumPy arrays (broadcast together);
+    the ``*_batch`` entry points always return arrays, the scalar ones floats.
+    """
+
+    def __init__(self, params=None):
+        self.params = params if params is not None else EnergyParams()
+
+    def _flight_time(self, distance_km, payload_kg, ground_speed_kmh=None):
+        p = self.params
+        if ground_speed_kmh is None:
+            base_time = distance_km / p.cruise_speed * 60  # min
+        else:
+            # Zero ground speed (wind cannot be overcome) gives an infinite time
+            with np.errstate(divide='ignore', invalid='ignore'):
+                base_time = np.where(distance_km > 0, distance_km / ground_speed_kmh * 60, 0.0)
+        return base_time * (1 + payload_kg / p.max_payload_kg * p.payload_time_factor)
+
+    def _energy_from_time(self, flight_time_min, payload_kg):
+        p = self.params
+        takeoff_energy = p.takeoff_time / 60 * p.takeoff_power
+        landing_energy = p.landing_time / 60 * p.landing_power
+        cruise_time = np.maximum(flight_time_min - p.takeoff_time - p.landing_time, 0)
+        cruise_energy = cruise_time / 60 * p.power_consumption
+        payload_factor = 1 + (payload_kg / 10) * p.payload_energy_factor
+        return (takeoff_energy + landing_energy + cruise_energy) * payload_factor
+
+    def _battery_percent(self, energy_wh):
+        return np.minimum(energy_wh / self.params.battery_wh * 100, 100)
+
+    def flight_time(self, distance_km, payload_kg):
+        """
+        Flight time for a leg
+        :param distance_km: Distance (km)
+        :param payload_kg: Payload (kg)
+        :return: Flight time (minutes)
+        """
+        return float(self._flight_time(distance_km, payload_kg))
+
+    def energy_from_time(self, flight_time_min, payload_kg):
+        """
+        Energy for a flight of known duration (takeoff, cruise and landing phases)
+        :param flight_time_min: Flight time (minutes)
+        :param payload_kg: Payload (kg)
+        :return: Energy (Wh)
+        """
+        return float(self._energy_from_time(flight_time_min, payload_kg))
+
+    def battery_percent(self, energy_wh):
+        """
+        Convert energy into battery percentage
+        :param energy_wh: Energy (Wh)
+        :return: Battery usage (%), capped at 100
+        """
+        return float(self._battery_percent(energy_wh))
+
+    def evaluate(self, distance_km, payload_kg):
+        """
+        Flight time, energy and battery usage for one leg
+        :param distance_km: Distance (km)
+        :param payload_kg: Payload (kg)
+        :return: (flight_time_min, energy_wh, battery_percent)
+        """
+        flight_time = self._flight_time(distance_km, payload_kg)
+        energy = self._energy_from_time(flight_time, payload_kg)
+        return float(flight_time), float(energy), float(self._battery_percent(energy))
+
+    def segment_times(self, distances_km, payloads_kg, ground_speed_kmh=None):
+        """
+        Vectorized flight time per segment
+        :param distances_km: Array of distances (km)
+        :param payloads_kg: Array of payloads (kg), or a scalar for all segments
+        :param ground_speed_kmh: Optional ground speed per segment (km/h), default cruise speed
+        :return: Flight times (minutes) as an array
+        """
+        distances_km = np.asarray(distances_km, dtype=np.float64)
+        payloads_kg = np.asarray(payloads_kg, dtype=np.float64)
+        return self._flight_time(distances_km, payloads_kg, ground_speed_kmh)
+
+    def evaluate_batch(self, distances_km, payloads_kg, ground_speed_kmh=None):
+        """
+        Vectorized ``evaluate`` over many legs in one call
+        :param distances_km: Array of distances (km)
+        :param payloads_kg: Array of payloads (kg), or a scalar for all legs
+        :param ground_speed_kmh: Optional ground speed per leg (km/h), default cruise speed
+        :return: (flight_time_min, energy_wh, battery_percent) arrays
+        """
+        distances_km = np.asarray(distances_km, dtype=np.float64)
+        payloads_kg = np.asarray(payloads_kg, dtype=np.float64)
+        flight_time = self._flight_time(distances_km, payloads_kg, ground_speed_kmh)
+        energy = self._energy_from_time(flight_time, payloads_kg)
+        return flight_time, energy, self._battery_percent(energy)
@@ -0,0 +1,78 @@
+import heapq
+
+
+class EventEngine:
+    """
+    Heap-based discrete-event loop.
+
+    Events are (time, sequence, kind, data) tuples on a binary heap, so
+    scheduling and popping are O(log n) and events at the same time run in the
+    order they were scheduled. Handlers are registered per event kind and are
+    called as ``handler(**data)`` with ``engine.now`` set to the event time.
+    Kinds listed in ``background`` (e.g. periodic housekeeping) do not keep
+    the loop alive: ``run`` stops once only background events remain.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = float(start)  # Simulation time (min)
+        self.handlers = {}
+        self.processed = 0
+        self.background = set()  # event kinds that do not keep the run going
+        self._background_count = 0
+        self._heap = []
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def on(self, kind, handler):
+        """Register the handler for an event kind"""
+        self.handlers[kind] = handler
+
+    def schedule(self, time, kind, **data):
+        """
+        Schedule an event at an absolute time
+        :param time: Event time (min), not earlier than now
+        :param kind: Event kind (must have a handler when it fires)
+        :param data: Keyword arguments passed to the handler
+        """
+        if time < self.now:
+            raise ValueError(f"Cannot schedule {kind} at {time} before current time {self.now}")
+        heapq.heappush(self._heap, (float(time), self._sequence, kind, data))
+        self._sequence += 1
+        if kind in self.background:
+            self._background_count += 1
+
+    def schedule_in(self, delay, kind, **data):
+        """Schedule an event ``delay`` minutes from now"""
+        self.schedule(self.now + delay, kind, **data)
+
+    def pending(self):
+        """Number of queued events that are not background events"""
+        return len(self._heap) - self._background_count
+
+    def peek(self):
+        """Time of the next event (None if empty)"""
+        return self._heap[0][0] if self._heap else None
+
+    def run(self, until=None, before_event=None):
+        """
+        Process events in time order
+        :param until: Stop before events later than this time (None = run until only background events remain)
+        :param before_event: Optional callback(time) called before each handler (e.g. to sync a clock)
+        :return: Number of events processed
+        """
+        processed = 0
+        while len(self._heap) > self._background_count and (until is None or self._heap[0][0] <= until):
+            time, _, kind, data = heapq.heappop(self._heap)
+            if kind in self.background:
+                self._background_count -= 1
+            self.now = time
+            if before_event is not None:
+                before_event(time)
+            self.handlers[kind](**data)
+            processed += 1
+        if until is not None and until > self.now:
+            self.now = float(until)
+        self.processed += processed
+        return processed
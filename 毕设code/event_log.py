@@ -0,0 +1,312 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+# Typed columns besides time_min and event
+FLOAT_COLUMNS = ('battery_level', 'distance', 'energy_used', 'payload', 'wait')
+INT_COLUMNS = ('bay',)
+TEXT_COLUMNS = ('drone', 'task', 'from', 'to', 'station', 'reason')  # stored as codes into EventLog.strings
+LOG_COLUMNS = ('time_min', 'event') + FLOAT_COLUMNS + INT_COLUMNS + TEXT_COLUMNS
+
+
+class EventLog:
+    """
+    Append-only columnar event log.
+
+    Entries are the dicts the simulation has always logged ('time' in
+    simulation minutes, 'event', and any of the typed columns). They are
+    stored in fixed-size chunks of NumPy arrays: float64 time and numbers,
+    int32 codes for event names and text (interned in ``strings``), so an
+    entry costs about 80 bytes. With a sink attached, every full chunk is
+    written out as the run proceeds and, unless ``keep`` is set, dropped.
+    """
+
+    def __init__(self, chunk_rows=8192):
+        self.chunk_rows = int(chunk_rows)
+        self.strings = []  # code -> text (event names and text columns)
+        self._codes = {}
+        self._chunks = []  # full chunks still in memory
+        self._chunk = self._new_chunk()
+        self._fill = 0
+        self.count = 0  # entries appended (including flushed ones)
+        self.sink = None
+        self.keep = True
+
+    def _new_chunk(self):
+        chunk = {'time_min': np.empty(self.chunk_rows), 'event': np.empty(self.chunk_rows, dtype=np.int32)}
+        for name in FLOAT_COLUMNS:
+            chunk[name] = np.full(self.chunk_rows, np.nan)
+        for name in INT_COLUMNS + TEXT_COLUMNS:
+            chunk[name] = np.full(self.chunk_rows, -1, dtype=np.int32)
+        return chunk
+
+    def intern(self, text):
+        """Code of a string in the string table"""
+        code = self._codes.get(text)
+        if code is None:
+            code = self._codes[text] = len(self.strings)
+            self.strings.append(text)
+        return code
+
+    def __len__(self):
+        """Entries held in memory"""
+        return len(self._chunks) * self.chunk_rows + self._fill
+
+    def append(self, entry):
+        """
+        Append one entry
+        :param entry: dict with 'time' (min), 'event' and optional typed columns; other keys are ignored
+        """
+        chunk, row = self._chunk, self._fill
+        chunk['time_min'][row] = entry['time']
+        chunk['event'][row] = self.intern(entry['event'])
+        for name in FLOAT_COLUMNS:
+            chunk[name][row] = entry.get(name, np.nan)
+        for name in INT_COLUMNS:
+            chunk[name][row] = entry.get(name, -1)
+        for name in TEXT_COLUMNS:
+            value = entry.get(name)
+            chunk[name][row] = -1 if value is None else self.intern(str(value))
+
+        self._fill += 1
+        self.count += 1
+        if self._fill == self.chunk_rows:
+            if self.sink is not None:
+                self.sink.write(self, chunk, self.chunk_rows)
+            if self.sink is None or self.keep:
+                self._chunks.append(chunk)
+            self._chunk = self._new_chunk()
+            self._fill = 0
+
+    def _held(self):
+        # (chunk, rows) pairs held in memory, oldest first
+        return [(chunk, self.chunk_rows) for chunk in self._chunks] + [(self._chunk, self._fill)]
+
+    def column(self, name):
+        """Concatenated values of one column held in memory (text and events as codes)"""
+        return np.concatenate([chunk[name][:rows] for chunk, rows in self._held()])
+
+    def rows(self, chunk, rows):
+        """Decode chunk rows into dicts (missing values left out)"""
+        strings = self.strings
+        for i in range(rows):
+            entry = {'time_min': float(chunk['time_min'][i]), 'event': strings[chunk['event'][i]]}
+            for name in FLOAT_COLUMNS:
+                if not np.isnan(chunk[name][i]):
+                    entry[name] = float(chunk[name][i])
+            for name in INT_COLUMNS:
+                if chunk[name][i] >= 0:
+                    entry[name] = int(chunk[name][i])
+            for name in TEXT_COLUMNS:
+                if chunk[name][i] >= 0:
+                    entry[name] = strings[chunk[name][i]]
+            yield entry
+
+    def __iter__(self):
+        for chunk, rows in self._held():
+            yield from self.rows(chunk, rows)
+
+    def to_frame(self):
+        """Entries held in memory as a pandas DataFrame (text decoded)"""
+        import pandas as pd
+        frame = {}
+        strings = np.array(self.strings + [None], dtype=object)  # code -1 -> None
+        for name in LOG_COLUMNS:
+            values = self.column(name)
+            frame[name] = strings[values] if name == 'event' or name in TEXT_COLUMNS else values
+        return pd.DataFrame(frame)
+
+    def stream_to(self, file_path, keep=False):
+        """
+        Write entries to a file as the run proceeds (format from the extension:
+        .csv, .jsonl or .parquet). Entries already held are written first.
+        :param file_path: Output path
+        :param keep: Also keep flushed chunks in memory
+        :return: The sink
+        """
+        self.close()
+        self.sink = open_sink(file_path)
+        self.keep = keep
+        for chunk in self._chunks:
+            self.sink.write(self, chunk, self.chunk_rows)
+        if not keep:
+            self._chunks = []
+        return self.sink
+
+    def close(self):
+        """Flush the partial chunk to the sink and close it"""
+        if self.sink is None:
+            return
+        self.sink.write(self, self._chunk, self._fill)
+        self.sink.close()
+        if not self.keep:
+            self._chunk = self._new_chunk()
+            self._fill = 0
+        self.sink = None
+        self.keep = True
+
+    def __getstate__(self):
+        # Checkpoints: trim the partial chunk and remember where the sink stopped
+        state = self.__dict__.copy()
+        state['_chunk'] = {name: values[:self._fill].copy() for name, values in self._chunk.items()}
+        state['sink'] = None
+        if self.sink is not None:
+            state['_sink_resume'] = self.sink.checkpoint()
+        return state
+
+    def __setstate__(self, state):
+        resume = state.pop('_sink_resume', None)
+        self.__dict__.update(state)
+        partial, self._chunk = self._chunk, self._new_chunk()
+        for name, values in partial.items():
+            self._chunk[name][:self._fill] = values
+        if resume is not None:
+            # Reopen the stream and drop anything written after the checkpoint
+            sink_class, args = resume
+            self.sink = sink_class(*args)
+
+    def export(self, file_path):
+        """
+        Write the entries held in memory to a file, chunk by chunk
+        (.csv, .jsonl, .parquet, or .json for one JSON array)
+        :return: Number of entries written
+        """
+        sink = open_sink(file_path)
+        written = 0
+        for chunk, rows in self._held():
+            sink.write(self, chunk, rows)
+            written += rows
+        sink.close()
+        return written
+
+
+def open_sink(file_path):
+    """Log writer for a file path, chosen by extension"""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if file_path.endswith('.csv'):
+        return CsvSink(file_path)
+    if file_path.endswith('.jsonl'):
+        return JsonLinesSink(file_path)
+    if file_path.endswith('.json'):
+        return JsonArraySink(file_path)
+    if file_path.endswith('.parquet'):
+        return ParquetSink(file_path)
+    raise ValueError(f"Unsupported log format: {file_path}")
+
+
+def _open_text(file_path, offset, newline=None):
+    # New file, or an existing one cut back to a checkpointed offset
+    if offset is None:
+        return open(file_path, 'w', newline=newline, encoding='utf-8')
+    f = open(file_path, 'r+', newline=newline, encoding='utf-8')
+    f.seek(offset)
+    f.truncate()
+    return f
+
+
+class CsvSink:
+    """CSV with one column per log field (empty when missing)"""
+
+    def __init__(self, file_path, offset=None):
+        self.file_path = file_path
+        self._file = _open_text(file_path, offset, newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=LOG_COLUMNS)
+        if offset is None:
+            self._writer.writeheader()
+
+    def checkpoint(self):
+        """(class, arguments) that reopen the file at the current end"""
+        self._file.flush()
+        return type(self), (self.file_path, self._file.tell())
+
+    def write(self, log, chunk, rows):
+        self._writer.writerows(log.rows(chunk, rows))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class JsonLinesSink:
+    """One JSON object per line"""
+
+    def __init__(self, file_path, offset=None):
+        self.file_path = file_path
+        self._file = _open_text(file_path, offset)
+
+    def checkpoint(self):
+        """(class, arguments) that reopen the file at the current end"""
+        self._file.flush()
+        return type(self), (self.file_path, self._file.tell())
+
+    def write(self, log, chunk, rows):
+        self._file.writelines(json.dumps(entry, ensure_ascii=False) + '\n' for entry in log.rows(chunk, rows))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class JsonArraySink(JsonLinesSink):
+    """A single JSON array, written one entry per line"""
+
+    def __init__(self, file_path, offset=None, first=True):
+        super().__init__(file_path, offset)
+        if offset is None:
+            self._file.write('[')
+        self._first = first
+
+    def checkpoint(self):
+        sink_class, args = super().checkpoint()
+        return sink_class, args + (self._first,)
+
+    def write(self, log, chunk, rows):
+        for entry in log.rows(chunk, rows):
+            self._file.write(('\n' if self._first else ',\n') + json.dumps(entry, ensure_ascii=False))
+            self._first = False
+        self._file.flush()
+
+    def close(self):
+        self._file.write('\n]\n')
+        self._file.close()
+
+
+class ParquetSink:
+    """Parquet row groups with typed columns (needs pyarrow)"""
+
+    def __init__(self, file_path):
+        import pyarrow
+        import pyarrow.parquet
+        self._pa = pyarrow
+        self._writer = pyarrow.parquet.ParquetWriter(file_path, self._schema())
+
+    def checkpoint(self):
+        """Parquet files cannot be reopened for appending: the stream ends at a checkpoint"""
+        print("Parquet log stream is not resumed from checkpoints")
+        return None
+
+    def _schema(self):
+        pa = self._pa
+        fields = [('time_min', pa.float64()), ('event', pa.string())]
+        fields += [(name, pa.float64()) for name in FLOAT_COLUMNS]
+        fields += [(name, pa.int32()) for name in INT_COLUMNS]
+        fields += [(name, pa.string()) for name in TEXT_COLUMNS]
+        return pa.schema(fields)
+
+    def write(self, log, chunk, rows):
+        if rows == 0:
+            return
+        pa = self._pa
+        strings = np.array(log.strings + [None], dtype=object)
+        arrays = [pa.array(chunk['time_min'][:rows]), pa.array(strings[chunk['event'][:rows]])]
+        arrays += [pa.array(chunk[name][:rows], from_pandas=True) for name in FLOAT_COLUMNS]
+        arrays += [pa.array(chunk[name][:rows], mask=chunk[name][:rows] < 0) for name in INT_COLUMNS]
+        arrays += [pa.array(strings[chunk[name][:rows]]) for name in TEXT_COLUMNS]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._writer.schema))
+
+    def close(self):
+        self._writer.close()
@@ -0,0 +1,276 @@
+import heapq
+import numpy as np
+
+# Drone status codes (index = code stored in FleetState.status)
+DRONE_STATUSES = ('idle', 'assigned', 'queued', 'charging', 'swapping', 'flying', 'delivering')
+STATUS_CODE = {status: code for code, status in enumerate(DRONE_STATUSES)}
+
+
+class FleetState:
+    """
+    Struct-of-arrays drone fleet.
+
+    Every per-drone attribute is one NumPy array indexed by the integer drone
+    id, so memory per drone is a few dozen bytes and bulk queries ("idle
+    drones at base X", "charge all idle drones") are vector operations.
+    Idle drones are also indexed per home base in a max-heap keyed by battery
+    level, so picking the best idle drone at a base is O(log n).
+    Iterating or indexing yields lightweight ``DroneView`` objects that behave
+    like the old per-drone dicts; they are created on demand and hold no state.
+    The current task is the only Python object per drone and is stored only
+    while a drone has one.
+    """
+
+    def __init__(self, capacity=16):
+        self.size = 0
+        self.base_names = []  # home base index -> name
+        self._base_lookup = {}
+        self.current_task = {}  # drone index -> task (busy drones only)
+        # Availability index: base index -> heap of (-battery level, drone index, stamp).
+        # Entries are invalidated lazily: only the one matching _stamp[drone] is live.
+        self._available = {}
+        self._allocate(max(int(capacity), 1))
+
+    def _allocate(self, capacity):
+        old = getattr(self, 'battery_level', None)
+        arrays = {
+            'battery_level': np.zeros(capacity),  # %
+            'battery_cycles': np.zeros(capacity, dtype=np.int32),
+            'battery_swaps': np.zeros(capacity, dtype=np.int32),
+            'position': np.zeros((capacity, 2)),  # (lat, lon)
+            'status': np.zeros(capacity, dtype=np.uint8),  # STATUS_CODE
+            'home_base': np.zeros(capacity, dtype=np.int32),  # index into base_names
+            'origin': np.zeros(capacity, dtype=np.int32),  # base the drone was created at (names it)
+            'ordinal': np.zeros(capacity, dtype=np.int32),  # number of the drone at its origin base (from 1)
+            'total_distance': np.zeros(capacity),  # km
+            'total_flight_time': np.zeros(capacity),  # min
+            '_stamp': np.zeros(capacity, dtype=np.int64)  # availability index version
+        }
+        for name, array in arrays.items():
+            if old is not None:
+                array[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, array)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield DroneView(self, index)
+
+    def __getitem__(self, index):
+        if not -self.size <= index < self.size:
+            raise IndexError(f"Drone index {index} out of range")
+        return DroneView(self, index % self.size)
+
+    def base_index(self, name, create=False):
+        """
+        Index of a home base by name
+        :param name: Base name
+        :param create: Register the base if it is unknown
+        :return: Base index, or -1 if unknown and create is False
+        """
+        if name not in self._base_lookup:
+            if not create:
+                return -1
+            self._base_lookup[name] = len(self.base_names)
+            self.base_names.append(name)
+        return self._base_lookup[name]
+
+    def add_drones(self, base_name, position, count, battery_level=100):
+        """
+        Add drones at a home base
+        :param base_name: Home base name
+        :param position: (lat, lon) of the base
+        :param count: Number of drones
+        :param battery_level: Initial battery level (%)
+        :return: Integer ids of the new drones
+        """
+        if self.size + count > len(self.battery_level):
+            self._allocate(max(2 * len(self.battery_level), self.size + count))
+        base = self.base_index(base_name, create=True)
+        ids = np.arange(self.size, self.size + count)
+        first_ordinal = np.count_nonzero(self.origin[:self.size] == base) + 1
+
+        self.battery_level[ids] = battery_level
+        self.battery_cycles[ids] = 0
+        self.battery_swaps[ids] = 0
+        self.position[ids] = position
+        self.status[ids] = STATUS_CODE['idle']
+        self.home_base[ids] = base
+        self.origin[ids] = base
+        self.ordinal[ids] = np.arange(first_ordinal, first_ordinal + count)
+        self.total_distance[ids] = 0
+        self.total_flight_time[ids] = 0
+        self._stamp[ids] = 0
+        self.size += count
+
+        heap = self._available.setdefault(base, [])
+        heap.extend(zip((-self.battery_level[ids]).tolist(), ids.tolist(), [0] * count))
+        heapq.heapify(heap)
+        return ids
+
+    def drone_name(self, index):
+        """Readable drone id, e.g. 'Center_Drone_1'"""
+        return f"{self.base_names[self.origin[index]]}_Drone_{self.ordinal[index]}"
+
+    def with_status(self, status, base_name=None):
+        """
+        Integer ids of drones with a status, optionally at one home base
+        :param status: Status name (see DRONE_STATUSES)
+        :param base_name: Home base name (None = any base)
+        :return: Array of drone ids
+        """
+        mask = self.status[:self.size] == STATUS_CODE[status]
+        if base_name is not None:
+            mask &= self.home_base[:self.size] == self.base_index(base_name)
+        return np.flatnonzero(mask)
+
+    def idle_at_base(self, base_name):
+        """Integer ids of idle drones at a home base"""
+        return self.with_status('idle', base_name)
+
+    def _index_available(self, index):
+        # (Re)insert an idle drone into its base heap, invalidating older entries
+        self._stamp[index] += 1
+        heap = self._available.setdefault(int(self.home_base[index]), [])
+        heapq.heappush(heap, (-float(self.battery_level[index]), int(index), int(self._stamp[index])))
+        if len(heap) > 2 * self.size + 64:
+            self._compact(int(self.home_base[index]))
+
+    def _compact(self, base):
+        # Drop stale entries of one base heap
+        ids = np.flatnonzero((self.home_base[:self.size] == base) &
+                             (self.status[:self.size] == STATUS_CODE['idle']))
+        heap = list(zip((-self.battery_level[ids]).tolist(), ids.tolist(), self._stamp[ids].tolist()))
+        heapq.heapify(heap)
+        self._available[base] = heap
+
+    def reindex(self):
+        """Rebuild the availability index (after writing the arrays directly)"""
+        self._available = {}
+        for base in range(len(self.base_names)):
+            self._compact(base)
+
+    def set_status(self, index, status):
+        """Change a drone's status, keeping the availability index current"""
+        code = STATUS_CODE[status]
+        if code == STATUS_CODE['idle'] and self.status[index] != code:
+            self.status[index] = code
+            self._index_available(index)
+        else:
+            self.status[index] = code
+
+    def set_battery_level(self, index, level):
+        """Change a drone's battery level, keeping the availability index current"""
+        self.battery_level[index] = level
+        if self.status[index] == STATUS_CODE['idle']:
+            self._index_available(index)
+
+    def best_idle_at_base(self, base_name):
+        """
+        Idle drone with the highest battery at a home base (ties: lowest id)
+        :return: Drone id, or None if no drone is idle there
+        """
+        heap = self._available.get(self.base_index(base_name))
+        while heap:
+            _, index, stamp = heap[0]
+            if stamp == self._stamp[index] and self.status[index] == STATUS_CODE['idle']:
+                return index
+            heapq.heappop(heap)
+        return None
+
+    def charge_idle(self, level=100, base_name=None):
+        """
+        Charge every idle drone (optionally at one base) to a level
+        :param level: Target battery level (%)
+        :param base_name: Home base name (None = all bases)
+        :return: Ids of the drones that were charged
+        """
+        ids = self.with_status('idle', base_name)
+        ids = ids[self.battery_level[ids] < level]
+        self.battery_level[ids] = level
+        self.battery_cycles[ids] += 1
+        for index in ids:
+            self._index_available(index)
+        return ids
+
+    def status_counts(self):
+        """Number of drones per status"""
+        counts = np.bincount(self.status[:self.size], minlength=len(DRONE_STATUSES))
+        return dict(zip(DRONE_STATUSES, counts.tolist()))
+
+
+class DroneView:
+    """Dict-style access to one drone of a FleetState"""
+
+    __slots__ = ('fleet', 'index')
+
+    _numeric = ('battery_level', 'total_distance', 'total_flight_time')
+    _counters = ('battery_cycles', 'battery_swaps')
+
+    def __init__(self, fleet, index):
+        self.fleet = fleet
+        self.index = index
+
+    def __getitem__(self, key):
+        fleet, index = self.fleet, self.index
+        if key in self._numeric:
+            return float(getattr(fleet, key)[index])
+        if key in self._counters:
+            return int(getattr(fleet, key)[index])
+        if key == 'status':
+            return DRONE_STATUSES[fleet.status[index]]
+        if key == 'position':
+            return tuple(fleet.position[index].tolist())
+        if key == 'id':
+            return fleet.drone_name(index)
+        if key == 'index':
+            return index
+        if key == 'home_base':
+            return fleet.base_names[fleet.home_base[index]]
+        if key == 'current_task':
+            return fleet.current_task.get(index)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        fleet, index = self.fleet, self.index
+        if key == 'battery_level':
+            fleet.set_battery_level(index, value)
+        elif key in self._numeric or key in self._counters or key == 'position':
+            getattr(fleet, key)[index] = value
+        elif key == 'status':
+            fleet.set_status(index, value)
+        elif key == 'home_base':
+            fleet.home_base[index] = fleet.base_index(value, create=True)
+            if fleet.status[index] == STATUS_CODE['idle']:
+                fleet._index_available(index)
+        elif key == 'current_task':
+            if value is None:
+                fleet.current_task.pop(index, None)
+            else:
+                fleet.current_task[index] = value
+        else:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def keys(self):
+        return ('id', 'index', 'home_base', 'position', 'battery_level', 'battery_cycles', 'status',
+                'current_task', 'total_distance', 'total_flight_time', 'battery_swaps')
+
+    def __eq__(self, other):
+        return isinstance(other, DroneView) and other.fleet is self.fleet and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.fleet), self.index))
+
+    def __repr__(self):
+        return f"DroneView({self.fleet.drone_name(self.index)!r})"
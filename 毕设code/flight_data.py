@@ -0,0 +1,94 @@
+from bisect import bisect_right
+
+import numpy as np
+
+FLIGHT_DATA = [
+    # (Flight time (min), Payload (lb), Payload (kg), Total weight (lb), Thrust-to-weight ratio)
+    (50.0, 0, 0.0, 43.28, 3.5),
+    (41.7, 5, 2.3, 48.28, 3.1),
+    (33.3, 10, 4.5, 53.28, 2.8),
+    (26.6, 15, 6.8, 58.28, 2.6),
+    (22.0, 20, 9.1, 63.28, 2.4),
+    (18.0, 25, 11.3, 68.28, 2.2),
+    (12.5, 30, 13.6, 73.28, 2.0),
+    (10.75, 35, 15.9, 78.28, 1.9)
+]
+
+
+class FlightDataTable:
+    """
+    Payload lookup table (flight time, thrust ratio) built once from FLIGHT_DATA.
+
+    Columns are stored as NumPy arrays sorted by payload; array lookups are a
+    single ``np.interp`` call and scalar lookups a bisect over the same points.
+    Values are clamped at the table ends.
+    """
+
+    def __init__(self, rows=FLIGHT_DATA):
+        data = np.array(rows, dtype=np.float64)
+        data = data[np.argsort(data[:, 2], kind='stable')]
+        self.flight_time = data[:, 0]
+        self.payload_kg = data[:, 2]
+        self.total_weight = data[:, 3]
+        self.thrust_ratio = data[:, 4]
+
+        # Plain-float copies for the scalar path (avoids NumPy call overhead)
+        self._payload_list = self.payload_kg.tolist()
+        self._flight_time_list = self.flight_time.tolist()
+        self._thrust_ratio_list = self.thrust_ratio.tolist()
+
+    def _interp_scalar(self, x, values):
+        xs = self._payload_list
+        if x <= xs[0]:
+            return values[0]
+        if x >= xs[-1]:
+            return values[-1]
+        i = bisect_right(xs, x)
+        factor = (x - xs[i - 1]) / (xs[i] - xs[i - 1])
+        return values[i - 1] + (values[i] - values[i - 1]) * factor
+
+    def _check_payloads(self, payload_kg, max_payload_kg):
+        if np.any(payload_kg < 0):
+            raise ValueError("Payload cannot be negative")
+        if max_payload_kg is not None and np.any(payload_kg > max_payload_kg):
+            raise ValueError(f"Payload exceeds limit {max_payload_kg} kg")
+
+    def flight_time_at(self, payload_kg, max_payload_kg=None):
+        """
+        Interpolated flight time for one payload
+        :param payload_kg: Payload (kg)
+        :param max_payload_kg: Optional upper limit (ValueError above it)
+        :return: Flight time (minutes)
+        """
+        if payload_kg < 0:
+            raise ValueError("Payload cannot be negative")
+        if max_payload_kg is not None and payload_kg > max_payload_kg:
+            raise ValueError(f"Payload exceeds limit {max_payload_kg} kg")
+        return self._interp_scalar(payload_kg, self._flight_time_list)
+
+    def flight_time_batch(self, payloads_kg, max_payload_kg=None):
+        """
+        Interpolated flight times for an array of payloads
+        :param payloads_kg: Payloads (kg)
+        :param max_payload_kg: Optional upper limit (ValueError above it)
+        :return: Flight times (minutes) as an array
+        """
+        payloads_kg = np.asarray(payloads_kg, dtype=np.float64)
+        self._check_payloads(payloads_kg, max_payload_kg)
+        return np.interp(payloads_kg, self.payload_kg, self.flight_time)
+
+    def thrust_ratio_at(self, payload_kg):
+        """
+        Interpolated thrust-to-weight ratio for one payload
+        :param payload_kg: Payload (kg)
+        :return: Thrust-to-weight ratio
+        """
+        return self._interp_scalar(payload_kg, self._thrust_ratio_list)
+
+    def thrust_ratio_batch(self, payloads_kg):
+        """
+        Interpolated thrust-to-weight ratios for an array of payloads
+        :param payloads_kg: Payloads (kg)
+        :return: Thrust-to-weight ratios as an array
+        """
+        return np.interp(np.asarray(payloads_kg, dtype=np.float64), self.payload_kg, self.thrust_ratio)
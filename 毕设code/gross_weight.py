@@ -0,0 +1,84 @@
+import numpy as np
+
+# Alta X maximum gross weight chart (kg)
+TEMPERATURES = [0, 10, 20, 30, 40, 50]  # Temperature (°C)
+ALTITUDES = [0, 1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000,
+             9000, 10000, 11000, 12000, 13000, 14000, 15000]  # Pressure altitude (ft)
+
+# Rows: altitude, columns: temperature
+WEIGHT_DATA = [
+    [15.1, 15.1, 15.1, 14.4, 13.3, 12.3],
+    [15.1, 15.1, 14.3, 13.2, 12.1, 11.1],
+    [15.1, 14.2, 13.1, 12.0, 11.0, 10.0],
+    [14.2, 13.0, 11.9, 10.8, 9.9, 8.9],
+    [13.0, 11.8, 10.7, 9.7, 8.8, 7.9],
+    [11.8, 10.6, 9.6, 8.6, 7.7, 6.9],
+    [10.6, 9.5, 8.5, 7.6, 6.7, 5.9],
+    [9.5, 8.4, 7.5, 6.6, 5.7, 4.9],
+    [8.4, 7.4, 6.5, 5.6, 4.8, 4.0],
+    [7.3, 6.4, 5.5, 4.6, 3.9, 3.1],
+    [6.3, 5.4, 4.5, 3.7, 3.0, 2.2],
+    [5.3, 4.4, 3.6, 2.8, 2.1, 1.4],
+    [4.3, 3.5, 2.7, 1.9, 1.2, 0.6],
+    [3.4, 2.6, 1.8, 1.1, 0.4, -0.2],
+    [2.5, 1.7, 1.0, 0.3, -0.4, -1.0],
+    [1.6, 0.9, 0.1, -0.5, -1.1, -1.7]
+]
+
+# Default operating pressure altitude for Bristol (ft)
+DEFAULT_ALTITUDE_FT = 1000
+
+
+def _bracket(grid, values):
+    """Lower grid index and interpolation fraction for each value (clamped to the grid)"""
+    values = np.clip(values, grid[0], grid[-1])
+    idx = np.clip(np.searchsorted(grid, values, side='right') - 1, 0, len(grid) - 2)
+    frac = (values - grid[idx]) / (grid[idx + 1] - grid[idx])
+    return idx, frac
+
+
+class GrossWeightSurface:
+    """
+    Bilinear interpolation over the maximum gross weight chart.
+
+    Inputs outside the chart are clamped to its edges. Negative values in the
+    chart mean the drone cannot carry any payload in those conditions.
+    """
+
+    def __init__(self, temperatures=TEMPERATURES, altitudes=ALTITUDES, weight_data=WEIGHT_DATA):
+        self.temperatures = np.asarray(temperatures, dtype=np.float64)
+        self.altitudes = np.asarray(altitudes, dtype=np.float64)
+        self.weight_data = np.asarray(weight_data, dtype=np.float64)
+        if self.weight_data.shape != (len(self.altitudes), len(self.temperatures)):
+            raise ValueError("Weight data must have shape (altitudes, temperatures)")
+
+    def max_payload(self, temperature, altitude_ft=DEFAULT_ALTITUDE_FT):
+        """
+        Maximum payload for the given conditions
+        :param temperature: Temperature (°C), scalar or array
+        :param altitude_ft: Pressure altitude (ft), scalar or array
+        :return: Maximum payload (kg), float for scalar input, otherwise an array
+        """
+        temperature = np.asarray(temperature, dtype=np.float64)
+        altitude_ft = np.asarray(altitude_ft, dtype=np.float64)
+        ti, tf = _bracket(self.temperatures, temperature)
+        ai, af = _bracket(self.altitudes, altitude_ft)
+
+        w = self.weight_data
+        low = w[ai, ti] * (1 - tf) + w[ai, ti + 1] * tf
+        high = w[ai + 1, ti] * (1 - tf) + w[ai + 1, ti + 1] * tf
+        result = low * (1 - af) + high * af
+        return float(result) if result.ndim == 0 else result
+
+    def is_feasible(self, payload_kg, temperature, altitude_ft=DEFAULT_ALTITUDE_FT):
+        """
+        Vectorized feasibility check for (payload, temperature, altitude) combinations
+        :param payload_kg: Payload (kg), scalar or array
+        :param temperature: Temperature (°C), scalar or array
+        :param altitude_ft: Pressure altitude (ft), scalar or array
+        :return: Boolean array (or bool for scalar input), True where the payload can be carried
+        """
+        payload_kg = np.asarray(payload_kg, dtype=np.float64)
+        limit = self.max_payload(temperature, altitude_ft)
+        result = (payload_kg >= 0) & (payload_kg <= limit)
+        return bool(result) if np.ndim(result) == 0 else result
@@ -1,38 +1,91 @@
-from Strategy_Choose import interactive_path_planner
-from Distance_calculate import calculate_distance
+import argparse
+import csv
+import json
+import os
+import sys
+
+from Distance_calculate import calculate_distance, create_location_database, LOCATION_NAMES
 from Astart import optimize_paths as optimize_path_Astart
 from Dijkstra import optimize_paths as optimize_path_Dijkstra
-from Charge import charge_simulation
+from Charge import charge_simulation, charge_strategy_names, find_charge_strategy, BATTERY_CAPACITY
 from temdecrease import battery_degradation
-
+from gross_weight import GrossWeightSurface, DEFAULT_ALTITUDE_FT
+from missions import segments_from_paths, format_missions, location_name
+from energy_model import EnergyParams
+from sweep import run_scenario, PATH_ALGORITHMS, METRIC_COLUMNS, MetricsWriter
 
 
 # Maximum allowed payload weight (kg)
 MAX_PAYLOAD = 45.03
-# Location name mapping
-LOCATION_NAMES = {
-    # Target points
-    'target': {
-        1: "NHS Blood Centre (Filton)",
-        2: "South Bristol NHS Community Hospital",
-        3: "UWE Health Tech Hub"
-    },
-    # Task points
-    'task': {
-        1: "Southmead Hospital",
-        2: "Bristol Royal Infirmary (BRI)",
-        3: "St Michael's Hospital",
-        4: "Eastville Medical Centre",
-        5: "Fishponds Primary Care Centre",
-        6: "Bristol Haematology and Oncology Centre (BHOC)",
-        7: "Emersons Green NHS Treatment Centre",
-        8: "Lawrence Hill Health Centre",
-        9: "Montpelier Health Centre"
-    }
+# Operating pressure altitude (ft) used for the gross weight limit
+OPERATING_ALTITUDE_FT = DEFAULT_ALTITUDE_FT
+# Maximum gross weight surface (temperature x altitude)
+GROSS_WEIGHT = GrossWeightSurface()
+# Charge strategy names accepted on the command line (letters A-E are accepted as well)
+STRATEGY_ALIASES = {
+    'fixed': 'A',  # return to charge after each mission
+    'hot': 'C',  # keep flying while the battery covers the next mission
+    'swap': 'D',  # battery swap
+    'optimal': 'E'
 }
+# Battery voltage used to convert --battery (Wh) to Ah
+BATTERY_VOLTAGE = EnergyParams().battery_voltage
+
+
+def check_payloads(targets, tasks, temperature, altitude_ft=OPERATING_ALTITUDE_FT):
+    """
+    Check payloads against the gross weight limit and the total target payload limit
+    :param targets: List of (target id, payload kg)
+    :param tasks: List of (task id, payload kg)
+    :param temperature: Ambient temperature (°C)
+    :param altitude_ft: Pressure altitude (ft)
+    :return: True if the selection can be planned (errors are printed otherwise)
+    """
+    # Check every payload against the gross weight limit in one call
+    selected_points = [('Target', target_id, weight) for target_id, weight in targets] + \
+                      [('Task', task_id, weight) for task_id, weight in tasks]
+    feasible = GROSS_WEIGHT.is_feasible([weight for _, _, weight in selected_points], temperature, altitude_ft)
+    if not feasible.all():
+        limit = GROSS_WEIGHT.max_payload(temperature, altitude_ft)
+        print(f"\nError: Payloads exceed the maximum of {limit:.2f} kg "
+              f"at {temperature}°C and {altitude_ft} ft:")
+        for (kind, point_id, weight), ok in zip(selected_points, feasible):
+            if not ok:
+                print(f"  {kind} Point {point_id}: {weight} kg")
+        print("Please reduce payload weights and try again.")
+        return False
+
+    # Check if total target payload weight exceeds limit
+    total_target_weight = sum(weight for _, weight in targets)
+    if total_target_weight > MAX_PAYLOAD:
+        print(
+            f"\nError: Total target payload weight {total_target_weight:.2f} kg exceeds maximum allowed {MAX_PAYLOAD} kg!")
+        print("Please reduce target payload weights and try again.")
+        return False
+
+    # Check if total task payload weight exceeds limit
+    total_task_weight = sum(weight for _, weight in tasks)
+    if total_task_weight > MAX_PAYLOAD:
+        print(
+            f"\nWarning: Total task payload weight {total_task_weight:.2f} kg exceeds maximum allowed {MAX_PAYLOAD} kg!")
+        print("This may affect path planning results.")
+    return True
 
 
-def main():
+def main(argv=None):
+    """
+    Run the planner: the selection window without arguments, headless with any option
+    :param argv: Command-line arguments (default: sys.argv[1:])
+    :return: Exit status of a headless run
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        return run_headless(parse_args(argv))
+
+    # Imported here so headless runs never load tkinter
+    from Strategy_Choose import interactive_path_planner
+
     print("=== Medical Resource Path Planning System ===")
     print("Loading path planning selection interface...")
 
@@ -46,21 +99,17 @@ def main():
 
     print("\n=== User Selection Results ===")
     print("Target Points and Payload Weights:")
-    total_target_weight = 0.0
     target_names = []
     for target_id, weight in targets:
         name = LOCATION_NAMES['target'][target_id]
         print(f"  Target Point {target_id}: {name} - {weight} kg")
-        total_target_weight += weight
         target_names.append(name)
 
     print("\nTask Points and Payload Weights:")
-    total_task_weight = 0.0
     task_names = []
     for task_id, weight in tasks:
         name = LOCATION_NAMES['task'][task_id]
         print(f"  Task Point {task_id}: {name} - {weight} kg")
-        total_task_weight += weight
         task_names.append(name)
 
     strategy_id = strategy[0]
@@ -70,26 +119,12 @@ def main():
     }
     print(f"\nSelected Path Optimization Strategy: {strategy_id} - {strategy_names[strategy_id]}")
     charge_strategy_id = charge_strategy[0]
-    charge_strategy_names = {
-        1: "Strategy A: Return to charge after each mission, then depart with a full battery.",
-        2: "Strategy B: Return to charge after completing two missions, then depart with a full battery."
-    }
-    print(f"\nSelected Charge Strategy: {charge_strategy_id} - {charge_strategy_names[charge_strategy_id]}")
+    charge_strategies = charge_strategy_names()
+    print(f"\nSelected Charge Strategy: {charge_strategy_id} - {charge_strategies[charge_strategy_id]}")
 
-
-    # Check if total target payload weight exceeds limit
-    if total_target_weight > MAX_PAYLOAD:
-        print(
-            f"\nError: Total target payload weight {total_target_weight:.2f} kg exceeds maximum allowed {MAX_PAYLOAD} kg!")
-        print("Please reduce target payload weights and try again.")
+    if not check_payloads(targets, tasks, temperature):
         return
 
-    # Check if total task payload weight exceeds limit
-    if total_task_weight > MAX_PAYLOAD:
-        print(
-            f"\nWarning: Total task payload weight {total_task_weight:.2f} kg exceeds maximum allowed {MAX_PAYLOAD} kg!")
-        print("This may affect path planning results.")
-
     print("\n=== Calculating Distances Between Points ===")
     all_points = target_names + task_names
     distance_matrix = {}
@@ -112,9 +147,6 @@ def main():
         # Pass the correct distance_data dictionary
         paths, total_distances, segment_distances_list = optimize_path_Astart(target_names, task_names, distance_matrix)
 
-        # 初始化 flight_missions 数组
-        flight_missions = []
-
         # Process results for each start point
         for i, start in enumerate(target_names):
             print(f"\nPath for start point: {start}")
@@ -124,22 +156,26 @@ def main():
 
             print("Path Segment Distances:")
             for loc1, loc2, distance in segment_distances_list[i]:
-                mission_str = f"{loc1} -> {loc2}: {distance:.2f} km"
-                flight_missions.append(mission_str)
-                print(f"  {mission_str}")
+                print(f"  {loc1} -> {loc2}: {distance:.2f} km")
+
+        # 结构化航段数组 (from_id, to_id, distance)
+        flight_missions = segments_from_paths(segment_distances_list, all_points)
         temperature_D = battery_degradation(temperature)
-        charged_missions, total_time, total_energy, total_segments = charge_simulation(
-            flight_missions, charge_strategy_names[charge_strategy_id], temperature_D, targets, tasks)
+        charged_missions, total_time, total_energy, total_segments, charge_stops = charge_simulation(
+            flight_missions, charge_strategies[charge_strategy_id], temperature_D, targets, tasks,
+            temperature=temperature, altitude_ft=OPERATING_ALTITUDE_FT, location_names=all_points,
+            charging_stations=list(range(len(target_names))))  # 起点 (配送中心) 可作为充电站
 
         # 打印返回值
         print("\n=== Charge Simulation Results ===")
         print("Return Value 1 (Charged Missions):")
-        for mission in charged_missions:
+        for mission in format_missions(charged_missions, all_points):
             print(f"  {mission}")
 
         print(f"\nReturn Value 2 (Total Flight Time): {total_time:.2f} minutes")
         print(f"Return Value 3 (Total Energy Consumed): {total_energy:.2f} Ah")
         print(f"Return Value 4 (Total Segments): {total_segments}")
+        print(f"Return Value 5 (Charge Stops): {charge_stops}")
 
 
 
@@ -149,9 +185,6 @@ def main():
         # Pass the correct distance_data dictionary
         paths, total_distances, segment_distances_list = optimize_path_Dijkstra(target_names, task_names,distance_matrix)
 
-        # 初始化 flight_missions 数组
-        flight_missions = []
-
         # Process results for each start point
         for i, start in enumerate(target_names):
             print(f"\nPath for start point: {start}")
@@ -161,22 +194,181 @@ def main():
 
             print("Path Segment Distances:")
             for loc1, loc2, distance in segment_distances_list[i]:
-                mission_str = f"{loc1} -> {loc2}: {distance:.2f} km"
-                flight_missions.append(mission_str)
-                print(f"  {mission_str}")
+                print(f"  {loc1} -> {loc2}: {distance:.2f} km")
+
+        # 结构化航段数组 (from_id, to_id, distance)
+        flight_missions = segments_from_paths(segment_distances_list, all_points)
         temperature_D = battery_degradation(temperature)
-        charged_missions, total_time, total_energy, total_segments = charge_simulation(
-            flight_missions, charge_strategy_names[charge_strategy_id], temperature_D, targets, tasks)
+        charged_missions, total_time, total_energy, total_segments, charge_stops = charge_simulation(
+            flight_missions, charge_strategies[charge_strategy_id], temperature_D, targets, tasks,
+            temperature=temperature, altitude_ft=OPERATING_ALTITUDE_FT, location_names=all_points,
+            charging_stations=list(range(len(target_names))))  # 起点 (配送中心) 可作为充电站
         # 打印返回值
         print("\n=== Charge Simulation Results ===")
         print("Return Value 1 (Charged Missions):")
-        for mission in charged_missions:
+        for mission in format_missions(charged_missions, all_points):
             print(f"  {mission}")
 
         print(f"\nReturn Value 2 (Total Flight Time): {total_time:.2f} minutes")
         print(f"Return Value 3 (Total Energy Consumed): {total_energy:.2f} Ah")
         print(f"Return Value 4 (Total Segments): {total_segments}")
+        print(f"Return Value 5 (Charge Stops): {charge_stops}")
+
+
+
+def parse_args(argv):
+    """Command-line options of a headless run"""
+    parser = argparse.ArgumentParser(description="Medical resource path planning without the selection window")
+    parser.add_argument('--scenario', help="JSON file with any of the options below (command line wins)")
+    parser.add_argument('--algo', choices=list(PATH_ALGORITHMS), help="Path planning algorithm (default: astar)")
+    parser.add_argument('--strategy', help="Charge strategy: " + ', '.join(STRATEGY_ALIASES) +
+                                           " or a letter A-E (default: A)")
+    parser.add_argument('--targets', nargs='+', type=int, help="Target point ids (default: all)")
+    parser.add_argument('--tasks', nargs='+', type=int, help="Task point ids (default: all)")
+    parser.add_argument('--payload', type=float, help="Payload at every point (kg, default: 1.0)")
+    parser.add_argument('--battery', type=float,
+                        help=f"Battery capacity (Wh, default: {BATTERY_CAPACITY * BATTERY_VOLTAGE:.0f})")
+    parser.add_argument('--voltage', type=float, help=f"Battery voltage (V, default: {BATTERY_VOLTAGE})")
+    parser.add_argument('--temperature', type=float, help="Ambient temperature (°C, default: 25)")
+    parser.add_argument('--altitude', type=float, help=f"Pressure altitude (ft, default: {OPERATING_ALTITUDE_FT})")
+    parser.add_argument('--map', help="Write the planned routes to this HTML map (relative to --out)")
+    parser.add_argument('--out', help="Output directory for metrics.csv and missions.csv (default: ../results)")
+    parser.add_argument('--headless', action='store_true', help="Run with the defaults without the window")
+    return parser.parse_args(argv)
+
+
+def load_scenario(args):
+    """
+    Merge a scenario file with the command line
+    :param args: Parsed options
+    :return: dict of run settings; targets and tasks as (id, kg) lists
+    """
+    scenario = {}
+    if args.scenario:
+        with open(args.scenario, 'r', encoding='utf-8') as f:
+            scenario = json.load(f)
+    for key in ('algo', 'strategy', 'targets', 'tasks', 'payload', 'battery', 'voltage', 'temperature',
+                'altitude', 'map', 'out'):
+        if getattr(args, key) is not None:
+            scenario[key] = getattr(args, key)
+
+    payload = float(scenario.get('payload', 1.0))
+    settings = {
+        'algo': scenario.get('algo', 'astar'),
+        'strategy': scenario.get('strategy', 'A'),
+        'temperature': float(scenario.get('temperature', 25.0)),
+        'altitude': float(scenario.get('altitude', OPERATING_ALTITUDE_FT)),
+        'battery': scenario.get('battery'),
+        'voltage': float(scenario.get('voltage', BATTERY_VOLTAGE)),
+        'payload': payload,
+        'map': scenario.get('map'),
+        'out': scenario.get('out', os.path.join('..', 'results'))
+    }
+    for kind, key in (('target', 'targets'), ('task', 'tasks')):
+        # Points are ids (payload from 'payload') or [id, kg] pairs
+        points = scenario.get(key, list(LOCATION_NAMES[kind]))
+        settings[key] = [(int(p[0]), float(p[1])) if isinstance(p, (list, tuple)) else (int(p), payload)
+                         for p in points]
+        unknown = [point_id for point_id, _ in settings[key] if point_id not in LOCATION_NAMES[kind]]
+        if unknown:
+            raise ValueError(f"Unknown {kind} point ids: {unknown}")
+    return settings
+
+
+def resolve_strategy(name):
+    """Charge strategy letter for a command-line name or letter"""
+    letter = STRATEGY_ALIASES.get(str(name).lower(), str(name).upper())
+    find_charge_strategy(letter)  # raises ValueError for unknown strategies
+    return letter
+
+
+def write_route_map(file_path, paths):
+    """
+    Write planned routes to an HTML map (needs folium)
+    :param file_path: Output .html path
+    :param paths: Location name lists, one per start point
+    """
+    import folium
+
+    db = create_location_database()
+    colors = ['red', 'blue', 'green', 'purple', 'orange', 'darkred']
+    first = db[paths[0][0]]
+    route_map = folium.Map(location=[first['lat'], first['lon']], zoom_start=12, tiles='OpenStreetMap')
+    for i, path in enumerate(paths):
+        points = [[db[name]['lat'], db[name]['lon']] for name in path]
+        folium.PolyLine(points, color=colors[i % len(colors)], weight=3, tooltip=path[0]).add_to(route_map)
+        for name, point in zip(path, points):
+            folium.CircleMarker(point, radius=5, color=colors[i % len(colors)], fill=True, popup=name).add_to(route_map)
+    route_map.save(file_path)
+
+
+def run_headless(args):
+    """
+    Plan, simulate charging and write results without any GUI
+    :param args: Parsed options (see parse_args)
+    :return: Exit status (0 on success)
+    """
+    try:
+        settings = load_scenario(args)
+        strategy = resolve_strategy(settings['strategy'])
+        battery_capacity = None
+        if settings['battery'] is not None:
+            battery_capacity = float(settings['battery']) / settings['voltage']  # Wh -> Ah
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 2
+
+    targets, tasks, temperature = settings['targets'], settings['tasks'], settings['temperature']
+    print("=== Medical Resource Path Planning System (headless) ===")
+    print(f"Algorithm: {settings['algo']}, charge strategy: {strategy}, temperature: {temperature}°C")
+    if not check_payloads(targets, tasks, temperature, settings['altitude']):
+        return 1
+
+    try:
+        result = run_scenario(targets, tasks, settings['algo'], strategy, temperature, settings['altitude'],
+                              battery_capacity=battery_capacity)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    for path in result['paths']:
+        print(f"\nPath for start point: {path[0]}")
+        print(" -> ".join(path))
+    print("\n=== Charge Simulation Results ===")
+    for mission in format_missions(result['missions'], result['location_names']):
+        print(f"  {mission}")
+    print(f"\nTotal Flight Time: {result['flight_time_min']:.2f} minutes")
+    print(f"Total Energy Consumed: {result['energy_ah']:.2f} Ah")
+    print(f"Total Segments: {result['segments']}")
+    print(f"Total Distance: {result['distance_km']:.2f} km, charge stops: {result['charge_stops']}")
+
+    # Results: one metrics row (same columns as the sweep) and the mission table
+    out = settings['out']
+    os.makedirs(out, exist_ok=True)
+    row = {column: result.get(column, '') for column in METRIC_COLUMNS}
+    row.update({'run_id': 0, 'algorithm': settings['algo'], 'strategy': strategy, 'temperature': temperature,
+                'payload': settings['payload'], 'targets': ';'.join(str(i) for i, _ in targets),
+                'tasks': ';'.join(str(i) for i, _ in tasks)})
+    with MetricsWriter(os.path.join(out, 'metrics.csv')) as writer:
+        writer.write([row])
+    with open(os.path.join(out, 'missions.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['from', 'to', 'distance_km', 'kind'])
+        for mission in result['missions']:
+            writer.writerow([location_name(int(mission['from_id']), result['location_names']),
+                             location_name(int(mission['to_id']), result['location_names']),
+                             float(mission['distance']), int(mission['kind'])])
+    print(f"\nResults written to {out}")
+
+    if settings['map']:
+        map_path = os.path.join(out, settings['map'])
+        try:
+            write_route_map(map_path, result['paths'])
+            print(f"Route map saved to {map_path}")
+        except ImportError:
+            print("Route map skipped: folium is not installed")
+    return 0
 
-if __name__ == "__main__":
 
-    main()
+if __name__ == "__main__":
+    sys.exit(main())
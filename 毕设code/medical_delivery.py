@@ -1,35 +1,55 @@
-import folium
 import math
 import numpy as np
-import pandas as pd
 import random
 import heapq
 import itertools
-from folium.plugins import MarkerCluster, AntPath
-import matplotlib.pyplot as plt
 import time
-import networkx as nx
 from collections import defaultdict
 import json
 import os
+import pickle
 from datetime import datetime, timedelta
-import matplotlib.dates as mdates
 import sys
-
-plt.rcParams['font.sans-serif'] = ['SimHei']
-plt.rcParams['axes.unicode_minus'] = False
-
-FLIGHT_DATA = [
-    # (Flight time (min), Payload (lb), Payload (kg), Total weight (lb), Thrust-to-weight ratio)
-    (50.0, 0, 0.0, 43.28, 3.5),
-    (41.7, 5, 2.3, 48.28, 3.1),
-    (33.3, 10, 4.5, 53.28, 2.8),
-    (26.6, 15, 6.8, 58.28, 2.6),
-    (22.0, 20, 9.1, 63.28, 2.4),
-    (18.0, 25, 11.3, 68.28, 2.2),
-    (12.5, 30, 13.6, 73.28, 2.0),
-    (10.75, 35, 15.9, 78.28, 1.9)
-]
+from energy_model import EnergyParams, EnergyModel
+from flight_data import FLIGHT_DATA, FlightDataTable
+from gross_weight import GrossWeightSurface, DEFAULT_ALTITUDE_FT
+from soc_trace import SocTraceRecorder
+from wind import ground_speeds
+from Distance_calculate import haversine_distance_batch
+from battery_aging import BatteryAging
+from charging_queue import ChargingStation, QUEUE_FIFO, QUEUE_PRIORITY, TASK_PRIORITY
+from charging_model import ChargeTimeModel
+from event_engine import EventEngine
+from fleet_state import FleetState
+from assignment import linear_assignment, PRIORITY_BONUS
+from rebalancing import rebalance_plan
+from event_log import EventLog
+from reporting import FIGURES, render_report
+
+# Checkpoint file layout version
+CHECKPOINT_VERSION = 2
+
+# Self-rescheduling events that do not keep a simulation alive on their own (engine background kinds)
+PERIODIC_EVENTS = ('rebalance', 'checkpoint')
+
+
+# folium, matplotlib, networkx and pandas are imported by the features that use them,
+# so a simulation-only run does not pay for them at startup
+def _pyplot():
+    # matplotlib with the Chinese font settings, loaded on the first plot. Figures are only
+    # saved to files, so the non-interactive Agg backend is used unless pyplot is already loaded
+    if 'matplotlib.pyplot' not in sys.modules:
+        import matplotlib
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.rcParams['font.sans-serif'] = ['SimHei']
+    plt.rcParams['axes.unicode_minus'] = False
+    return plt
+
+
+def _is_missing(value):
+    # Scalar None/NaN test (pandas.isna without pandas)
+    return value is None or (isinstance(value, (float, np.floating)) and np.isnan(value))
 
 
 class MedicalDroneDelivery:
@@ -42,12 +62,47 @@ class MedicalDroneDelivery:
         self.landing_power = 100  # W (landing)
         self.max_range = 30  # km
         self.safe_battery_threshold = 20  # %
+        self.charger_power = 500  # W (charging bay output)
+        self.partial_charging = False  # Charge only as much as the next task needs
+        self.swap_time_min = 2  # min (battery swap, event-driven scheduling)
+        self.transfer_service_time = 5  # min (stop at a transfer point)
+        self.base_charging_bays = 2  # Charging bays at each distribution center
+        self.charge_queue_discipline = QUEUE_FIFO  # 'fifo' or 'priority'
+        self.dispatch_mode = 'greedy'  # 'greedy' or 'batch' (optimal assignment, event-driven scheduling)
+        self.batch_window_min = 2  # min (tasks collected per batch assignment)
+        self.rebalance_interval_min = None  # min between fleet rebalancing runs (None = off)
+        self.checkpoint_path = None  # Checkpoint file (see enable_checkpoints)
+        self.checkpoint_interval_min = None  # Simulated min between checkpoints (None = off)
+        self.report_figures = list(FIGURES)  # Figures drawn by run_simulation (see set_reporting)
+        self.report_dir = '.'  # Directory of the report files
+        self.report_draft = False  # Draft resolution figures
+        self.report_workers = None  # Processes rendering figures (None = CPU count, 1 = serial)
+        self.temperature = 20  # °C
+        self.altitude_ft = DEFAULT_ALTITUDE_FT  # ft (pressure altitude)
+        self.wind = None  # Wind field (None = calm air)
+        self.rng = random.Random()  # Random stream for path planning (see set_seed)
+
+        # Maximum gross weight surface (temperature x altitude)
+        self.gross_weight = GrossWeightSurface()
 
         self.energy_strategy = 'A'  # Default strategy
 
-        self.flight_data = pd.DataFrame(FLIGHT_DATA,
-                                        columns=['flight_time', 'payload_lbs', 'payload_kg',
-                                                 'total_weight', 'thrust_ratio'])
+        # Energy model (flight time, energy, battery usage)
+        self.energy_model = EnergyModel(EnergyParams(
+            cruise_speed=self.cruise_speed,
+            power_consumption=self.power_consumption,
+            takeoff_power=self.takeoff_power,
+            landing_power=self.landing_power,
+            battery_capacity=self.battery_capacity,
+            max_payload_kg=self.max_payload_kg
+        ))
+
+        # CC-CV charge time model
+        self.charge_model = ChargeTimeModel(self.energy_model.params.battery_wh, self.charger_power)
+
+        self._flight_data = None  # pandas view, built on first use (see flight_data)
+        # Sorted NumPy view of the flight data for fast interpolation
+        self.flight_table = FlightDataTable(FLIGHT_DATA)
 
         self.distribution_centers = []
 
@@ -63,11 +118,16 @@ class MedicalDroneDelivery:
         # Obstacles (simulate buildings, no-fly zones)
         self.obstacles = []
 
-        # Road network (simulate flyable paths)
-        self.road_network = nx.Graph()
+        # Road network (simulate flyable paths): name -> {'pos', 'type'} and (from, to) -> km
+        self.road_nodes = {}
+        self.road_edges = {}
+        self._road_graph = None  # networkx graph, built on first routing query
 
-        # Drone fleet
-        self.drones = []
+        # Drone fleet (struct of arrays, iterates as dict-like drone views)
+        self.drones = FleetState()
+
+        # Per-battery capacity fade (created with the fleet)
+        self.battery_aging = None
 
         # Charging stations
         self.charging_stations = []
@@ -81,17 +141,33 @@ class MedicalDroneDelivery:
             'safe_margin_violations': 0,
             'success_rate': 0,
             'abort_rate': 0,
-            'transfer_count': 0
+            'transfer_count': 0,
+            'charge_wait_time': 0,
+            'makespan': 0,
+            'repositions': 0,
+            'reposition_energy': 0
         }
 
         # Task scheduling queue
         self.task_queue = []
 
+        # Online demand: finished tasks are dropped and only counted
+        self.demand = None
+        self.retire_finished_tasks = False
+        self.retired_tasks = {'completed': 0, 'failed': 0}
+
+        # Discrete-event engine of the last schedule_tasks run
+        self.engine = None
+
         # Current time
         self.current_time = datetime.now()
+        self.start_time = self.current_time
+
+        # State-of-charge trace (opt-in, see enable_soc_trace)
+        self.soc_trace = None
 
         # Log records
-        self.log = []
+        self.log = EventLog()
 
     def import_data(self, centers_file=None, hospitals_file=None, tasks_file=None):
         """Import data (use default if no files provided)"""
@@ -111,29 +187,14 @@ class MedicalDroneDelivery:
             self.add_default_tasks()
 
     def calculate_energy_consumption(self, distance_km, payload_kg, flight_time_min):
-        # Takeoff energy (assume 1 min takeoff)
-        takeoff_time = 1
-        takeoff_energy = (takeoff_time / 60) * self.takeoff_power
-
-        # Landing energy (assume 1 min landing)
-        landing_time = 1
-        landing_energy = (landing_time / 60) * self.landing_power
-
-        # Cruise time
-        cruise_time = flight_time_min - takeoff_time - landing_time
-        if cruise_time < 0:
-            cruise_time = 0
-
-        # Cruise energy
-        cruise_energy = (cruise_time / 60) * self.power_consumption
-
-        # Payload impact factor (5% increase per kg)
-        payload_factor = 1 + (payload_kg / 10) * 0.05
-
-        # Total energy
-        total_energy = (takeoff_energy + landing_energy + cruise_energy) * payload_factor
-
-        return total_energy
+        """
+        Calculate energy consumption (takeoff, cruise and landing)
+        :param distance_km: Distance (km)
+        :param payload_kg: Payload (kg)
+        :param flight_time_min: Flight time (minutes)
+        :return: Energy (Wh)
+        """
+        return self.energy_model.energy_from_time(flight_time_min, payload_kg)
 
     def import_centers_from_file(self, file_path):
         """Import distribution centers from file"""
@@ -266,10 +327,11 @@ class MedicalDroneDelivery:
             'name': name,
             'position': (lat, lon),
             'type': 'distribution',
-            'service_time': service_time
+            'service_time': service_time,
+            'charger': ChargingStation(name, self.base_charging_bays, self.charge_queue_discipline)
         })
         # Add to road network
-        self.road_network.add_node(name, pos=(lat, lon), type='center')
+        self.add_road_node(name, (lat, lon), 'center')
 
     def add_hospital(self, name, lat, lon, service_time=5):
         """Add hospital"""
@@ -280,7 +342,7 @@ class MedicalDroneDelivery:
             'service_time': service_time
         })
         # Add to road network
-        self.road_network.add_node(name, pos=(lat, lon), type='hospital')
+        self.add_road_node(name, (lat, lon), 'hospital')
 
     def add_charging_station(self, name, lat, lon, capacity=4):
         """Add charging station"""
@@ -288,10 +350,43 @@ class MedicalDroneDelivery:
             'name': name,
             'position': (lat, lon),
             'capacity': capacity,
-            'available': capacity
+            'available': capacity,
+            'charger': ChargingStation(name, capacity, self.charge_queue_discipline)
         })
         # Add to road network
-        self.road_network.add_node(name, pos=(lat, lon), type='charging')
+        self.add_road_node(name, (lat, lon), 'charging')
+
+    def set_charge_queue(self, discipline, base_bays=None):
+        """
+        Configure charging queues at all stations
+        :param discipline: 'fifo' or 'priority' (who gets a freed bay first in event-driven scheduling;
+                           the sequential scheduler books bays in task order)
+        :param base_bays: Charging bays per distribution center (None keeps current)
+        """
+        if discipline not in (QUEUE_FIFO, QUEUE_PRIORITY):
+            raise ValueError(f"Unknown queue discipline: {discipline}")
+        self.charge_queue_discipline = discipline
+        if base_bays is not None:
+            self.base_charging_bays = base_bays
+        for center in self.distribution_centers:
+            center['charger'] = ChargingStation(center['name'], self.base_charging_bays, discipline)
+        for station in self.charging_stations:
+            station['charger'] = ChargingStation(station['name'], station['capacity'], discipline)
+
+    def find_charging_site(self, drone):
+        """
+        Nearest place a drone can charge (its home base or a charging station)
+        :param drone: Drone
+        :return: Center or charging station dict
+        """
+        sites = [c for c in self.distribution_centers if c['name'] == drone['home_base']]
+        sites += self.charging_stations
+        return min(sites, key=lambda s: self.calculate_distance(drone['position'], s['position']))
+
+    def charging_queue_summary(self):
+        """Queue statistics of every station that has served a charge"""
+        sites = self.distribution_centers + self.charging_stations
+        return [site['charger'].summary() for site in sites if len(site['charger'])]
 
     def add_obstacle(self, lat, lon, radius=0.1):
         """Add obstacle (circular area)"""
@@ -300,20 +395,48 @@ class MedicalDroneDelivery:
             'radius': radius  # km
         })
 
+    def add_road_node(self, name, position, node_type):
+        """Add a location to the road network"""
+        self.road_nodes[name] = {'pos': position, 'type': node_type}
+        self._road_graph = None
+
     def add_road(self, from_name, to_name):
         """Add road connection"""
-        if from_name not in self.road_network.nodes or to_name not in self.road_network.nodes:
+        if from_name not in self.road_nodes or to_name not in self.road_nodes:
             raise ValueError("Node does not exist")
 
         # Get positions
-        pos1 = self.road_network.nodes[from_name]['pos']
-        pos2 = self.road_network.nodes[to_name]['pos']
+        pos1 = self.road_nodes[from_name]['pos']
+        pos2 = self.road_nodes[to_name]['pos']
 
         # Calculate distance
         distance = self.calculate_distance(pos1, pos2)
 
         # Add to network
-        self.road_network.add_edge(from_name, to_name, weight=distance)
+        self.road_edges[(from_name, to_name)] = distance
+        self._road_graph = None
+
+    @property
+    def road_network(self):
+        """Road network as a networkx graph (built from road_nodes/road_edges on first use)"""
+        if self._road_graph is None:
+            import networkx as nx
+            graph = nx.Graph()
+            for name, node in self.road_nodes.items():
+                graph.add_node(name, **node)
+            for (from_name, to_name), distance in self.road_edges.items():
+                graph.add_edge(from_name, to_name, weight=distance)
+            self._road_graph = graph
+        return self._road_graph
+
+    @property
+    def flight_data(self):
+        """Flight test data as a pandas DataFrame (built on first use)"""
+        if self._flight_data is None:
+            import pandas as pd
+            self._flight_data = pd.DataFrame(FLIGHT_DATA, columns=['flight_time', 'payload_lbs', 'payload_kg',
+                                                                   'total_weight', 'thrust_ratio'])
+        return self._flight_data
 
     def calculate_distance(self, point1, point2):
         """
@@ -344,38 +467,15 @@ class MedicalDroneDelivery:
         :param payload_kg: Payload weight (kg)
         :return: Flight time (minutes)
         """
-        # Validate payload range
-        if payload_kg < 0:
-            raise ValueError("Payload cannot be negative")
-
-        if payload_kg > self.max_payload_kg:
-            raise ValueError(f"Payload exceeds limit {self.max_payload_kg} kg")
+        return self.flight_table.flight_time_at(payload_kg, self.max_payload_kg)
 
-        # Get and sort data points
-        points = self.flight_data.sort_values('payload_kg')
-
-        # Handle below min payload
-        if payload_kg <= points['payload_kg'].min():
-            return points.iloc[0]['flight_time']
-
-        # Handle above max payload
-        if payload_kg >= points['payload_kg'].max():
-            return points.iloc[-1]['flight_time']
-
-        # Find nearest points for interpolation
-        for i in range(1, len(points)):
-            low_data = points.iloc[i - 1]
-            high_data = points.iloc[i]
-
-            if low_data['payload_kg'] <= payload_kg <= high_data['payload_kg']:
-                # Calculate interpolation factor
-                factor = (payload_kg - low_data['payload_kg']) / (high_data['payload_kg'] - low_data['payload_kg'])
-
-                # Linear interpolation
-                flight_time = low_data['flight_time'] + (high_data['flight_time'] - low_data['flight_time']) * factor
-                return flight_time
-
-        return points.iloc[-1]['flight_time']
+    def calculate_thrust_ratio(self, payload_kg):
+        """
+        Calculate thrust-to-weight ratio based on payload (linear interpolation)
+        :param payload_kg: Payload weight (kg)
+        :return: Thrust-to-weight ratio
+        """
+        return self.flight_table.thrust_ratio_at(payload_kg)
 
     def calculate_battery_usage(self, payload_kg, flight_time_min):
         """
@@ -384,22 +484,8 @@ class MedicalDroneDelivery:
         :param flight_time_min: Flight time (minutes)
         :return: Battery usage percentage
         """
-        # Base energy (without payload)
-        base_energy = (flight_time_min / 60) * self.power_consumption  # Wh
-
-        # Payload impact factor (5% per kg)
-        payload_factor = 1 + (payload_kg / 10) * 0.05
-
-        # Total energy
-        total_energy = base_energy * payload_factor  # Wh
-
-        # Convert capacity to Wh
-        battery_wh = self.battery_capacity / 1000 * 14.8  # 14.8V battery
-
-        # Usage percentage
-        battery_usage = (total_energy / battery_wh) * 100
-
-        return min(100, battery_usage)
+        energy = self.energy_model.energy_from_time(flight_time_min, payload_kg)
+        return self.energy_model.battery_percent(energy)
 
     def calculate_flight_time_from_distance(self, distance_km, payload_kg):
         """
@@ -408,14 +494,64 @@ class MedicalDroneDelivery:
         :param payload_kg: Payload (kg)
         :return: Flight time (minutes)
         """
-        # Base time (without payload)
-        base_time = (distance_km / self.cruise_speed) * 60  # min
+        return self.energy_model.flight_time(distance_km, payload_kg)
 
-        # Payload adjustment
-        payload_factor = 1 + (payload_kg / self.max_payload_kg) * 0.3
-        adjusted_time = base_time * payload_factor
+    def set_seed(self, seed):
+        """Seed the random stream used by the path planners (for reproducible runs)"""
+        self.rng.seed(seed)
 
-        return adjusted_time
+    def set_wind_field(self, wind):
+        """
+        Set wind field used for ground speed
+        :param wind: ConstantWind, GriddedWind or None for calm air
+        """
+        self.wind = wind
+
+    def evaluate_flight(self, path, payload_kg):
+        """
+        Flight time and energy of one flight along a path (vectorized over its segments)
+        :param path: List of (lat, lon) waypoints
+        :param payload_kg: Payload (kg)
+        :return: Dict with per-segment distances/times and flight totals; 'feasible' is False
+                 when a segment cannot be flown (headwind at or above the cruise airspeed)
+        """
+        points = np.asarray(path, dtype=np.float64)
+        lat1, lon1 = points[:-1, 0], points[:-1, 1]
+        lat2, lon2 = points[1:, 0], points[1:, 1]
+        distances = haversine_distance_batch(lat1, lon1, lat2, lon2)
+
+        # Ground speed per segment from heading and wind
+        speeds = None
+        if self.wind is not None:
+            hour = (self.current_time - self.start_time).total_seconds() / 3600
+            speeds = ground_speeds(lat1, lon1, lat2, lon2, self.cruise_speed, self.wind, hour)
+
+        times = self.energy_model.segment_times(distances, payload_kg, speeds)
+        flight_time = float(times.sum())
+        energy = self.energy_model.energy_from_time(flight_time, payload_kg)
+
+        return {
+            'distances': distances,
+            'times': times,
+            'distance_km': float(distances.sum()),
+            'flight_time_min': flight_time,
+            'energy_wh': energy,
+            'battery_percent': self.energy_model.battery_percent(energy),
+            'feasible': bool(np.isfinite(flight_time))
+        }
+
+    def estimate_task_energy(self, tasks=None):
+        """
+        Evaluate flight time and energy for many tasks in one array call
+        :param tasks: Tasks to evaluate (default: all delivery tasks)
+        :return: (flight_time_min, energy_wh, battery_percent) arrays
+        """
+        if tasks is None:
+            tasks = self.delivery_tasks
+        distances = np.array([self.calculate_distance(t['from']['position'], t['to']['position'])
+                              for t in tasks], dtype=np.float64)
+        payloads = np.array([t['payload_kg'] for t in tasks], dtype=np.float64)
+        return self.energy_model.evaluate_batch(distances, payloads)
 
     def add_delivery_task(self, from_index, to_index, payload_kg, material_type='medical', priority='normal'):
         """Add delivery task"""
@@ -464,8 +600,8 @@ class MedicalDroneDelivery:
         mid_lon = (start['position'][1] + end['position'][1]) / 2
 
         # Random offset to avoid obstacles
-        offset_lat = random.uniform(-0.01, 0.01)
-        offset_lon = random.uniform(-0.01, 0.01)
+        offset_lat = self.rng.uniform(-0.01, 0.01)
+        offset_lon = self.rng.uniform(-0.01, 0.01)
 
         waypoint = (mid_lat + offset_lat, mid_lon + offset_lon)
 
@@ -473,16 +609,17 @@ class MedicalDroneDelivery:
 
     def dijkstra_path(self, start, end):
         """Dijkstra path planning (road network)"""
-        if len(self.road_network.nodes) == 0:
+        if not self.road_nodes:
             return [start['position'], end['position']]
 
+        import networkx as nx
         try:
             path_nodes = nx.shortest_path(self.road_network, start['name'], end['name'], weight='weight')
         except nx.NetworkXNoPath:
             return [start['position'], end['position']]
 
         # Get positions
-        path = [self.road_network.nodes[node]['pos'] for node in path_nodes]
+        path = [self.road_nodes[node]['pos'] for node in path_nodes]
 
         return path
 
@@ -492,11 +629,11 @@ class MedicalDroneDelivery:
         path = [start['position']]
 
         # Add 1-3 random waypoints
-        num_waypoints = random.randint(1, 3)
+        num_waypoints = self.rng.randint(1, 3)
         for _ in range(num_waypoints):
-            lat = random.uniform(min(start['position'][0], end['position'][0]),
+            lat = self.rng.uniform(min(start['position'][0], end['position'][0]),
                                  max(start['position'][0], end['position'][0]))
-            lon = random.uniform(min(start['position'][1], end['position'][1]),
+            lon = self.rng.uniform(min(start['position'][1], end['position'][1]),
                                  max(start['position'][1], end['position'][1]))
             path.append((lat, lon))
 
@@ -545,22 +682,162 @@ class MedicalDroneDelivery:
 
     def initialize_drones(self, num_drones_per_center=2):
         """Initialize drone fleet"""
-        self.drones = []
+        self.drones = FleetState(len(self.distribution_centers) * num_drones_per_center)
         for center in self.distribution_centers:
-            for i in range(num_drones_per_center):
-                drone = {
-                    'id': f"{center['name']}_Drone_{i + 1}",
-                    'home_base': center['name'],  # Add home_base
-                    'position': center['position'],
-                    'battery_level': 100,  # %
-                    'battery_cycles': 0,
-                    'status': 'idle',  # idle, charging, flying, delivering
-                    'current_task': None,
-                    'total_distance': 0,  # km
-                    'total_flight_time': 0,  # min
-                    'battery_swaps': 0
-                }
-                self.drones.append(drone)
+            self.drones.add_drones(center['name'], center['position'], num_drones_per_center)
+
+        self.battery_aging = BatteryAging(len(self.drones), self.battery_capacity)
+
+        if self.soc_trace is not None:
+            for drone in self.drones:
+                self.soc_trace.set_drone_name(drone['index'], drone['id'])
+                self.record_soc(drone)
+
+    def enable_soc_trace(self, capacity=4096):
+        """
+        Start recording per-drone state of charge
+        :param capacity: Initial number of samples to preallocate
+        :return: The trace recorder
+        """
+        self.soc_trace = SocTraceRecorder(capacity)
+        for drone in self.drones:
+            self.soc_trace.set_drone_name(drone['index'], drone['id'])
+        return self.soc_trace
+
+    def elapsed_minutes(self):
+        """Simulation time since start (min)"""
+        return (self.current_time - self.start_time).total_seconds() / 60
+
+    def record_soc(self, drone, position=None):
+        """Append a state-of-charge sample (no-op unless tracing is enabled)"""
+        if self.soc_trace is None:
+            return
+        lat, lon = position if position is not None else drone['position']
+        self.soc_trace.record(self.elapsed_minutes(), drone['index'], drone['battery_level'], lat, lon)
+
+    def drone_battery_wh(self, drone):
+        """
+        Current (aged) battery capacity of a drone
+        :param drone: Drone
+        :return: Capacity (Wh)
+        """
+        if self.battery_aging is None:
+            return self.energy_model.params.battery_wh
+        capacity_mah = self.battery_aging.capacity[drone['index']]
+        return capacity_mah / 1000 * self.energy_model.params.battery_voltage
+
+    def set_dispatch_mode(self, mode, window_min=None):
+        """
+        Set how schedule_tasks assigns drones
+        :param mode: 'greedy' (highest-battery drone at the task's base) or
+                     'batch' (collect tasks for window_min, then solve a linear assignment)
+        :param window_min: Batch window (min)
+        """
+        if mode not in ('greedy', 'batch'):
+            raise ValueError(f"Unknown dispatch mode: {mode}")
+        self.dispatch_mode = mode
+        if window_min is not None:
+            self.batch_window_min = window_min
+        print(f"Dispatch mode set to: {mode}")
+
+    def enable_rebalancing(self, interval_min=15):
+        """
+        Periodically move idle drones to bases with queued demand (event-driven scheduling)
+        :param interval_min: Minutes between rebalancing runs (None = off)
+        """
+        self.rebalance_interval_min = interval_min
+        print(f"Fleet rebalancing every {interval_min} min" if interval_min else "Fleet rebalancing off")
+
+    def set_reporting(self, figures='all', output_dir=None, draft=None, workers=None):
+        """
+        Configure the figures run_simulation renders
+        :param figures: 'all', None (no figures) or a list of names from reporting.FIGURES
+        :param output_dir: Directory of the report files (None keeps current)
+        :param draft: Draft resolution figures (None keeps current)
+        :param workers: Processes rendering figures (None = CPU count, 1 = serial)
+        """
+        figures = list(FIGURES) if figures == 'all' else list(figures or [])
+        unknown = [name for name in figures if name not in FIGURES]
+        if unknown:
+            raise ValueError(f"Unknown figures: {unknown}")
+        self.report_figures = figures
+        if output_dir is not None:
+            self.report_dir = output_dir
+        if draft is not None:
+            self.report_draft = draft
+        self.report_workers = workers
+        print(f"Report figures: {', '.join(figures)}" if figures else "Report figures off")
+
+    def generate_report(self, force=False):
+        """
+        Render the configured figures (in parallel, unchanged figures are skipped)
+        :param force: Render even when a figure's inputs have not changed
+        :return: List of files written
+        """
+        rendered, skipped = render_report(self, self.report_figures, self.report_dir, self.report_draft,
+                                          self.report_workers, force)
+        for file_path in rendered:
+            print(f"Figure saved to: {file_path}")
+        if skipped:
+            print(f"Unchanged figures skipped: {', '.join(skipped)}")
+        return rendered
+
+    def enable_checkpoints(self, file_path='simulation.ckpt', interval_min=180):
+        """
+        Save the simulator state periodically during event-driven runs
+        :param file_path: Checkpoint file (replaced atomically each time)
+        :param interval_min: Simulated minutes between checkpoints (None = off)
+        """
+        self.checkpoint_path = file_path
+        self.checkpoint_interval_min = interval_min
+        print(f"Checkpoint every {interval_min} min to: {file_path}" if interval_min else "Checkpoints off")
+
+    def save_checkpoint(self, file_path=None):
+        """
+        Serialise the full simulator state (fleet arrays, tasks, event heap, RNG
+        states, metrics, log) to a binary file. The file is written next to the
+        target and renamed over it, so a crash never leaves a partial checkpoint.
+        :param file_path: Output file (default: checkpoint_path)
+        :return: File path
+        """
+        file_path = file_path or self.checkpoint_path
+        if file_path is None:
+            raise ValueError("No checkpoint file given")
+        temp_path = file_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump({'version': CHECKPOINT_VERSION, 'simulation': self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+        return file_path
+
+    @classmethod
+    def load_checkpoint(cls, file_path):
+        """
+        Load a simulator saved by save_checkpoint
+        :param file_path: Checkpoint file
+        :return: MedicalDroneDelivery
+        """
+        with open(file_path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {state.get('version')}")
+        return state['simulation']
+
+    @classmethod
+    def resume_from(cls, file_path):
+        """
+        Load a checkpoint and run the interrupted simulation to the end
+        :param file_path: Checkpoint file
+        :return: The finished MedicalDroneDelivery
+        """
+        delivery_system = cls.load_checkpoint(file_path)
+        if delivery_system.engine is None or delivery_system.engine.pending() == 0:
+            print("Checkpoint has no pending events")
+            return delivery_system
+        print(f"Resuming at {delivery_system.engine.now:.1f} min with {delivery_system.engine.pending()} pending events")
+        delivery_system._run_engine()
+        return delivery_system
 
     def set_energy_strategy(self, strategy):
         """Set energy replenishment strategy"""
@@ -613,19 +890,18 @@ class MedicalDroneDelivery:
         Apply energy strategy
         :param drone: Drone
         :param task: Task
-        :return: Charge/swap required
+        :return: Charge/swap required (False when the task failed because the wind is too strong)
         """
         # Calculate required energy
-        distance = self.calculate_distance(drone['position'], task['from']['position'])
-        distance += self.calculate_distance(task['from']['position'], task['to']['position'])
-        flight_time = self.calculate_flight_time_from_distance(distance, task['payload_kg'])
-        energy_needed = self.calculate_energy_consumption(distance, task['payload_kg'], flight_time)
-
-        # Convert capacity to Wh
-        battery_wh = self.battery_capacity / 1000 * 14.8
+        flight = self.evaluate_flight([drone['position'], task['from']['position'], task['to']['position']],
+                                      task['payload_kg'])
+        if not flight['feasible']:
+            self.fail_task(drone, task, 'wind')
+            return False
+        energy_needed = flight['energy_wh']
 
         # Available energy
-        available_energy = (drone['battery_level'] / 100) * battery_wh
+        available_energy = (drone['battery_level'] / 100) * self.drone_battery_wh(drone)
 
         # Strategy A: Charge after every task
         if self.energy_strategy == 'A':
@@ -646,76 +922,192 @@ class MedicalDroneDelivery:
 
         # Strategy D: Hot-swap batteries
         elif self.energy_strategy == 'D':
-            # Always swap
-            self.performance_metrics['battery_swaps'] += 1
-            drone['battery_swaps'] += 1
+            # Always swap (swap_battery counts it)
             return True
 
         return False
 
-    def charge_battery(self, drone, to_full=True):
+    def charge_target_level(self, drone, task):
+        """
+        Battery level to charge to before a task
+        :param drone: Drone
+        :param task: Next task
+        :return: 100, or just enough for the task plus margins when partial charging is on
+        """
+        if not self.partial_charging:
+            return 100
+        flight = self.evaluate_flight([drone['position'], task['from']['position'], task['to']['position']],
+                                      task['payload_kg'])
+        needed = flight['energy_wh'] * 1.2 / self.drone_battery_wh(drone) * 100  # 20% safety margin
+        return float(min(100, max(drone['battery_level'], needed + self.safe_battery_threshold)))
+
+    def charge_duration(self, drone, target_level=100):
+        """
+        CC-CV charging time from the current level
+        :param drone: Drone
+        :param target_level: Target battery level (%)
+        :return: Time (min)
+        """
+        return float(self.charge_model.time_to_soc(drone['battery_level'] / 100, target_level / 100,
+                                                   self.temperature, self.drone_battery_wh(drone)))
+
+    def charge_battery(self, drone, to_full=True, target_level=None):
         """Charge operation"""
-        if to_full:
-            drone['battery_level'] = 100
-        else:
-            # Fast charge to 80%
-            drone['battery_level'] = min(100, drone['battery_level'] + 80)
+        if target_level is None:
+            # Full charge, or fast charge by 80%
+            target_level = 100 if to_full else min(100, drone['battery_level'] + 80)
+        target_level = max(target_level, drone['battery_level'])
+
+        # Capacity fade from this cycle's depth of discharge
+        if self.battery_aging is not None:
+            depth_of_discharge = (target_level - drone['battery_level']) / 100
+            self.battery_aging.record_cycles(drone['index'], depth_of_discharge, self.temperature)
+
+        drone['battery_level'] = target_level
 
         drone['battery_cycles'] += 1
         self.performance_metrics['battery_cycles'] += 1
         drone['status'] = 'charging'
+        self.record_soc(drone)
 
         # Log
         self.log.append({
-            'time': self.current_time,
+            'time': self.elapsed_minutes(),
             'event': 'charging',
             'drone': drone['id'],
             'battery_level': drone['battery_level']
         })
 
-    def schedule_tasks(self):
-        """Task scheduling"""
+    def book_charge(self, drone, duration, priority=1):
+        """
+        Book a charging bay at the nearest charging site
+        :param drone: Drone
+        :param duration: Charging time (min)
+        :param priority: Queue priority (lower is served first)
+        :return: (start, end) of the session in simulation minutes
+        """
+        site = self.find_charging_site(drone)
+        arrival = self.elapsed_minutes()
+        start, end, bay = site['charger'].request(arrival, duration, drone['id'], priority)
+        if 'available' in site:
+            site['available'] = site['charger'].available(arrival)
+        self.record_charge_wait(drone, site, bay, start - arrival, start)
+        return start, end
+
+    def record_charge_wait(self, drone, site, bay, wait, start):
+        """Count and log the time a drone waited for a charging bay (nothing if it did not wait)"""
+        if wait <= 0:
+            return
+        self.performance_metrics['charge_wait_time'] += wait
+
+        # Log
+        self.log.append({
+            'time': start,
+            'event': 'charge_queue',
+            'drone': drone['id'],
+            'station': site['name'],
+            'bay': bay,
+            'wait': wait
+        })
+
+    def queue_for_charge(self, drone, duration, priority=1):
+        """
+        Book a charging bay and wait until it is free
+        :param drone: Drone
+        :param duration: Charging time (min)
+        :param priority: Queue priority (lower is served first)
+        :return: Waiting time (min)
+        """
+        start, _ = self.book_charge(drone, duration, priority)
+        wait = start - self.elapsed_minutes()
+        if wait > 0:
+            self.current_time += timedelta(minutes=wait)
+        return wait
+
+    def swap_battery(self, drone):
+        """Hot-swap a full battery"""
+        drone['battery_level'] = 100
+        drone['battery_swaps'] += 1
+        self.performance_metrics['battery_swaps'] += 1
+        self.record_soc(drone)
+
+        # Log
+        self.log.append({
+            'time': self.elapsed_minutes(),
+            'event': 'battery_swap',
+            'drone': drone['id'],
+            'battery_level': 100
+        })
+
+    def reject_infeasible_tasks(self):
+        """
+        Fail pending tasks whose payload exceeds the gross weight limit
+        :return: Number of rejected tasks
+        """
+        pending = [t for t in self.task_queue if t['status'] == 'pending']
+        if not pending:
+            return 0
+
+        feasible = self.gross_weight.is_feasible([t['payload_kg'] for t in pending],
+                                                 self.temperature, self.altitude_ft)
+        limit = self.gross_weight.max_payload(self.temperature, self.altitude_ft)
+
+        rejected = 0
+        for task, ok in zip(pending, feasible):
+            if ok:
+                continue
+            task['status'] = 'failed'
+            rejected += 1
+
+            # Log
+            self.log.append({
+                'time': self.elapsed_minutes(),
+                'event': 'task_rejected',
+                'task': f"{task['from']['name']} -> {task['to']['name']}",
+                'payload': task['payload_kg'],
+                'reason': f"Payload exceeds {limit:.2f} kg at {self.temperature}°C / {self.altitude_ft} ft"
+            })
+
+        if rejected:
+            print(f"Rejected {rejected} task(s) exceeding the gross weight limit ({limit:.2f} kg)")
+        return rejected
+
+    def schedule_tasks_sequential(self):
+        """Task scheduling on one global clock (tasks run one after another)"""
         # Sort tasks by priority
         priority_order = {'high': 1, 'normal': 2, 'low': 3}
         self.task_queue.sort(key=lambda t: priority_order[t['priority']])
 
+        # Reject tasks the drone cannot lift in current conditions
+        self.reject_infeasible_tasks()
+
         # Assign to drones
         for task in self.task_queue:
             if task['status'] != 'pending':
                 continue
 
-            # Find available drones
-            available_drones = [d for d in self.drones if
-                                d['status'] == 'idle' and d['home_base'] == task['from']['name']]
-
-            if not available_drones:
+            # Select highest battery idle drone at the task's base
+            drone_index = self.drones.best_idle_at_base(task['from']['name'])
+            if drone_index is None:
                 print(f"No drones available for: {task['from']['name']} -> {task['to']['name']}")
                 continue
-
-            # Select highest battery drone
-            available_drones.sort(key=lambda d: d['battery_level'], reverse=True)
-            drone = available_drones[0]
+            drone = self.drones[drone_index]
 
             # Check energy need
-            if self.apply_energy_strategy(drone, task):
+            charge_needed = self.apply_energy_strategy(drone, task)
+            if task['status'] == 'failed':
+                continue
+            if charge_needed:
                 if self.energy_strategy == 'D':
                     # Hot-swap battery
-                    drone['battery_level'] = 100
-                    drone['battery_swaps'] += 1
-                    self.performance_metrics['battery_swaps'] += 1
-
-                    # Log
-                    self.log.append({
-                        'time': self.current_time,
-                        'event': 'battery_swap',
-                        'drone': drone['id'],
-                        'battery_level': 100
-                    })
+                    self.swap_battery(drone)
                 else:
-                    # Charge
-                    self.charge_battery(drone)
-                    # Charge time (assume 10 min)
-                    self.current_time += timedelta(minutes=10)
+                    # Queue for a free bay, then charge (CC-CV time, full or just enough)
+                    target_level = self.charge_target_level(drone, task)
+                    duration = self.charge_duration(drone, target_level)
+                    self.queue_for_charge(drone, duration, TASK_PRIORITY[task['priority']])
+                    self.charge_battery(drone, target_level=target_level)
+                    self.current_time += timedelta(minutes=duration)
 
             # Assign task
             task['status'] = 'in_progress'
@@ -726,7 +1118,7 @@ class MedicalDroneDelivery:
 
             # Log
             self.log.append({
-                'time': self.current_time,
+                'time': self.elapsed_minutes(),
                 'event': 'task_start',
                 'drone': drone['id'],
                 'task': f"{task['from']['name']} -> {task['to']['name']}",
@@ -736,6 +1128,8 @@ class MedicalDroneDelivery:
 
             # Execute task
             self.execute_task(drone, task)
+            if task['status'] == 'failed':
+                continue
 
             # Update time
             self.current_time += timedelta(minutes=task['flight_time_min'])
@@ -748,122 +1142,112 @@ class MedicalDroneDelivery:
             task['end_time'] = self.current_time
             drone['status'] = 'idle'
             drone['current_task'] = None
+            self.record_soc(drone, task['to']['position'])
 
             # Log
             self.log.append({
-                'time': self.current_time,
+                'time': self.elapsed_minutes(),
                 'event': 'task_complete',
                 'drone': drone['id'],
                 'task': f"{task['from']['name']} -> {task['to']['name']}",
                 'battery_level': drone['battery_level']
             })
+        self.performance_metrics['makespan'] = self.elapsed_minutes()
 
-    def execute_task(self, drone, task):
-        """Execute delivery task"""
-        # Calculate distances
+    def plan_task_legs(self, drone, task):
+        """
+        Flight legs of a task: one direct leg, or two legs via a transfer point
+        :param drone: Drone
+        :param task: Task
+        :return: (legs, total_distance); legs is None if a transfer is needed but none was found
+        """
         distance_to_start = self.calculate_distance(drone['position'], task['from']['position'])
         distance_to_end = self.calculate_distance(task['from']['position'], task['to']['position'])
         total_distance = distance_to_start + distance_to_end
 
-        # Check if transfer needed
-        if self.check_transfer_needed(total_distance):
-            transfer_points = self.plan_transfer(task['from'], task['to'], task['payload_kg'])
-            if transfer_points:
-                self.performance_metrics['transfer_count'] += 1
+        # Direct flight
+        if not self.check_transfer_needed(total_distance):
+            return [{
+                'from': task['from'],
+                'to': task['to'],
+                'distance': total_distance,
+                'path': [drone['position'], task['from']['position'], task['to']['position']],
+                'event': 'direct_flight'
+            }], total_distance
+
+        transfer_points = self.plan_transfer(task['from'], task['to'], task['payload_kg'])
+        if not transfer_points:
+            return None, total_distance
+
+        # Start to transfer point, then transfer to destination
+        transfer = transfer_points[0]
+        legs = [{
+            'from': task['from'],
+            'to': transfer,
+            'distance': self.calculate_distance(drone['position'], transfer['position']),
+            'path': [drone['position'], transfer['position']],
+            'event': 'transfer_segment'
+        }, {
+            'from': transfer,
+            'to': task['to'],
+            'distance': self.calculate_distance(transfer['position'], task['to']['position']),
+            'path': [transfer['position'], task['to']['position']],
+            'event': 'transfer_segment'
+        }]
+        return legs, total_distance
+
+    def fly_leg(self, drone, task, leg):
+        """
+        Fly one leg: update the drone and log it
+        :return: (flight_time, energy_used), or None if the wind made the task fail
+        """
+        flight = self.evaluate_flight(leg['path'], task['payload_kg'])
+        if not flight['feasible']:
+            self.fail_task(drone, task, 'wind')
+            return None
+        flight_time = flight['flight_time_min']
+        energy_used = flight['energy_wh']
+        energy_used_percent = energy_used / self.drone_battery_wh(drone) * 100
 
-                # Execute in segments
-                segments = []
-                current_pos = drone['position']
-
-                # Start to transfer point
-                segments.append({
-                    'from': task['from'],
-                    'to': transfer_points[0],
-                    'distance': self.calculate_distance(current_pos, transfer_points[0]['position'])
-                })
-                current_pos = transfer_points[0]['position']
-
-                # Transfer to destination
-                segments.append({
-                    'from': transfer_points[0],
-                    'to': task['to'],
-                    'distance': self.calculate_distance(current_pos, task['to']['position'])
-                })
-
-                # Execute segments
-                for segment in segments:
-                    flight_time = self.calculate_flight_time_from_distance(segment['distance'], task['payload_kg'])
-                    energy_used = self.calculate_energy_consumption(segment['distance'], task['payload_kg'],
-                                                                    flight_time)
-
-                    # Update drone
-                    battery_wh = self.battery_capacity / 1000 * 14.8
-                    energy_used_percent = (energy_used / battery_wh) * 100
-                    drone['battery_level'] = max(0, drone['battery_level'] - energy_used_percent)
-                    drone['total_distance'] += segment['distance']
-                    drone['total_flight_time'] += flight_time
-
-                    # Log
-                    self.log.append({
-                        'time': self.current_time,
-                        'event': 'transfer_segment',
-                        'drone': drone['id'],
-                        'from': segment['from']['name'],
-                        'to': segment['to']['name'],
-                        'distance': segment['distance'],
-                        'energy_used': energy_used,
-                        'battery_level': drone['battery_level']
-                    })
-
-                    # Update time
-                    self.current_time += timedelta(minutes=flight_time)
-
-                    # Transfer service time
-                    if segment['to'] != task['to']:
-                        self.current_time += timedelta(minutes=5)
-            else:
-                # No transfer found, fail task
-                task['status'] = 'failed'
-                drone['status'] = 'idle'
-                drone['current_task'] = None
-                self.performance_metrics['abort_rate'] += 1
-
-                # Log
-                self.log.append({
-                    'time': self.current_time,
-                    'event': 'task_failed',
-                    'drone': drone['id'],
-                    'task': f"{task['from']['name']} -> {task['to']['name']}",
-                    'reason': 'No transfer point found'
-                })
-                return
-        else:
-            # Direct flight
-            flight_time = self.calculate_flight_time_from_distance(total_distance, task['payload_kg'])
-            energy_used = self.calculate_energy_consumption(total_distance, task['payload_kg'], flight_time)
+        # Update drone
+        drone['battery_level'] = max(0, drone['battery_level'] - energy_used_percent)
+        drone['total_distance'] += leg['distance']
+        drone['total_flight_time'] += flight_time
 
-            # Update drone
-            battery_wh = self.battery_capacity / 1000 * 14.8
-            energy_used_percent = (energy_used / battery_wh) * 100
-            drone['battery_level'] = max(0, drone['battery_level'] - energy_used_percent)
-            drone['total_distance'] += total_distance
-            drone['total_flight_time'] += flight_time
+        # Log
+        self.log.append({
+            'time': self.elapsed_minutes(),
+            'event': leg['event'],
+            'drone': drone['id'],
+            'from': leg['from']['name'],
+            'to': leg['to']['name'],
+            'distance': leg['distance'],
+            'energy_used': energy_used,
+            'battery_level': drone['battery_level']
+        })
+        return flight_time, energy_used
 
-            # Log
-            self.log.append({
-                'time': self.current_time,
-                'event': 'direct_flight',
-                'drone': drone['id'],
-                'from': task['from']['name'],
-                'to': task['to']['name'],
-                'distance': total_distance,
-                'energy_used': energy_used,
-                'battery_level': drone['battery_level']
-            })
+    def fail_task(self, drone, task, reason):
+        """Mark a task failed and release its drone"""
+        task['status'] = 'failed'
+        drone['status'] = 'idle'
+        drone['current_task'] = None
+        self.performance_metrics['abort_rate'] += 1
 
+        # Log
+        self.log.append({
+            'time': self.elapsed_minutes(),
+            'event': 'task_failed',
+            'drone': drone['id'],
+            'task': f"{task['from']['name']} -> {task['to']['name']}",
+            'reason': reason
+        })
+
+    def record_task_flight(self, drone, task, flight_time, distance, energy_used):
+        """Store flight results on the task and update metrics"""
         # Update task
         task['flight_time_min'] = flight_time
-        task['distance_km'] = total_distance
+        task['distance_km'] = distance
         task['energy_used'] = energy_used
 
         # Update metrics
@@ -874,11 +1258,457 @@ class MedicalDroneDelivery:
         if drone['battery_level'] < 20:
             self.performance_metrics['safe_margin_violations'] += 1
 
+    def execute_task(self, drone, task):
+        """Execute delivery task"""
+        legs, total_distance = self.plan_task_legs(drone, task)
+        if legs is None:
+            # No transfer found, fail task
+            self.fail_task(drone, task, 'No transfer point found')
+            return
+        if len(legs) > 1:
+            self.performance_metrics['transfer_count'] += 1
+
+        for leg in legs:
+            flown = self.fly_leg(drone, task, leg)
+            if flown is None:
+                return
+            flight_time, energy_used = flown
+            if leg['event'] == 'transfer_segment':
+                # Update time
+                self.current_time += timedelta(minutes=flight_time)
+                self.record_soc(drone, leg['to']['position'])
+
+                # Transfer service time
+                if leg['to'] != task['to']:
+                    self.current_time += timedelta(minutes=self.transfer_service_time)
+
+        self.record_task_flight(drone, task, flight_time, total_distance, energy_used)
+
+    def _sync_clock(self, minutes):
+        # Event time (min since start) -> wall-clock simulation time
+        self.current_time = self.start_time + timedelta(minutes=minutes)
+
+    def schedule_tasks(self):
+        """
+        Task scheduling with a discrete-event engine.
+
+        Drones progress concurrently: each task is a chain of events (charge or
+        swap, takeoff, arrival, service end) and an idle drone triggers a new
+        dispatch. The makespan is the time of the last event.
+        """
+        # Sort tasks by priority
+        priority_order = {'high': 1, 'normal': 2, 'low': 3}
+        self.task_queue.sort(key=lambda t: priority_order[t['priority']])
+
+        # Reject tasks the drone cannot lift in current conditions
+        self.reject_infeasible_tasks()
+
+        engine = self._create_engine()
+
+        # Tasks whose base has no drones can never start (unless drones are moved there)
+        for task in self.task_queue:
+            if self.rebalance_interval_min:
+                break
+            if task['status'] == 'pending' and self.drones.base_index(task['from']['name']) < 0:
+                print(f"No drones available for: {task['from']['name']} -> {task['to']['name']}")
+
+        engine.schedule(engine.now, 'dispatch')
+        self._run_engine()
+
+    def _create_engine(self):
+        # Event engine at the current simulation time with the task handlers registered
+        engine = EventEngine(self.elapsed_minutes())
+        engine.background.update(PERIODIC_EVENTS)
+        self.engine = engine
+        engine.on('dispatch', self._on_dispatch)
+        engine.on('batch_dispatch', self._on_batch_dispatch)
+        self._batch_scheduled = False
+        engine.on('task_arrival', self._on_task_arrival)
+        engine.on('swap', self._on_swap)
+        engine.on('charge_start', self._on_charge_start)
+        engine.on('charge_end', self._on_charge_end)
+        engine.on('takeoff', self._on_takeoff)
+        engine.on('arrival', self._on_arrival)
+        engine.on('service_end', self._on_service_end)
+        engine.on('rebalance', self._on_rebalance)
+        engine.on('reposition_end', self._on_reposition_end)
+        engine.on('checkpoint', self._on_checkpoint)
+        if self.rebalance_interval_min:
+            engine.schedule(engine.now, 'rebalance')
+        if self.checkpoint_path and self.checkpoint_interval_min:
+            engine.schedule_in(self.checkpoint_interval_min, 'checkpoint')
+        self._run_start = engine.now
+        return engine
+
+    def _run_engine(self):
+        # Process events to the end (also the resume point of a checkpoint)
+        self.engine.run(before_event=self._sync_clock)
+        self.performance_metrics['makespan'] = self.engine.now - self._run_start
+        self.demand = None
+
+    def _on_checkpoint(self):
+        # Reschedule first so the saved heap already holds the next checkpoint
+        self.engine.schedule_in(self.checkpoint_interval_min, 'checkpoint')
+        self.save_checkpoint()
+
+    def run_demand(self, demand):
+        """
+        Consume a demand stream online: tasks are created and dispatched as they
+        arrive, and finished tasks are dropped (only counted), so memory follows
+        the in-flight work rather than the whole horizon
+        :param demand: Iterable of (minute since start, request dict), e.g. demand.DemandStream;
+                       must be finite (set a horizon)
+        :return: Number of tasks that arrived
+        """
+        self.retire_finished_tasks = True
+        self._retire_finished_tasks()
+        self._center_index = {c['name']: i for i, c in enumerate(self.distribution_centers)}
+        self._hospital_index = {h['name']: i for i, h in enumerate(self.hospitals)}
+        self._arrivals = 0
+
+        engine = self._create_engine()
+        self.demand = iter(demand)
+        engine.schedule(engine.now, 'dispatch')  # tasks already queued
+        self._schedule_next_arrival(engine.now)
+        self._run_engine()
+        return self._arrivals
+
+    def _schedule_next_arrival(self, start):
+        # Pull one request from the stream; the next is pulled when it arrives
+        request = next(self.demand, None)
+        if request is not None:
+            minute, request = request
+            self.engine.schedule(max(start + minute, self.engine.now), 'task_arrival', start=start,
+                                 request=request)
+
+    def _on_task_arrival(self, start, request):
+        self._arrivals += 1
+        from_index = self._center_index.get(request['from'], -1)
+        to_index = self._hospital_index.get(request['to'], -1)
+        self._schedule_next_arrival(start)
+        if from_index < 0 or to_index < 0:
+            print(f"Unknown route in demand: {request['from']} -> {request['to']}")
+            self.retired_tasks['failed'] += 1
+            return
+
+        task = self.add_delivery_task(from_index, to_index, request['payload_kg'], request['material_type'],
+                                      request['priority'])
+
+        # Keep the queue in priority order (stable for equal priority)
+        priority_order = {'high': 1, 'normal': 2, 'low': 3}
+        self.task_queue.pop()
+        position = next((i for i, t in enumerate(self.task_queue)
+                         if priority_order[t['priority']] > priority_order[task['priority']]), len(self.task_queue))
+        self.task_queue.insert(position, task)
+
+        if self.reject_infeasible_tasks():
+            self._retire_finished_tasks()
+        self.engine.schedule(self.engine.now, 'dispatch')
+
+    def _retire_finished_tasks(self):
+        # Drop completed and failed tasks (online mode), keeping their counts
+        if not self.retire_finished_tasks:
+            return
+        for status in self.retired_tasks:
+            self.retired_tasks[status] += sum(1 for t in self.delivery_tasks if t['status'] == status)
+        self.delivery_tasks = [t for t in self.delivery_tasks if t['status'] not in self.retired_tasks]
+        self.task_queue = [t for t in self.task_queue if t['status'] not in self.retired_tasks]
+
+    def _on_dispatch(self):
+        if self.dispatch_mode == 'batch':
+            # Collect tasks for one window, then assign them together
+            if not self._batch_scheduled:
+                self._batch_scheduled = True
+                self.engine.schedule_in(self.batch_window_min, 'batch_dispatch')
+            return
+
+        # Assign pending tasks (in priority order) to idle drones at their base
+        for task in self.task_queue:
+            if task['status'] != 'pending':
+                continue
+
+            # Select highest battery idle drone at the task's base
+            drone_index = self.drones.best_idle_at_base(task['from']['name'])
+            if drone_index is None:
+                continue
+            self._assign_task(self.drones[drone_index], task)
+
+    def assignment_costs(self, drone_ids, tasks):
+        """
+        Drone-to-task cost matrix for batch dispatch (vectorized)
+
+        Cost is flight time including the positioning leg, plus the charging
+        time when the drone's battery cannot cover the task with the 20% margin,
+        minus a priority bonus. Drones may serve another base's task only if
+        they can fly it without charging or a transfer.
+        :param drone_ids: Integer ids of candidate drones
+        :param tasks: Pending tasks
+        :return: (drones, tasks) array, np.inf where the pair is not allowed
+        """
+        fleet = self.drones
+        positions = fleet.position[drone_ids]
+        starts = np.array([t['from']['position'] for t in tasks], dtype=np.float64)
+        ends = np.array([t['to']['position'] for t in tasks], dtype=np.float64)
+        payloads = np.array([t['payload_kg'] for t in tasks], dtype=np.float64)
+
+        # Positioning leg (drone -> task start) plus the delivery itself
+        to_start = haversine_distance_batch(positions[:, None, 0], positions[:, None, 1],
+                                            starts[None, :, 0], starts[None, :, 1])
+        delivery = haversine_distance_batch(starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1])
+        distance = to_start + delivery[None, :]
+        flight_time, energy, _ = self.energy_model.evaluate_batch(distance, payloads[None, :])
+
+        # Energy feasibility with the aged capacity of each drone
+        if self.battery_aging is None:
+            capacity = np.full(len(drone_ids), self.energy_model.params.battery_wh)
+        else:
+            capacity = self.battery_aging.capacity[drone_ids] / 1000 * self.energy_model.params.battery_voltage
+        level = fleet.battery_level[drone_ids]
+        needs_charge = (level / 100 * capacity)[:, None] < energy * 1.2  # 20% safety margin
+        charge_time = self.charge_model.time_to_soc(level / 100, 1.0, self.temperature, capacity)
+
+        same_base = fleet.home_base[drone_ids][:, None] == np.array(
+            [fleet.base_index(t['from']['name']) for t in tasks])[None, :]
+        feasible = same_base | (~needs_charge & ~self.check_transfer_needed(distance))
+
+        bonus = np.array([PRIORITY_BONUS[t['priority']] for t in tasks])
+        cost = flight_time + np.where(needs_charge, charge_time[:, None], 0.0) - bonus[None, :]
+        return np.where(feasible, cost, np.inf)
+
+    def _on_batch_dispatch(self):
+        # Optimal assignment of the pending tasks collected in the window
+        self._batch_scheduled = False
+        pending = [t for t in self.task_queue if t['status'] == 'pending']
+        drone_ids = self.drones.with_status('idle')
+        if not pending or len(drone_ids) == 0:
+            return
+
+        rows, cols = linear_assignment(self.assignment_costs(drone_ids, pending))
+        for row, col in zip(rows, cols):
+            self._assign_task(self.drones[int(drone_ids[row])], pending[col])
+
+    def _assign_task(self, drone, task):
+        # Reserve the drone and start its charge, swap or takeoff
+        task['status'] = 'in_progress'
+        task['assigned_drone'] = drone['id']
+        drone['status'] = 'assigned'
+        drone['current_task'] = task
+
+        # Check energy need
+        charge_needed = self.apply_energy_strategy(drone, task)
+        if task['status'] == 'failed':
+            # The drone is free again
+            self._retire_finished_tasks()
+            self.engine.schedule(self.engine.now, 'dispatch')
+        elif not charge_needed:
+            self.engine.schedule(self.engine.now, 'takeoff', drone=drone, task=task)
+        elif self.energy_strategy == 'D':
+            self.engine.schedule(self.engine.now, 'swap', drone=drone, task=task)
+        else:
+            # Queue for a free bay, then charge (CC-CV time, full or just enough)
+            target_level = self.charge_target_level(drone, task)
+            duration = self.charge_duration(drone, target_level)
+            drone['status'] = 'queued'
+            self._queue_charge(drone, task, target_level, duration, TASK_PRIORITY[task['priority']])
+
+    def _queue_charge(self, drone, task, target_level, duration, priority):
+        # Take a free bay now, or wait at the station until a bay is handed over in discipline order
+        site = self.find_charging_site(drone)
+        now = self.engine.now
+        session = site['charger'].arrive(now, duration, drone['id'], priority, ticket=(drone, task, target_level))
+        if 'available' in site:
+            site['available'] = site['charger'].available(now)
+        if session is not None:
+            _, end, bay = session
+            self._start_charge(drone, task, target_level, site, bay, end)
+
+    def _start_charge(self, drone, task, target_level, site, bay, end):
+        self.engine.schedule(self.engine.now, 'charge_start', drone=drone)
+        self.engine.schedule(end, 'charge_end', drone=drone, task=task, target_level=target_level, site=site,
+                             bay=bay)
+
+    def rebalance_fleet(self):
+        """
+        Move idle drones from bases with spare drones to bases with queued tasks
+        (min-cost flow over reposition flight times from the energy model)
+        :return: Number of drones sent
+        """
+        fleet = self.drones
+        names = [c['name'] for c in self.distribution_centers]
+        idle = np.array([len(fleet.idle_at_base(name)) if fleet.base_index(name) >= 0 else 0 for name in names])
+        pending = np.zeros(len(names), dtype=np.int64)
+        index = {name: i for i, name in enumerate(names)}
+        for task in self.task_queue:
+            if task['status'] == 'pending' and task['from']['name'] in index:
+                pending[index[task['from']['name']]] += 1
+
+        # Reposition cost: empty flight between bases, within range
+        positions = np.array([c['position'] for c in self.distribution_centers], dtype=np.float64)
+        distance = haversine_distance_batch(positions[:, None, 0], positions[:, None, 1],
+                                            positions[None, :, 0], positions[None, :, 1])
+        flight_time, energy, _ = self.energy_model.evaluate_batch(distance, 0.0)
+        allowed = ~self.check_transfer_needed(distance) & ~np.eye(len(names), dtype=bool)
+        moves = rebalance_plan(idle, pending, np.where(allowed, flight_time, np.inf))
+
+        sent = 0
+        for source, target, count in moves:
+            for _ in range(count):
+                drone_index = fleet.best_idle_at_base(names[source])
+                if drone_index is None:
+                    break
+                drone = fleet[drone_index]
+                # Highest battery first: if this drone cannot make it, none can
+                available_energy = drone['battery_level'] / 100 * self.drone_battery_wh(drone)
+                if available_energy < energy[source, target] * 1.2:  # 20% safety margin
+                    break
+                # Headwind too strong for this move: no other drone can fly it either
+                if not self._start_reposition(drone, self.distribution_centers[target]):
+                    break
+                sent += 1
+        return sent
+
+    def _start_reposition(self, drone, center):
+        # Empty flight to another base; False (drone left idle) if the wind rules it out
+        flight = self.evaluate_flight([drone['position'], center['position']], 0.0)
+        if not flight['feasible']:
+            return False
+        energy_used_percent = flight['energy_wh'] / self.drone_battery_wh(drone) * 100
+        drone['status'] = 'flying'
+        drone['battery_level'] = max(0, drone['battery_level'] - energy_used_percent)
+        drone['total_distance'] += flight['distance_km']
+        drone['total_flight_time'] += flight['flight_time_min']
+        self.performance_metrics['repositions'] += 1
+        self.performance_metrics['reposition_energy'] += flight['energy_wh']
+
+        # Log
+        self.log.append({
+            'time': self.elapsed_minutes(),
+            'event': 'reposition',
+            'drone': drone['id'],
+            'from': drone['home_base'],
+            'to': center['name'],
+            'distance': flight['distance_km'],
+            'energy_used': flight['energy_wh'],
+            'battery_level': drone['battery_level']
+        })
+        self.engine.schedule_in(flight['flight_time_min'], 'reposition_end', drone=drone, center=center)
+        return True
+
+    def _on_rebalance(self):
+        self.rebalance_fleet()
+        # Always re-arm: queues can be empty now and fill up with later arrivals. 'rebalance' is
+        # a background event, so it does not keep the engine running once nothing else can happen
+        self.engine.schedule_in(self.rebalance_interval_min, 'rebalance')
+
+    def _on_reposition_end(self, drone, center):
+        drone['home_base'] = center['name']
+        drone['position'] = center['position']
+        drone['status'] = 'idle'
+        self.record_soc(drone)
+        self.engine.schedule(self.engine.now, 'dispatch')
+
+    def _on_swap(self, drone, task):
+        drone['status'] = 'swapping'
+        self.swap_battery(drone)
+        self.engine.schedule_in(self.swap_time_min, 'takeoff', drone=drone, task=task)
+
+    def _on_charge_start(self, drone):
+        drone['status'] = 'charging'
+
+    def _on_charge_end(self, drone, task, target_level, site=None, bay=None):
+        self.charge_battery(drone, target_level=target_level)
+        self.engine.schedule(self.engine.now, 'takeoff', drone=drone, task=task)
+        if site is None:
+            return
+
+        # The bay goes to the next waiting drone
+        served = site['charger'].release(self.engine.now, bay)
+        if served is not None:
+            start, end, bay, arrival, (next_drone, next_task, next_level) = served
+            self.record_charge_wait(next_drone, site, bay, start - arrival, start)
+            self._start_charge(next_drone, next_task, next_level, site, bay, end)
+
+    def _on_takeoff(self, drone, task, legs=None, leg_index=0, flown=None):
+        if legs is None:
+            # First leg of the task
+            task['start_time'] = self.current_time
+            drone['status'] = 'flying'
+
+            # Log
+            self.log.append({
+                'time': self.elapsed_minutes(),
+                'event': 'task_start',
+                'drone': drone['id'],
+                'task': f"{task['from']['name']} -> {task['to']['name']}",
+                'payload': task['payload_kg'],
+                'battery_level': drone['battery_level']
+            })
+
+            legs, total_distance = self.plan_task_legs(drone, task)
+            if legs is None:
+                self.fail_task(drone, task, 'No transfer point found')
+                self._retire_finished_tasks()
+                self.engine.schedule(self.engine.now, 'dispatch')
+                return
+            if len(legs) > 1:
+                self.performance_metrics['transfer_count'] += 1
+            flown = {'time': 0.0, 'energy': 0.0, 'distance': total_distance}
+
+        drone['status'] = 'flying'
+        leg_flight = self.fly_leg(drone, task, legs[leg_index])
+        if leg_flight is None:
+            self._retire_finished_tasks()
+            self.engine.schedule(self.engine.now, 'dispatch')
+            return
+        flight_time, energy_used = leg_flight
+        flown['time'] += flight_time
+        flown['energy'] += energy_used
+        self.engine.schedule_in(flight_time, 'arrival', drone=drone, task=task, legs=legs,
+                                leg_index=leg_index, flown=flown)
+
+    def _on_arrival(self, drone, task, legs, leg_index, flown):
+        leg = legs[leg_index]
+        self.record_soc(drone, leg['to']['position'])
+
+        # Transfer point: short stop, then the next leg
+        if leg_index + 1 < len(legs):
+            drone['status'] = 'delivering'
+            self.engine.schedule_in(self.transfer_service_time, 'takeoff', drone=drone, task=task, legs=legs,
+                                    leg_index=leg_index + 1, flown=flown)
+            return
+
+        self.record_task_flight(drone, task, flown['time'], flown['distance'], flown['energy'])
+        drone['status'] = 'delivering'
+        self.engine.schedule_in(task['to']['service_time'], 'service_end', drone=drone, task=task)
+
+    def _on_service_end(self, drone, task):
+        # Complete task
+        task['status'] = 'completed'
+        task['end_time'] = self.current_time
+        drone['status'] = 'idle'
+        drone['current_task'] = None
+        self.record_soc(drone, task['to']['position'])
+
+        # Log
+        self.log.append({
+            'time': self.elapsed_minutes(),
+            'event': 'task_complete',
+            'drone': drone['id'],
+            'task': f"{task['from']['name']} -> {task['to']['name']}",
+            'battery_level': drone['battery_level']
+        })
+
+        # The drone is free again
+        self._retire_finished_tasks()
+        self.engine.schedule(self.engine.now, 'dispatch')
+
     def calculate_performance_metrics(self):
         """Calculate performance metrics"""
-        total_tasks = len(self.delivery_tasks)
+        total_tasks = len(self.delivery_tasks) + sum(self.retired_tasks.values())
         completed_tasks = sum(1 for t in self.delivery_tasks if t['status'] == 'completed')
         failed_tasks = sum(1 for t in self.delivery_tasks if t['status'] == 'failed')
+        completed_tasks += self.retired_tasks['completed']
+        failed_tasks += self.retired_tasks['failed']
 
         self.performance_metrics['success_rate'] = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
         self.performance_metrics['abort_rate'] = (failed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
@@ -889,6 +1719,8 @@ class MedicalDroneDelivery:
         """Create delivery map"""
         if not self.distribution_centers and not self.hospitals:
             return None
+        import folium
+        from folium.plugins import AntPath
 
         # Calculate center point
         all_points = [center['position'] for center in self.distribution_centers] + \
@@ -934,9 +1766,9 @@ class MedicalDroneDelivery:
             ).add_to(m)
 
         # Add road network
-        for edge in self.road_network.edges:
-            node1 = self.road_network.nodes[edge[0]]
-            node2 = self.road_network.nodes[edge[1]]
+        for from_name, to_name in self.road_edges:
+            node1 = self.road_nodes[from_name]
+            node2 = self.road_nodes[to_name]
 
             folium.PolyLine(
                 locations=[node1['pos'], node2['pos']],
@@ -982,8 +1814,9 @@ class MedicalDroneDelivery:
 
         return m
 
-    def plot_energy_consumption(self):
+    def plot_energy_consumption(self, file_path='energy_consumption.png', dpi=300):
         """Plot energy consumption comparison"""
+        plt = _pyplot()
         plt.figure(figsize=(12, 6))
 
         # Group energy by material type
@@ -991,7 +1824,7 @@ class MedicalDroneDelivery:
         for task in self.delivery_tasks:
             if task['status'] != 'completed':
                 continue
-            if 'energy_used' not in task or pd.isna(task['energy_used']):
+            if 'energy_used' not in task or _is_missing(task['energy_used']):
                 continue
 
             material_type = task.get('material_type', 'unknown')
@@ -1029,13 +1862,14 @@ class MedicalDroneDelivery:
         plt.tight_layout()
 
         # Save image
-        plt.savefig('energy_consumption.png', dpi=300, bbox_inches='tight')
+        plt.savefig(file_path, dpi=dpi, bbox_inches='tight')
         plt.close()
 
-        return 'energy_consumption.png'
+        return file_path
 
-    def plot_time_statistics(self):
+    def plot_time_statistics(self, file_path='time_statistics.png', dpi=300):
         """Plot time statistics"""
+        plt = _pyplot()
         plt.figure(figsize=(12, 6))
 
         # Extract task times
@@ -1044,9 +1878,9 @@ class MedicalDroneDelivery:
         for task in self.delivery_tasks:
             if task['status'] != 'completed':
                 continue
-            if 'flight_time_min' in task and not pd.isna(task['flight_time_min']):
+            if 'flight_time_min' in task and not _is_missing(task['flight_time_min']):
                 flight_times.append(task['flight_time_min'])
-            if 'to' in task and 'service_time' in task['to'] and not pd.isna(task['to']['service_time']):
+            if 'to' in task and 'service_time' in task['to'] and not _is_missing(task['to']['service_time']):
                 service_times.append(task['to']['service_time'])
 
         # Plot
@@ -1071,19 +1905,20 @@ class MedicalDroneDelivery:
         plt.tight_layout()
 
         # Save image
-        plt.savefig('time_statistics.png', dpi=300, bbox_inches='tight')
+        plt.savefig(file_path, dpi=dpi, bbox_inches='tight')
         plt.close()
 
-        return 'time_statistics.png'
+        return file_path
 
-    def plot_battery_cycles(self):
+    def plot_battery_cycles(self, file_path='battery_cycles.png', dpi=300):
         """Plot battery cycles"""
+        plt = _pyplot()
         plt.figure(figsize=(8, 8))
 
         # Collect cycles per drone
         cycles_by_drone = {}
         for drone in self.drones:
-            if 'battery_cycles' in drone and not pd.isna(drone['battery_cycles']) and drone['battery_cycles'] > 0:
+            if 'battery_cycles' in drone and not _is_missing(drone['battery_cycles']) and drone['battery_cycles'] > 0:
                 cycles_by_drone[drone['id']] = drone['battery_cycles']
 
         # Check data
@@ -1102,13 +1937,14 @@ class MedicalDroneDelivery:
             plt.title('Battery Cycle Distribution', fontsize=14)
 
         # Save image
-        plt.savefig('battery_cycles.png', dpi=300, bbox_inches='tight')
+        plt.savefig(file_path, dpi=dpi, bbox_inches='tight')
         plt.close()
 
-        return 'battery_cycles.png'
+        return file_path
 
-    def plot_performance_metrics(self):
+    def plot_performance_metrics(self, file_path='performance_metrics.png', dpi=300):
         """Plot performance metrics"""
+        plt = _pyplot()
         # Calculate metrics
         metrics = self.calculate_performance_metrics()
 
@@ -1156,13 +1992,14 @@ class MedicalDroneDelivery:
         plt.tight_layout()
 
         # Save image
-        plt.savefig('performance_metrics.png', dpi=300, bbox_inches='tight')
+        plt.savefig(file_path, dpi=dpi, bbox_inches='tight')
         plt.close()
 
-        return 'performance_metrics.png'
+        return file_path
 
-    def plot_flight_time_vs_payload(self):
+    def plot_flight_time_vs_payload(self, file_path='flight_time_vs_payload.png', dpi=300):
         """Plot flight time vs payload"""
+        plt = _pyplot()
         plt.figure(figsize=(10, 6))
 
         # Extract data
@@ -1171,9 +2008,9 @@ class MedicalDroneDelivery:
         for task in self.delivery_tasks:
             if task['status'] != 'completed':
                 continue
-            if 'payload_kg' in task and not pd.isna(task['payload_kg']):
+            if 'payload_kg' in task and not _is_missing(task['payload_kg']):
                 payloads.append(task['payload_kg'])
-            if 'flight_time_min' in task and not pd.isna(task['flight_time_min']):
+            if 'flight_time_min' in task and not _is_missing(task['flight_time_min']):
                 flight_times.append(task['flight_time_min'])
 
         # Plot
@@ -1203,25 +2040,22 @@ class MedicalDroneDelivery:
         plt.tight_layout()
 
         # Save image
-        plt.savefig('flight_time_vs_payload.png', dpi=300, bbox_inches='tight')
+        plt.savefig(file_path, dpi=dpi, bbox_inches='tight')
         plt.close()
 
-        return 'flight_time_vs_payload.png'
+        return file_path
 
-    def plot_thrust_ratio_vs_payload(self):
+    def plot_thrust_ratio_vs_payload(self, file_path='thrust_ratio_vs_payload.png', dpi=300):
         """Plot thrust ratio vs payload"""
+        plt = _pyplot()
         plt.figure(figsize=(10, 6))
 
         # Extract data
-        payloads = []
-        thrust_ratios = []
-        for task in self.delivery_tasks:
-            if task['status'] != 'completed':
-                continue
-            if 'payload_kg' in task and not pd.isna(task['payload_kg']):
-                payloads.append(task['payload_kg'])
-            if 'thrust_ratio' in task and not pd.isna(task['thrust_ratio']):
-                thrust_ratios.append(task['thrust_ratio'])
+        payloads = [task['payload_kg'] for task in self.delivery_tasks
+                    if task['status'] == 'completed' and not _is_missing(task.get('payload_kg'))]
+
+        # Look up thrust ratios from the flight data table
+        thrust_ratios = self.flight_table.thrust_ratio_batch(payloads).tolist()
 
         # Plot
         if payloads and thrust_ratios and len(payloads) == len(thrust_ratios):
@@ -1250,23 +2084,25 @@ class MedicalDroneDelivery:
         plt.tight_layout()
 
         # Save image
-        plt.savefig('thrust_ratio_vs_payload.png', dpi=300, bbox_inches='tight')
+        plt.savefig(file_path, dpi=dpi, bbox_inches='tight')
         plt.close()
 
-        return 'thrust_ratio_vs_payload.png'
+        return file_path
+
+    def stream_logs(self, file_path='delivery_logs.jsonl', keep=False):
+        """
+        Write log entries to file while the simulation runs (.csv, .jsonl or .parquet)
+        :param file_path: Output path
+        :param keep: Also keep written entries in memory
+        """
+        self.log.stream_to(file_path, keep)
+        print(f"Streaming logs to: {file_path}")
 
     def export_logs(self, file_path='delivery_logs.json'):
-        """Export logs to file"""
+        """Export logs held in memory to file (.json, .jsonl, .csv or .parquet), chunk by chunk"""
         try:
-            # Convert datetime
-            log_data = []
-            for entry in self.log:
-                entry_copy = entry.copy()
-                entry_copy['time'] = entry_copy['time'].isoformat()
-                log_data.append(entry_copy)
-
-            with open(file_path, 'w') as f:
-                json.dump(log_data, f, indent=2)
+            self.log.close()
+            self.log.export(file_path)
             print(f"Logs exported to: {file_path}")
             return True
         except Exception as e:
@@ -1277,6 +2113,7 @@ class MedicalDroneDelivery:
         """Run entire simulation"""
         print("Starting simulation...")
         self.current_time = datetime.now()
+        self.start_time = self.current_time
 
         # Initialize drones
         self.initialize_drones(num_drones_per_center=2)
@@ -1293,16 +2130,14 @@ class MedicalDroneDelivery:
         print("\nPerformance metrics:")
         for k, v in self.performance_metrics.items():
             print(f"{k}: {v}")
+        for stats in self.charging_queue_summary():
+            print(f"Charging {stats['station']}: {stats['sessions']} sessions, "
+                  f"mean wait {stats['mean_wait']:.1f} min, utilisation {stats['utilisation']:.0%}")
 
         # Generate visuals
-        print("\nGenerating visualizations...")
-        self.create_delivery_map().save('delivery_map.html')
-        self.plot_energy_consumption()
-        self.plot_time_statistics()
-        self.plot_battery_cycles()
-        self.plot_performance_metrics()
-        self.plot_flight_time_vs_payload()
-        self.plot_thrust_ratio_vs_payload()
+        if self.report_figures:
+            print("\nGenerating visualizations...")
+            self.generate_report()
 
         # Export logs
         self.export_logs()
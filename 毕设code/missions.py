@@ -0,0 +1,93 @@
+import numpy as np
+
+# Flight segment: (from location id, to location id, distance km)
+SEGMENT_DTYPE = np.dtype([('from_id', np.int32), ('to_id', np.int32), ('distance', np.float64)])
+
+# Mission table row: segment plus what kind of leg it is
+MISSION_DTYPE = np.dtype([('from_id', np.int32), ('to_id', np.int32), ('distance', np.float64),
+                          ('kind', np.int8)])
+
+# Mission kinds
+MISSION_FLIGHT = 0  # Planned delivery leg
+MISSION_RETURN = 1  # Leg back to the charge station
+MISSION_DEPART = 2  # Leg out of the charge station
+
+# Special location ids (real locations are indices into a name list, >= 0)
+CHARGE_STATION_ID = -1
+
+
+def charge_spot_id(number):
+    """Location id of "Charge spot <number>" (number starts at 1)"""
+    return CHARGE_STATION_ID - number
+
+
+def location_name(location_id, location_names):
+    """
+    Display name for a location id
+    :param location_id: Location id
+    :param location_names: Names of real locations, indexed by id
+    :return: Name
+    """
+    if location_id == CHARGE_STATION_ID:
+        return "Charge station"
+    if location_id < CHARGE_STATION_ID:
+        return f"Charge spot {CHARGE_STATION_ID - location_id}"
+    return location_names[location_id]
+
+
+def make_segments(rows):
+    """Build a segment array from (from_id, to_id, distance) rows"""
+    return np.array([tuple(row) for row in rows], dtype=SEGMENT_DTYPE)
+
+
+def segments_from_paths(segment_distances_list, location_names):
+    """
+    Convert path planner output into one segment array
+    :param segment_distances_list: Per start point, list of (loc1, loc2, distance)
+    :param location_names: Names of real locations, indexed by id
+    :return: Segment array (SEGMENT_DTYPE)
+    """
+    ids = {name: i for i, name in enumerate(location_names)}
+    return make_segments((ids[loc1], ids[loc2], distance)
+                         for segments in segment_distances_list
+                         for loc1, loc2, distance in segments)
+
+
+def parse_mission_strings(flight_missions):
+    """
+    Parse legacy "A -> B: 1.23 km" strings
+    :param flight_missions: List of mission strings
+    :return: (segment array, location_names)
+    """
+    location_names = []
+    ids = {}
+
+    def lookup(name):
+        if name == "Charge station":
+            return CHARGE_STATION_ID
+        if name.startswith("Charge spot "):
+            return charge_spot_id(int(name[len("Charge spot "):]))
+        if name not in ids:
+            ids[name] = len(location_names)
+            location_names.append(name)
+        return ids[name]
+
+    rows = []
+    for mission in flight_missions:
+        start, rest = mission.split(" -> ", 1)
+        end, distance = rest.rsplit(":", 1)
+        rows.append((lookup(start.strip()), lookup(end.strip()), float(distance.split("km")[0])))
+    return make_segments(rows), location_names
+
+
+def format_missions(missions, location_names):
+    """
+    Human-readable mission strings (for output only)
+    :param missions: Segment or mission array
+    :param location_names: Names of real locations, indexed by id
+    :return: List of "A -> B: 1.23 km" strings
+    """
+    return [f"{location_name(from_id, location_names)} -> {location_name(to_id, location_names)}: "
+            f"{distance:.2f} km"
+            for from_id, to_id, distance in zip(missions['from_id'].tolist(), missions['to_id'].tolist(),
+                                                missions['distance'].tolist())]
@@ -0,0 +1,197 @@
+import argparse
+import contextlib
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from wind import ConstantWind
+
+# Metrics aggregated over replications
+REPLICATION_METRICS = ['total_time', 'total_energy', 'makespan', 'success_rate', 'abort_rate', 'battery_cycles',
+                       'battery_swaps', 'safe_margin_violations', 'transfer_count', 'charge_wait_time', 'tasks',
+                       'temperature', 'wind_speed']
+
+
+def replication_seeds(base_seed, n):
+    """
+    Independent seeds for n replications (NumPy SeedSequence spawning)
+    :param base_seed: Seed of the whole experiment
+    :param n: Number of replications
+    :return: List of integer seeds
+    """
+    children = np.random.SeedSequence(base_seed).spawn(n)
+    return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in children]
+
+
+def randomise_scenario(delivery_system, rng, demand_scale=1.0, payload_sigma=0.25, temperature_range=(5, 30),
+                       max_wind_speed=8.0):
+    """
+    Replace the demand and weather of a loaded scenario with random draws
+    :param delivery_system: MedicalDroneDelivery with data imported (its tasks are the templates)
+    :param rng: numpy Generator
+    :param demand_scale: Mean number of tasks as a multiple of the template count (Poisson)
+    :param payload_sigma: Log-normal spread of the payload around the template payload
+    :param temperature_range: (low, high) ambient temperature (°C), uniform
+    :param max_wind_speed: Upper bound of the uniform wind speed (m/s), random direction
+    :return: dict with the drawn task count, temperature and wind speed
+    """
+    templates = list(delivery_system.delivery_tasks)
+    if not templates:
+        raise ValueError("Scenario has no tasks to sample demand from")
+    delivery_system.delivery_tasks = []
+    delivery_system.task_queue = []
+
+    # Demand: Poisson task count, tasks drawn from the templates with a random payload
+    count = int(rng.poisson(len(templates) * demand_scale))
+    for k in rng.integers(len(templates), size=count):
+        template = templates[k]
+        payload = template['payload_kg'] * rng.lognormal(0.0, payload_sigma)
+        payload = float(np.clip(payload, 0.1, delivery_system.max_payload_kg))
+        delivery_system.add_delivery_task(delivery_system.distribution_centers.index(template['from']),
+                                          delivery_system.hospitals.index(template['to']),
+                                          payload, template['material_type'], template['priority'])
+
+    # Weather
+    delivery_system.temperature = float(rng.uniform(*temperature_range))
+    wind_speed = float(rng.uniform(0.0, max_wind_speed))
+    direction = rng.uniform(0.0, 2 * np.pi)
+    delivery_system.set_wind_field(ConstantWind(wind_speed * np.sin(direction), wind_speed * np.cos(direction)))
+
+    return {'tasks': count, 'temperature': delivery_system.temperature, 'wind_speed': wind_speed}
+
+
+def run_replication(config):
+    """
+    Run one randomised replication (worker entry point, prints nothing)
+    :param config: dict with 'seed', 'strategy', 'drones_per_center' and randomise_scenario options
+    :return: Metrics dict (see REPLICATION_METRICS); the log is discarded
+    """
+    # Imported here so workers only pay for what they use
+    from medical_delivery import MedicalDroneDelivery
+
+    config = dict(config)
+    seed = config.pop('seed')
+    strategy = config.pop('strategy', 'C')
+    drones_per_center = config.pop('drones_per_center', 2)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        delivery_system = MedicalDroneDelivery()
+        delivery_system.set_seed(seed)
+        delivery_system.import_data()
+        drawn = randomise_scenario(delivery_system, np.random.default_rng(seed), **config)
+        delivery_system.set_energy_strategy(strategy)
+        delivery_system.initialize_drones(num_drones_per_center=drones_per_center)
+        delivery_system.schedule_tasks()
+        metrics = dict(delivery_system.calculate_performance_metrics())
+
+    metrics.update(drawn)
+    return {name: float(metrics.get(name, 0)) for name in REPLICATION_METRICS}
+
+
+class RunningStats:
+    """
+    Streaming mean and variance per metric (Welford), so replications can be
+    aggregated without keeping their results.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = {}
+        self._m2 = {}
+
+    def update(self, values):
+        """Add one replication (dict of metric -> value)"""
+        self.count += 1
+        for name, value in values.items():
+            mean = self.mean.get(name, 0.0)
+            delta = value - mean
+            mean += delta / self.count
+            self._m2[name] = self._m2.get(name, 0.0) + delta * (value - mean)
+            self.mean[name] = mean
+
+    def std(self, name):
+        """Sample standard deviation"""
+        return math.sqrt(self._m2[name] / (self.count - 1)) if self.count > 1 else 0.0
+
+    def confidence_interval(self, name, level=0.95):
+        """
+        Confidence interval of the mean (Student t; normal if SciPy is missing)
+        :return: (low, high)
+        """
+        mean = self.mean[name]
+        if self.count < 2:
+            return mean, mean
+        try:
+            from scipy import stats
+            critical = float(stats.t.ppf(0.5 + level / 2, self.count - 1))
+        except ImportError:
+            critical = float(np.sqrt(2) * _erfinv(level))
+        half_width = critical * self.std(name) / math.sqrt(self.count)
+        return mean - half_width, mean + half_width
+
+    def summary(self, level=0.95):
+        """dict of metric -> {'mean', 'std', 'ci_low', 'ci_high', 'n'}"""
+        result = {}
+        for name in self.mean:
+            low, high = self.confidence_interval(name, level)
+            result[name] = {'mean': self.mean[name], 'std': self.std(name), 'ci_low': low, 'ci_high': high,
+                            'n': self.count}
+        return result
+
+
+def _erfinv(y, iterations=60):
+    # Inverse error function by bisection (only used without SciPy)
+    low, high = 0.0, 6.0
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        if math.erf(mid) < y:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+def run_replications(n, base_seed=0, workers=None, strategy='C', drones_per_center=2, level=0.95,
+                     chunksize=4, **scenario):
+    """
+    Run n independent replications and aggregate their metrics
+    :param n: Number of replications
+    :param base_seed: Experiment seed; replication seeds are spawned from it
+    :param workers: Process count (None = CPU count, 1 = run in this process)
+    :param strategy: Energy strategy letter
+    :param drones_per_center: Drones at each distribution center
+    :param level: Confidence level
+    :param chunksize: Replications handed to a worker at a time
+    :param scenario: Options for randomise_scenario
+    :return: Summary dict (see RunningStats.summary)
+    """
+    configs = ({'seed': seed, 'strategy': strategy, 'drones_per_center': drones_per_center, **scenario}
+               for seed in replication_seeds(base_seed, n))
+    stats = RunningStats()
+    if workers == 1:
+        for config in configs:
+            stats.update(run_replication(config))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for metrics in pool.map(run_replication, configs, chunksize=chunksize):
+                stats.update(metrics)
+    return stats.summary(level)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo replications of the medical delivery simulation")
+    parser.add_argument('-n', '--replications', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--strategy', default='C', choices=['A', 'B', 'C', 'D'])
+    parser.add_argument('--drones', type=int, default=2, help="Drones per distribution center")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--level', type=float, default=0.95, help="Confidence level")
+    args = parser.parse_args()
+
+    summary = run_replications(args.replications, args.seed, args.workers, args.strategy, args.drones,
+                               args.level)
+    print(f"{'Metric':<24}{'Mean':>12}{'Std':>12}{'CI low':>12}{'CI high':>12}")
+    for name, row in summary.items():
+        print(f"{name:<24}{row['mean']:>12.3f}{row['std']:>12.3f}{row['ci_low']:>12.3f}{row['ci_high']:>12.3f}")
@@ -3,30 +3,14 @@ import numpy as np
 import matplotlib as mpl
 from matplotlib.colors import LinearSegmentedColormap
 
+from gross_weight import TEMPERATURES, ALTITUDES, WEIGHT_DATA
+
 # Data preparation from the image
-temperatures = [0, 10, 20, 30, 40, 50]  # Temperature (°C)
-altitudes = [0, 1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000,
-             9000, 10000, 11000, 12000, 13000, 14000, 15000]  # Altitude (ft)
+temperatures = TEMPERATURES  # Temperature (°C)
+altitudes = ALTITUDES  # Altitude (ft)
 
 # Maximum Gross Weight data (kg) from the image
-weight_data = np.array([
-    [15.1, 15.1, 15.1, 14.4, 13.3, 12.3],
-    [15.1, 15.1, 14.3, 13.2, 12.1, 11.1],
-    [15.1, 14.2, 13.1, 12.0, 11.0, 10.0],
-    [14.2, 13.0, 11.9, 10.8, 9.9, 8.9],
-    [13.0, 11.8, 10.7, 9.7, 8.8, 7.9],
-    [11.8, 10.6, 9.6, 8.6, 7.7, 6.9],
-    [10.6, 9.5, 8.5, 7.6, 6.7, 5.9],
-    [9.5, 8.4, 7.5, 6.6, 5.7, 4.9],
-    [8.4, 7.4, 6.5, 5.6, 4.8, 4.0],
-    [7.3, 6.4, 5.5, 4.6, 3.9, 3.1],
-    [6.3, 5.4, 4.5, 3.7, 3.0, 2.2],
-    [5.3, 4.4, 3.6, 2.8, 2.1, 1.4],
-    [4.3, 3.5, 2.7, 1.9, 1.2, 0.6],
-    [3.4, 2.6, 1.8, 1.1, 0.4, -0.2],
-    [2.5, 1.7, 1.0, 0.3, -0.4, -1.0],
-    [1.6, 0.9, 0.1, -0.5, -1.1, -1.7]
-])
+weight_data = np.array(WEIGHT_DATA)
 
 # Create meshgrid boundaries
 T_bound = np.arange(0, 61, 10)  # Temperature boundaries 0-60°C
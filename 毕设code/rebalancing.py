@@ -0,0 +1,51 @@
+import numpy as np
+
+# Min-cost flow needs integer costs: minutes are scaled by this factor
+COST_SCALE = 100
+
+
+def rebalance_plan(idle, pending, cost):
+    """
+    Drone moves between bases that cover as much queued demand as possible at least cost
+
+    Solved as a min-cost maximum flow: bases with more idle drones than
+    pending tasks supply drones, bases with more pending tasks than idle drones
+    demand them. Demand that no allowed move can reach is left unmet.
+    :param idle: Idle drones per base
+    :param pending: Pending tasks per base
+    :param cost: (bases, bases) cost of one move (min), np.inf where not allowed
+    :return: List of (from base, to base, drone count)
+    """
+    idle = np.asarray(idle, dtype=np.int64)
+    pending = np.asarray(pending, dtype=np.int64)
+    cost = np.asarray(cost, dtype=np.float64)
+    surplus = np.maximum(idle - pending, 0)
+    deficit = np.maximum(pending - idle, 0)
+    if not surplus.any() or not deficit.any():
+        return []
+
+    # Only deficits that some surplus base can reach can be served
+    sources = np.flatnonzero(surplus)
+    sinks = np.flatnonzero(deficit)
+    reachable = np.isfinite(cost[np.ix_(sources, sinks)])
+    if not reachable.any():
+        return []
+
+    # Source -> surplus bases -> deficit bases -> sink; max flow at min cost
+    import networkx as nx  # only loaded once a rebalance is actually needed
+    graph = nx.DiGraph()
+    for base in sources:
+        graph.add_edge('source', ('base', int(base)), capacity=int(surplus[base]), weight=0)
+    for base in sinks:
+        graph.add_edge(('need', int(base)), 'sink', capacity=int(deficit[base]), weight=0)
+    for i, j in zip(*np.nonzero(reachable)):
+        graph.add_edge(('base', int(sources[i])), ('need', int(sinks[j])),
+                       weight=int(round(cost[sources[i], sinks[j]] * COST_SCALE)))
+    flow = nx.max_flow_min_cost(graph, 'source', 'sink')
+
+    moves = []
+    for base in sources:
+        for target, count in flow[('base', int(base))].items():
+            if count > 0:
+                moves.append((int(base), target[1], int(count)))
+    return moves
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Figures of the report: name -> (MedicalDroneDelivery method, output file)
+FIGURES = {
+    'map': ('create_delivery_map', 'delivery_map.html'),
+    'energy': ('plot_energy_consumption', 'energy_consumption.png'),
+    'time': ('plot_time_statistics', 'time_statistics.png'),
+    'battery': ('plot_battery_cycles', 'battery_cycles.png'),
+    'performance': ('plot_performance_metrics', 'performance_metrics.png'),
+    'flight_time': ('plot_flight_time_vs_payload', 'flight_time_vs_payload.png'),
+    'thrust': ('plot_thrust_ratio_vs_payload', 'thrust_ratio_vs_payload.png')
+}
+
+# Resolution of final and draft PNGs
+FINAL_DPI = 300
+DRAFT_DPI = 72
+
+# Input hashes of the figures last written to a directory
+HASH_FILE = '.figure_hashes.json'
+
+
+def figure_inputs(delivery_system, name):
+    """
+    The data a figure is drawn from (what its hash covers)
+    :param delivery_system: MedicalDroneDelivery after a run
+    :param name: Figure name (see FIGURES)
+    :return: JSON-serialisable data
+    """
+    completed = [task for task in delivery_system.delivery_tasks if task['status'] == 'completed']
+    if name == 'map':
+        return {'centers': [c['position'] for c in delivery_system.distribution_centers],
+                'hospitals': [h['position'] for h in delivery_system.hospitals],
+                'obstacles': delivery_system.obstacles,
+                'roads': sorted(delivery_system.road_edges),
+                'tasks': [(t['from']['name'], t['to']['name'], t['payload_kg']) for t in completed]}
+    if name == 'energy':
+        return [(t.get('material_type'), t.get('energy_used')) for t in completed]
+    if name == 'time':
+        return [(t.get('flight_time_min'), t['to'].get('service_time')) for t in completed]
+    if name == 'battery':
+        return [(drone['id'], drone['battery_cycles']) for drone in delivery_system.drones]
+    if name == 'performance':
+        return dict(delivery_system.calculate_performance_metrics())
+    if name == 'flight_time':
+        return [(t.get('payload_kg'), t.get('flight_time_min')) for t in completed]
+    if name == 'thrust':
+        return [t.get('payload_kg') for t in completed]
+    raise ValueError(f"Unknown figure: {name}")
+
+
+def figure_hash(delivery_system, name, dpi):
+    """SHA-256 of a figure's inputs and resolution"""
+    data = json.dumps([name, dpi, figure_inputs(delivery_system, name)], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def render_figure(delivery_system, name, output_dir='.', dpi=FINAL_DPI):
+    """
+    Draw one figure to its file
+    :return: File path
+    """
+    method, file_name = FIGURES[name]
+    file_path = os.path.join(output_dir, file_name)
+    if name == 'map':
+        delivery_system.create_delivery_map().save(file_path)
+        return file_path
+    return getattr(delivery_system, method)(file_path, dpi)
+
+
+# Worker state: the snapshot is sent once per process, not once per figure
+_worker_system = None
+
+
+def _init_worker(snapshot):
+    global _worker_system
+    import matplotlib
+    matplotlib.use('Agg')
+    _worker_system = snapshot
+
+
+def _render_in_worker(name, output_dir, dpi):
+    return render_figure(_worker_system, name, output_dir, dpi)
+
+
+def report_snapshot(delivery_system):
+    """
+    Copy of a finished simulation with only what the figures read, for worker processes
+    (the event engine, demand stream and log stay behind; the log may hold an open stream)
+    """
+    snapshot = object.__new__(type(delivery_system))
+    snapshot.__dict__.update(delivery_system.__dict__)
+    snapshot.engine = None
+    snapshot.demand = None
+    snapshot.log = None
+    return snapshot
+
+
+def render_report(delivery_system, figures=None, output_dir='.', draft=False, workers=None, force=False):
+    """
+    Render report figures, in parallel, skipping those whose inputs have not changed
+    :param delivery_system: MedicalDroneDelivery after a run
+    :param figures: Figure names (None = all, see FIGURES)
+    :param output_dir: Directory for the files and the hash record
+    :param draft: Draft resolution (DRAFT_DPI instead of FINAL_DPI)
+    :param workers: Process count (None = one per figure up to the CPU count, 1 = in this process)
+    :param force: Render even when the inputs are unchanged
+    :return: (rendered file paths, skipped figure names)
+    """
+    figures = list(FIGURES) if figures is None else list(figures)
+    unknown = [name for name in figures if name not in FIGURES]
+    if unknown:
+        raise ValueError(f"Unknown figures: {unknown}")
+    dpi = DRAFT_DPI if draft else FINAL_DPI
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Figures whose file exists and whose inputs hash the same as last time are skipped
+    hash_path = os.path.join(output_dir, HASH_FILE)
+    try:
+        with open(hash_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    hashes = {name: figure_hash(delivery_system, name, dpi) for name in figures}
+    skipped = [name for name in figures if not force and previous.get(name) == hashes[name]
+               and os.path.exists(os.path.join(output_dir, FIGURES[name][1]))]
+    pending = [name for name in figures if name not in skipped]
+
+    rendered = []
+    if pending:
+        if workers == 1 or len(pending) == 1:
+            rendered = [render_figure(delivery_system, name, output_dir, dpi) for name in pending]
+        else:
+            workers = min(workers or os.cpu_count() or 1, len(pending))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(report_snapshot(delivery_system),)) as pool:
+                futures = [pool.submit(_render_in_worker, name, output_dir, dpi) for name in pending]
+                rendered = [future.result() for future in futures]
+
+    previous.update({name: hashes[name] for name in pending})
+    with open(hash_path, 'w', encoding='utf-8') as f:
+        json.dump(previous, f, indent=2)
+    return rendered, skipped
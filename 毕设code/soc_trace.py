@@ -0,0 +1,86 @@
+import numpy as np
+
+# Column layout of a trace sample
+TRACE_COLUMNS = ('time_min', 'drone_id', 'soc', 'lat', 'lon')
+
+
+class SocTraceRecorder:
+    """
+    Append-only state-of-charge trace stored in one float32 array.
+
+    Each sample is (time in minutes, integer drone id, SOC %, lat, lon). The
+    buffer is preallocated and doubles in size when full, so appending is
+    amortised O(1) and a sample costs 20 bytes.
+    """
+
+    def __init__(self, capacity=4096):
+        self._data = np.empty((max(int(capacity), 1), len(TRACE_COLUMNS)), dtype=np.float32)
+        self._size = 0
+        self.drone_names = {}
+
+    def __len__(self):
+        return self._size
+
+    def record(self, time_min, drone_id, soc, lat=np.nan, lon=np.nan):
+        """
+        Append one sample
+        :param time_min: Simulation time (minutes)
+        :param drone_id: Integer drone id
+        :param soc: State of charge (%)
+        :param lat: Latitude (NaN if unknown)
+        :param lon: Longitude (NaN if unknown)
+        """
+        if self._size == len(self._data):
+            self._grow()
+        self._data[self._size] = (time_min, drone_id, soc, lat, lon)
+        self._size += 1
+
+    def _grow(self):
+        data = np.empty((len(self._data) * 2, len(TRACE_COLUMNS)), dtype=np.float32)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+    def set_drone_name(self, drone_id, name):
+        """Attach a display name to an integer drone id"""
+        self.drone_names[int(drone_id)] = name
+
+    @property
+    def samples(self):
+        """View of the recorded samples, shape (n, 5)"""
+        return self._data[:self._size]
+
+    def column(self, name):
+        """View of one column by name (see TRACE_COLUMNS)"""
+        return self.samples[:, TRACE_COLUMNS.index(name)]
+
+    def series(self, drone_id):
+        """
+        SOC curve of one drone
+        :param drone_id: Integer drone id
+        :return: (time_min, soc) arrays
+        """
+        samples = self.samples
+        mask = samples[:, 1] == drone_id
+        return samples[mask, 0], samples[mask, 2]
+
+    def to_npz(self, file_path='soc_trace.npz'):
+        """Export the trace as a compressed .npz file (one array per column)"""
+        samples = self.samples
+        arrays = {name: samples[:, i] for i, name in enumerate(TRACE_COLUMNS)}
+        ids = sorted(self.drone_names)
+        arrays['name_ids'] = np.array(ids, dtype=np.int32)
+        arrays['names'] = np.array([self.drone_names[i] for i in ids], dtype=str)
+        np.savez_compressed(file_path, **arrays)
+        return file_path
+
+    @classmethod
+    def from_npz(cls, file_path):
+        """Load a trace written by ``to_npz``"""
+        with np.load(file_path) as data:
+            columns = [data[name] for name in TRACE_COLUMNS]
+            recorder = cls(capacity=len(columns[0]))
+            recorder._data[:len(columns[0])] = np.column_stack(columns)
+            recorder._size = len(columns[0])
+            for drone_id, name in zip(data['name_ids'], data['names']):
+                recorder.drone_names[int(drone_id)] = str(name)
+        return recorder
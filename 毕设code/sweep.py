@@ -0,0 +1,243 @@
+import argparse
+import contextlib
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from Distance_calculate import calculate_distance, LOCATION_NAMES
+from Astart import optimize_paths as optimize_path_Astart
+from Dijkstra import optimize_paths as optimize_path_Dijkstra
+from Charge import charge_simulation, CHARGE_STRATEGIES
+from temdecrease import battery_degradation
+from gross_weight import DEFAULT_ALTITUDE_FT
+from missions import segments_from_paths
+
+# Path planning algorithms by name
+PATH_ALGORITHMS = {
+    'astar': optimize_path_Astart,
+    'dijkstra': optimize_path_Dijkstra
+}
+
+# Columns of metrics.csv
+METRIC_COLUMNS = ['run_id', 'algorithm', 'strategy', 'temperature', 'payload', 'targets', 'tasks',
+                  'flight_time_min', 'energy_ah', 'segments', 'distance_km', 'charge_stops', 'error']
+
+
+@lru_cache(maxsize=None)
+def _distance(loc1, loc2):
+    # Cached per process: the location database is rebuilt on every calculate_distance call
+    return calculate_distance(loc1, loc2)
+
+
+def _payload_points(ids, payload, kind):
+    """(id, kg) pairs; payload is a number for every point or a (targets kg, tasks kg) pair"""
+    if isinstance(payload, (tuple, list)):
+        payload = payload[0] if kind == 'target' else payload[1]
+    return [(point_id, float(payload)) for point_id in ids]
+
+
+def run_scenario(targets, tasks, algorithm='astar', charge_strategy='A', temperature=25.0,
+                 altitude_ft=DEFAULT_ALTITUDE_FT, **charge_kwargs):
+    """
+    Plan paths and simulate charging for one configuration (no GUI, no printing of its own)
+    :param targets: List of (target id, payload kg)
+    :param tasks: List of (task id, payload kg)
+    :param algorithm: 'astar' or 'dijkstra'
+    :param charge_strategy: Strategy letter or name (see Charge.CHARGE_STRATEGIES)
+    :param temperature: Ambient temperature (°C)
+    :param altitude_ft: Pressure altitude (ft)
+    :param charge_kwargs: Extra keyword arguments for charge_simulation
+    :return: dict with missions, location names and metrics
+    """
+    if algorithm not in PATH_ALGORITHMS:
+        raise ValueError(f"Unknown path algorithm: {algorithm}")
+    target_names = [LOCATION_NAMES['target'][target_id] for target_id, _ in targets]
+    task_names = [LOCATION_NAMES['task'][task_id] for task_id, _ in tasks]
+    all_points = target_names + task_names
+
+    distance_matrix = {}
+    for i, loc1 in enumerate(all_points):
+        for loc2 in all_points[i + 1:]:
+            distance = _distance(loc1, loc2)
+            distance_matrix[(loc1, loc2)] = distance
+            distance_matrix[(loc2, loc1)] = distance
+
+    paths, total_distances, segment_distances_list = PATH_ALGORITHMS[algorithm](target_names, task_names,
+                                                                                distance_matrix)
+    flight_missions = segments_from_paths(segment_distances_list, all_points)
+    charge_kwargs.setdefault('charging_stations', list(range(len(target_names))))
+    missions, total_time, total_energy, total_segments, charge_stops = charge_simulation(
+        flight_missions, charge_strategy, battery_degradation(temperature), targets, tasks,
+        temperature=temperature, altitude_ft=altitude_ft, location_names=all_points, **charge_kwargs)
+
+    return {
+        'paths': paths,
+        'location_names': all_points,
+        'missions': missions,
+        'flight_time_min': float(total_time),
+        'energy_ah': float(total_energy),
+        'segments': int(total_segments),
+        'distance_km': float(sum(total_distances)),
+        'charge_stops': int(charge_stops)
+    }
+
+
+def sweep_grid(algorithms=('astar', 'dijkstra'), strategies=None, temperatures=(25.0,), payloads=(1.0,),
+               target_subsets=((1, 2, 3),), task_subsets=(tuple(range(1, 10)),)):
+    """
+    Cartesian product of sweep parameters
+    :param algorithms: Path algorithm names
+    :param strategies: Charge strategy letters (default: every registered strategy)
+    :param temperatures: Temperatures (°C)
+    :param payloads: Payload per point (kg), or (target kg, task kg) pairs
+    :param target_subsets: Tuples of target ids
+    :param task_subsets: Tuples of task ids
+    :return: List of configuration dicts
+    """
+    if strategies is None:
+        strategies = list(CHARGE_STRATEGIES)
+    grid = itertools.product(algorithms, strategies, temperatures, payloads, target_subsets, task_subsets)
+    return [{'run_id': run_id, 'algorithm': algorithm, 'strategy': strategy, 'temperature': temperature,
+             'payload': payload, 'targets': tuple(targets), 'tasks': tuple(tasks)}
+            for run_id, (algorithm, strategy, temperature, payload, targets, tasks) in enumerate(grid)]
+
+
+def run_configuration(config):
+    """
+    Run one sweep configuration
+    :param config: Configuration dict from sweep_grid
+    :return: Metrics row (dict with METRIC_COLUMNS); failures are reported in 'error'
+    """
+    row = {column: '' for column in METRIC_COLUMNS}
+    row.update({
+        'run_id': config['run_id'],
+        'algorithm': config['algorithm'],
+        'strategy': config['strategy'],
+        'temperature': config['temperature'],
+        'payload': config['payload'],
+        'targets': ';'.join(map(str, config['targets'])),
+        'tasks': ';'.join(map(str, config['tasks']))
+    })
+    try:
+        result = run_scenario(_payload_points(config['targets'], config['payload'], 'target'),
+                              _payload_points(config['tasks'], config['payload'], 'task'),
+                              config['algorithm'], config['strategy'], config['temperature'])
+        for column in ('flight_time_min', 'energy_ah', 'segments', 'distance_km', 'charge_stops'):
+            row[column] = result[column]
+    except Exception as e:
+        row['error'] = str(e)
+    return row
+
+
+def _run_batch(configs):
+    # Worker entry point; planners and the flight simulator print a lot
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return [run_configuration(config) for config in configs]
+
+
+class MetricsWriter:
+    """
+    Streams metric rows to CSV, or to Parquet when the path ends in .parquet
+    (Parquet output needs pyarrow). Rows are flushed as they arrive.
+    """
+
+    def __init__(self, file_path, columns=METRIC_COLUMNS, batch_rows=256):
+        self.file_path = file_path
+        self.columns = list(columns)
+        self.batch_rows = batch_rows
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.parquet = file_path.endswith('.parquet')
+        self._pending = []
+        self._writer = None
+        if self.parquet:
+            import pyarrow
+            import pyarrow.parquet
+            self._pa = pyarrow
+            self._file = None
+        else:
+            self._file = open(file_path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=self.columns)
+            self._writer.writeheader()
+
+    def write(self, rows):
+        """Append rows (list of dicts)"""
+        if not self.parquet:
+            self._writer.writerows(rows)
+            self._file.flush()
+            return
+        self._pending.extend(rows)
+        if len(self._pending) >= self.batch_rows:
+            self._flush_parquet()
+
+    def _flush_parquet(self):
+        if not self._pending:
+            return
+        table = self._pa.Table.from_pylist(
+            [{column: str(row[column]) if column in ('payload', 'error') else row[column] for column in self.columns}
+             for row in self._pending])
+        if self._writer is None:
+            self._writer = self._pa.parquet.ParquetWriter(self.file_path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+        self._pending = []
+
+    def close(self):
+        if self.parquet:
+            self._flush_parquet()
+            if self._writer is not None:
+                self._writer.close()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def run_sweep(configs, file_path='results/metrics.csv', workers=None, batch_size=8):
+    """
+    Execute configurations in a process pool and stream rows to file as they finish
+    :param configs: Configuration dicts (see sweep_grid)
+    :param file_path: Output .csv or .parquet path
+    :param workers: Process count (None = CPU count, 1 = run in this process)
+    :param batch_size: Configurations per worker task
+    :return: Number of rows written
+    """
+    batches = [configs[i:i + batch_size] for i in range(0, len(configs), batch_size)]
+    written = 0
+    with MetricsWriter(file_path) as writer:
+        if workers == 1:
+            for batch in batches:
+                writer.write(_run_batch(batch))
+                written += len(batch)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_run_batch, batch) for batch in batches]
+                for future in as_completed(futures):
+                    rows = future.result()
+                    writer.write(rows)
+                    written += len(rows)
+                    print(f"Completed {written}/{len(configs)} configurations")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Strategy x algorithm x temperature sweep")
+    parser.add_argument('--algorithms', nargs='+', default=list(PATH_ALGORITHMS), choices=list(PATH_ALGORITHMS))
+    parser.add_argument('--strategies', nargs='+', default=None, help="Charge strategy letters (default: all)")
+    parser.add_argument('--temperatures', nargs='+', type=float, default=[0.0, 10.0, 25.0, 40.0])
+    parser.add_argument('--payloads', nargs='+', type=float, default=[1.0, 2.0, 5.0])
+    parser.add_argument('--out', default=os.path.join('..', 'results', 'metrics.csv'),
+                        help="Output .csv or .parquet file")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    grid = sweep_grid(args.algorithms, args.strategies, args.temperatures, args.payloads)
+    count = run_sweep(grid, args.out, args.workers)
+    print(f"Wrote {count} rows to {args.out}")
@@ -0,0 +1,132 @@
+import contextlib
+import os
+
+import numpy as np
+
+from Charge import CHARGE_RESERVE
+from charging_queue import ChargingStation
+from demand import DemandStream
+from medical_delivery import MedicalDroneDelivery
+from soc_trace import SocTraceRecorder
+from sweep import run_scenario
+from wind import ConstantWind
+
+
+def quiet_delivery_system(drones_per_center=2, strategy='C'):
+    """Default scenario with drones, nothing printed"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        delivery_system = MedicalDroneDelivery()
+        delivery_system.set_seed(0)
+        delivery_system.import_data()
+        delivery_system.set_energy_strategy(strategy)
+        delivery_system.initialize_drones(num_drones_per_center=drones_per_center)
+    return delivery_system
+
+
+def run_quietly(function, *args, **kwargs):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return function(*args, **kwargs)
+
+
+def test_strong_wind_fails_tasks():
+    # A wind above the 40 km/h cruise airspeed makes some legs unflyable: those tasks fail, the run finishes
+    for scheduler in ('schedule_tasks', 'schedule_tasks_sequential'):
+        delivery_system = quiet_delivery_system()
+        delivery_system.set_wind_field(ConstantWind(12.0, 0.0))
+        run_quietly(getattr(delivery_system, scheduler))
+        statuses = [task['status'] for task in delivery_system.delivery_tasks]
+        assert 'failed' in statuses, scheduler
+        assert 'pending' not in statuses and 'in_progress' not in statuses, scheduler
+        assert any(entry['event'] == 'task_failed' and entry.get('reason') == 'wind'
+                   for entry in delivery_system.log), scheduler
+
+
+def test_rebalancing_with_demand_stream():
+    # All demand at one base: rebalancing keeps running through the stream and moves idle drones there
+    def run(rebalance_interval_min):
+        delivery_system = quiet_delivery_system()
+        delivery_system.delivery_tasks = []
+        delivery_system.task_queue = []
+        delivery_system.rebalance_interval_min = rebalance_interval_min
+        center = delivery_system.distribution_centers[0]['name']
+        sources = [{'from': center, 'to': hospital['name'], 'material_type': 'blood', 'priority': 'normal',
+                    'payload_kg': 2.0, 'rate_per_hour': 300 / 24 / len(delivery_system.hospitals)}
+                   for hospital in delivery_system.hospitals]
+        run_quietly(delivery_system.run_demand, DemandStream(sources, horizon_min=24 * 60, seed=1))
+        return delivery_system.performance_metrics
+
+    static, rebalanced = run(None), run(15)
+    assert static['repositions'] == 0
+    assert rebalanced['repositions'] > 0
+    assert rebalanced['makespan'] < static['makespan']
+
+
+def test_priority_charge_queue():
+    # One bay per base under contention: the 'priority' discipline cuts the wait of high-priority drones
+    def mean_waits(discipline):
+        delivery_system = quiet_delivery_system(drones_per_center=4, strategy='A')
+        run_quietly(delivery_system.set_charge_queue, discipline, 1)
+        delivery_system.delivery_tasks = []
+        delivery_system.task_queue = []
+        sources = [{'from': center['name'], 'to': hospital['name'], 'material_type': 'blood', 'priority': priority,
+                    'payload_kg': 2.0, 'rate_per_hour': rate}
+                   for center in delivery_system.distribution_centers for hospital in delivery_system.hospitals[:3]
+                   for priority, rate in (('high', 0.3), ('low', 0.9))]
+        run_quietly(delivery_system.run_demand, DemandStream(sources, horizon_min=24 * 60, seed=3))
+        sessions = [s for center in delivery_system.distribution_centers for s in center['charger'].sessions]
+        waits = {priority: np.mean([start - arrival for _, _, arrival, start, _, p in sessions if p == priority])
+                 for priority in (0, 2)}
+        return waits, delivery_system.performance_metrics['charge_wait_time']
+
+    fifo, fifo_total = mean_waits('fifo')
+    priority, priority_total = mean_waits('priority')
+    assert priority[0] < fifo[0]
+    assert priority[0] < priority[2]
+    assert fifo_total > 0 and priority_total > 0
+
+
+def test_charge_bay_handover_at_same_instant():
+    # B takes the bay at the instant A's charge ends, before A's release: the release must not free B's bay
+    station = ChargingStation('base', capacity=1)
+    station.arrive(0.0, 10.0, 'A')
+    station.arrive(10.0, 5.0, 'B')
+    assert station.release(10.0, 0) is None
+    assert station.arrive(12.0, 5.0, 'C') is None
+    assert station.release(15.0, 0)[:2] == (15.0, 20.0)
+    sessions = sorted(station.sessions, key=lambda s: s[3])
+    assert all(earlier[4] <= later[3] for earlier, later in zip(sessions, sessions[1:]))
+
+
+def test_battery_swaps_counted_once():
+    # Strategy D swaps before every task: one swap per completed task, in both schedulers
+    for scheduler in ('schedule_tasks', 'schedule_tasks_sequential'):
+        delivery_system = quiet_delivery_system(strategy='D')
+        run_quietly(getattr(delivery_system, scheduler))
+        swaps = sum(entry['event'] == 'battery_swap' for entry in delivery_system.log)
+        assert swaps > 0, scheduler
+        assert delivery_system.performance_metrics['battery_swaps'] == swaps, scheduler
+        assert sum(drone['battery_swaps'] for drone in delivery_system.drones) == swaps, scheduler
+
+
+def test_optimal_charge_plan_beats_reserve_keeping_strategies():
+    # Strategy E is the fastest of the plans that never land below the reserve (C may dip below it and be faster)
+    targets, tasks = (1, 2, 3), range(1, 10)
+    for temperature, payload in ((0, 0.5), (25, 5), (40, 5)):
+        runs = {}
+        for strategy in 'ABCE':
+            trace = SocTraceRecorder()
+            result = run_quietly(run_scenario, [(i, payload) for i in targets], [(i, payload) for i in tasks],
+                                 'astar', strategy, temperature, soc_trace=trace)
+            runs[strategy] = result['flight_time_min'], trace.column('soc').min()
+        optimal_time, optimal_soc = runs.pop('E')
+        assert optimal_soc >= CHARGE_RESERVE * 100
+        for strategy, (time_min, min_soc) in runs.items():
+            if min_soc >= CHARGE_RESERVE * 100:
+                assert optimal_time <= time_min + 1e-6, (temperature, payload, strategy)
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith('test_') and callable(check):
+            check()
+            print(f"{name}: ok")
@@ -0,0 +1,122 @@
+import numpy as np
+
+# m/s -> km/h
+MS_TO_KMH = 3.6
+
+
+class ConstantWind:
+    """Uniform wind (u: towards east, v: towards north, m/s)"""
+
+    def __init__(self, u=0.0, v=0.0):
+        self.u = float(u)
+        self.v = float(v)
+
+    def sample(self, lat, lon, hour=0.0):
+        """
+        Wind components at the given points
+        :param lat: Latitude(s)
+        :param lon: Longitude(s)
+        :param hour: Hour(s) since simulation start (ignored)
+        :return: (u, v) arrays in m/s
+        """
+        shape = np.broadcast(np.asarray(lat), np.asarray(lon), np.asarray(hour)).shape
+        return np.full(shape, self.u), np.full(shape, self.v)
+
+
+class GriddedWind:
+    """
+    Hourly gridded wind field.
+
+    ``u`` and ``v`` have shape (hours, lats, lons) in m/s. Values are
+    interpolated bilinearly in space and taken from the hour slot that contains
+    the query time; queries outside the grid are clamped to its edges.
+    """
+
+    def __init__(self, lats, lons, u, v, hours=None):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        self.u = np.asarray(u, dtype=np.float64)
+        self.v = np.asarray(v, dtype=np.float64)
+        if self.u.shape != self.v.shape or self.u.shape[1:] != (len(self.lats), len(self.lons)):
+            raise ValueError("u and v must have shape (hours, lats, lons)")
+        if hours is None:
+            hours = np.arange(self.u.shape[0])
+        self.hours = np.asarray(hours, dtype=np.float64)
+        if len(self.hours) != self.u.shape[0]:
+            raise ValueError("hours must match the first dimension of u and v")
+
+    def _bracket(self, grid, values):
+        if len(grid) == 1:
+            return np.zeros(np.shape(values), dtype=int), np.zeros(np.shape(values))
+        values = np.clip(values, grid[0], grid[-1])
+        idx = np.clip(np.searchsorted(grid, values, side='right') - 1, 0, len(grid) - 2)
+        return idx, (values - grid[idx]) / (grid[idx + 1] - grid[idx])
+
+    def _interp(self, field, hi, yi, yf, xi, xf):
+        if field.shape[2] == 1:
+            xf = np.zeros_like(xf)
+        if field.shape[1] == 1:
+            yf = np.zeros_like(yf)
+        x1 = np.minimum(xi + 1, field.shape[2] - 1)
+        y1 = np.minimum(yi + 1, field.shape[1] - 1)
+        low = field[hi, yi, xi] * (1 - xf) + field[hi, yi, x1] * xf
+        high = field[hi, y1, xi] * (1 - xf) + field[hi, y1, x1] * xf
+        return low * (1 - yf) + high * yf
+
+    def sample(self, lat, lon, hour=0.0):
+        """
+        Wind components at the given points
+        :param lat: Latitude(s)
+        :param lon: Longitude(s)
+        :param hour: Hour(s) since simulation start
+        :return: (u, v) arrays in m/s
+        """
+        lat, lon, hour = np.broadcast_arrays(np.asarray(lat, dtype=np.float64),
+                                             np.asarray(lon, dtype=np.float64),
+                                             np.asarray(hour, dtype=np.float64))
+        hi = np.clip(np.searchsorted(self.hours, hour, side='right') - 1, 0, len(self.hours) - 1)
+        yi, yf = self._bracket(self.lats, lat)
+        xi, xf = self._bracket(self.lons, lon)
+        return (self._interp(self.u, hi, yi, yf, xi, xf),
+                self._interp(self.v, hi, yi, yf, xi, xf))
+
+
+def segment_headings(lat1, lon1, lat2, lon2):
+    """
+    Initial bearing of each segment
+    :return: Heading in radians, clockwise from north
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    x = np.sin(dlon) * np.cos(lat2)
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return np.arctan2(x, y)
+
+
+def ground_speeds(lat1, lon1, lat2, lon2, airspeed_kmh, wind, hour=0.0):
+    """
+    Ground speed along each segment for a drone holding its track against the wind.
+
+    Wind is sampled at the segment midpoint. The along-track wind component
+    adds to the usable airspeed left after cancelling the crosswind.
+
+    :param lat1, lon1, lat2, lon2: Segment endpoints (arrays)
+    :param airspeed_kmh: Cruise airspeed (km/h)
+    :param wind: ConstantWind or GriddedWind
+    :param hour: Hour(s) since simulation start
+    :return: Ground speed (km/h) per segment; 0 where the wind cannot be overcome
+    """
+    heading = segment_headings(lat1, lon1, lat2, lon2)
+    mid_lat = (np.asarray(lat1, dtype=np.float64) + np.asarray(lat2, dtype=np.float64)) / 2
+    mid_lon = (np.asarray(lon1, dtype=np.float64) + np.asarray(lon2, dtype=np.float64)) / 2
+    u, v = wind.sample(mid_lat, mid_lon, hour)
+    u = u * MS_TO_KMH
+    v = v * MS_TO_KMH
+
+    # Wind components along and across the track
+    along = u * np.sin(heading) + v * np.cos(heading)
+    cross = u * np.cos(heading) - v * np.sin(heading)
+
+    usable = airspeed_kmh ** 2 - cross ** 2
+    speed = np.where(usable > 0, along + np.sqrt(np.maximum(usable, 0)), 0.0)
+    return np.maximum(speed, 0.0)